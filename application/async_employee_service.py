@@ -0,0 +1,240 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio application service for managing employees using SQLAlchemy.
+"""
+from datetime import date
+from typing import AsyncIterator, Optional
+from sqlalchemy import Row
+
+from employees_management.application.employee_service import apply_employee_updates, build_employee
+from employees_management.domain.models import Employee
+from employees_management.infrastructure.async_employee_repository_impl import AsyncEmployeeRepositoryImpl
+from employees_management.infrastructure.async_municipality_repository_impl import AsyncMunicipalityRepositoryImpl
+from employees_management.infrastructure.async_position_repository_impl import AsyncPositionRepositoryImpl
+from employees_management.infrastructure.async_session_provider import AsyncSessionProvider
+
+
+class AsyncEmployeeService:
+    """
+    asyncio counterpart of EmployeeService. Validation is shared with the
+    synchronous service, every method runs in its own AsyncSession.
+    """
+
+    def __init__(self, session_provider: AsyncSessionProvider):
+        self._session_provider = session_provider
+
+    async def list_employees(self) -> list[Employee]:
+        """
+        Returns a list of employees that are currently registered.
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).list_employees()
+
+    async def list_employee_rows(
+            self,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> list[Row]:
+        """
+        Returns read-only rows of the employees with their position and municipality names.
+        :param position_id: optional position filter
+        :param municipality_id: optional municipality filter
+        :param employee_type: optional type filter, BASE or HONORARY
+        :return: rows with the EMPLOYEE_ROW_FIELDS fields, ordered by last name
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).list_employee_rows(
+                position_id=position_id,
+                municipality_id=municipality_id,
+                employee_type=employee_type.upper() if employee_type else None,
+            )
+
+    async def list_employees_page(
+            self,
+            cursor: Optional[tuple[str, int]] = None,
+            page_size: int = 100,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> tuple[list[Employee], Optional[tuple[str, int]]]:
+        """
+        Returns one page of employees ordered by last name and the cursor of the next page.
+        :param cursor: (last_name_f, id) returned with the previous page, None for the first one
+        :param page_size: maximum number of employees per page
+        :param position_id: optional position filter
+        :param municipality_id: optional municipality filter
+        :param employee_type: optional type filter, BASE or HONORARY
+        :return: employees and next cursor (None on the last page)
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be greater than zero")
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).list_employees_page(
+                cursor=cursor,
+                page_size=page_size,
+                position_id=position_id,
+                municipality_id=municipality_id,
+                employee_type=employee_type.upper() if employee_type else None,
+            )
+
+    async def iter_employees(self, page_size: int = 1000, **filters) -> AsyncIterator[Employee]:
+        """
+        Yields every employee page by page, each page loaded in its own session.
+        :param page_size: employees loaded per query
+        :param filters: position_id, municipality_id and employee_type filters
+        :return:
+        """
+        cursor = None
+        while True:
+            employees, cursor = await self.list_employees_page(cursor=cursor, page_size=page_size, **filters)
+            for employee in employees:
+                yield employee
+            if cursor is None:
+                return
+
+    async def find_employee(self, nss: int) -> Optional[Employee]:
+        """
+        find employee with given nss using employee repository.
+        :param nss:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).find_by_nss(nss)
+
+    async def delete_employee(self, employee_id: int):
+        """
+        delete employee with given employee id using employee repository.
+        :param employee_id:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            employee_repo = AsyncEmployeeRepositoryImpl(session)
+            employee = await employee_repo.find_by_nss(employee_id)
+            if employee is None:
+                raise ValueError(f"NSS {employee_id} not found")
+            return await employee_repo.delete(employee.id)
+
+    async def update_many(self, filters: dict, values: dict) -> int:
+        """
+        update every employee matching the filters with one set-based statement.
+        :param filters: column values to match, lists match any of their values
+        :param values: new column values or SQL expressions
+        :return: number of updated employees
+        """
+        if not filters:
+            raise ValueError("At least one filter is required to update employees")
+        if not values:
+            raise ValueError("At least one value is required to update employees")
+        if isinstance(values.get("employee_type"), str):
+            values = {**values, "employee_type": values["employee_type"].upper()}
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).update_many(filters, values)
+
+    async def delete_many(self, filters: Optional[dict] = None, nss_list: Optional[list[int]] = None) -> int:
+        """
+        delete every employee matching the filters and/or NSS list with one set-based statement.
+        :param filters: column values to match, lists match any of their values
+        :param nss_list: NSS values of the employees to delete
+        :return: number of deleted employees
+        """
+        if not filters and nss_list is None:
+            raise ValueError("A filter or an NSS list is required to delete employees")
+        if nss_list is not None and not nss_list and not filters:
+            return 0
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).delete_many(filters, nss_list)
+
+    async def update_employee(self, employee: Employee, **updates) -> Employee:
+        """
+        update employee with given employee id using employee repository.
+        :param employee: employee instance, possibly loaded by another session
+        :param updates: fields to update
+        :return: updated employee
+        """
+        async with self._session_provider.session_scope() as session:
+            employee_repo = AsyncEmployeeRepositoryImpl(session)
+            # Apply the changes to the instance of this unit of work
+            persistent = await employee_repo.get(employee.id)
+            if persistent is None:
+                raise ValueError(f"NSS {employee.nss} not found")
+
+            apply_employee_updates(persistent, updates)
+            return await employee_repo.update(employee=persistent)
+
+    async def add_employee(
+            self,
+            *,
+            nss: int,
+            first_name: str,
+            last_name_f: str,
+            last_name_m: str,
+            position_id: int,
+            birth_date: date,
+            municipality_id: int,
+            employee_type: str,
+            hourly_rate: Optional[float] = None,
+            hours_worked: Optional[int] = None,
+    ) -> Employee:
+        """
+        add employee with given nss using employee repository.
+        :param nss:
+        :param first_name:
+        :param last_name_f:
+        :param last_name_m:
+        :param position_id:
+        :param birth_date:
+        :param municipality_id:
+        :param employee_type:
+        :param hourly_rate:
+        :param hours_worked:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            employee_repo = AsyncEmployeeRepositoryImpl(session)
+            if await employee_repo.find_by_nss(nss):
+                raise ValueError(f"NSS {nss} must be unique")
+
+            employee = build_employee(
+                await AsyncPositionRepositoryImpl(session).get(position_id),
+                await AsyncMunicipalityRepositoryImpl(session).get(municipality_id),
+                nss=nss,
+                first_name=first_name,
+                last_name_f=last_name_f,
+                last_name_m=last_name_m,
+                birth_date=birth_date,
+                employee_type=employee_type,
+                hourly_rate=hourly_rate,
+                hours_worked=hours_worked,
+            )
+            return await employee_repo.add(employee)
+
+    async def find_existing_by_nss(self, nss_list: list[int]) -> dict:
+        """
+        find the stored employees of many NSS values, a few hundred per query.
+        :param nss_list:
+        :return: rows keyed by nss
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).find_existing_by_nss(nss_list)
+
+    async def bulk_insert_rows(self, rows: list[dict]) -> None:
+        """
+        insert many employees from plain column values.
+        :param rows:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            await AsyncEmployeeRepositoryImpl(session).bulk_insert_rows(rows)
+
+    async def bulk_upsert(self, rows: list[dict], updates: list[dict]) -> None:
+        """
+        insert new employees and update existing ones in one transaction.
+        :param rows: column values of the new employees
+        :param updates: changed columns of existing employees, with their id
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            await AsyncEmployeeRepositoryImpl(session).bulk_upsert(rows, updates)
@@ -0,0 +1,95 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio application service for managing municipalities.
+"""
+from typing import Optional
+
+from employees_management.domain.models import Municipality
+from employees_management.infrastructure.async_municipality_repository_impl import AsyncMunicipalityRepositoryImpl
+from employees_management.infrastructure.async_session_provider import AsyncSessionProvider
+
+
+class AsyncMunicipalityService:
+    """
+    asyncio Municipality Service
+    """
+
+    def __init__(self, session_provider: AsyncSessionProvider):
+        self._session_provider = session_provider
+
+    async def list_municipalities(self) -> list[Municipality]:
+        """
+
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncMunicipalityRepositoryImpl(session).list_municipalities()
+
+    async def create_municipality(self, name: str) -> Municipality:
+        """
+
+        :param name:
+        :return:
+        """
+        if not name:
+            raise ValueError("Name is required")
+        async with self._session_provider.session_scope() as session:
+            return await AsyncMunicipalityRepositoryImpl(session).add(name)
+
+    async def update_municipality(self, municipality: Municipality, **updates) -> Municipality:
+        """
+
+        :param municipality:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            municipality_repo = AsyncMunicipalityRepositoryImpl(session)
+            persistent = await municipality_repo.get(municipality.id)
+            if persistent is None:
+                raise ValueError(f"Municipality {municipality.name} not found")
+
+            # update fields with new values
+            persistent.name = updates.get("name", persistent.name)
+            return await municipality_repo.update(persistent)
+
+    async def find_by_name(self, name: str) -> Optional[Municipality]:
+        """
+        Get Municipality by name
+        :param name:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncMunicipalityRepositoryImpl(session).find_by_name(name)
+
+    async def name_to_id(self) -> dict[str, int]:
+        """
+        Lookup table of municipality ids by name
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncMunicipalityRepositoryImpl(session).name_to_id()
+
+    async def create_municipalities(self, names: set[str]) -> dict[str, int]:
+        """
+        Create many municipalities in one batch
+        :param names:
+        :return: id of each new municipality by name
+        """
+        if any(not name for name in names):
+            raise ValueError("Name is required")
+        async with self._session_provider.session_scope() as session:
+            return await AsyncMunicipalityRepositoryImpl(session).bulk_add(names)
+
+    async def delete_municipality(self, municipality: Municipality) -> bool:
+        """
+        delete municipality with given municipality id using municipality repository.
+        :param municipality:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            municipality_repo = AsyncMunicipalityRepositoryImpl(session)
+            persistent = await municipality_repo.get(municipality.id)
+            if persistent is None:
+                return False
+            return await municipality_repo.delete(persistent)
@@ -0,0 +1,97 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio application service for managing positions.
+"""
+from typing import Optional
+
+from employees_management.domain.models import Position
+from employees_management.infrastructure.async_position_repository_impl import AsyncPositionRepositoryImpl
+from employees_management.infrastructure.async_session_provider import AsyncSessionProvider
+
+
+class AsyncPositionService:
+    """
+    asyncio Position Service
+    """
+
+    def __init__(self, session_provider: AsyncSessionProvider):
+        self._session_provider = session_provider
+
+    async def list_positions(self) -> list[Position]:
+        """
+
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncPositionRepositoryImpl(session).list_positions()
+
+    async def create_position(self, name: str, base_salary: float) -> Position:
+        """
+
+        :param base_salary:
+        :param name:
+        :return:
+        """
+        if not name and base_salary > 0:
+            raise ValueError("Name is required")
+        async with self._session_provider.session_scope() as session:
+            return await AsyncPositionRepositoryImpl(session).add(name, base_salary)
+
+    async def update_position(self, position: Position, **updates) -> Position:
+        """
+
+        :param position:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            position_repo = AsyncPositionRepositoryImpl(session)
+            persistent = await position_repo.get(position.id)
+            if persistent is None:
+                raise ValueError(f"Position {position.name} not found")
+
+            # update fields with new values
+            for key, value in updates.items():
+                setattr(persistent, key, value)
+            return await position_repo.update(persistent)
+
+    async def find_by_name(self, name) -> Optional[Position]:
+        """
+
+        :param name:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncPositionRepositoryImpl(session).find_by_name(name)
+
+    async def name_to_id(self) -> dict[str, int]:
+        """
+        Lookup table of position ids by name
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncPositionRepositoryImpl(session).name_to_id()
+
+    async def create_positions(self, positions: dict[str, float]) -> dict[str, int]:
+        """
+        Create many positions in one batch
+        :param positions: base salary by position name
+        :return: id of each new position by name
+        """
+        if any(not name for name in positions):
+            raise ValueError("Name is required")
+        async with self._session_provider.session_scope() as session:
+            return await AsyncPositionRepositoryImpl(session).bulk_add(positions)
+
+    async def delete_position(self, position: Position) -> bool:
+        """
+        delete position with given position id using position repository.
+        :param position:
+        :return:
+        """
+        async with self._session_provider.session_scope() as session:
+            position_repo = AsyncPositionRepositoryImpl(session)
+            persistent = await position_repo.get(position.id)
+            if persistent is None:
+                return False
+            return await position_repo.delete(persistent)
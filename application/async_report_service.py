@@ -0,0 +1,58 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio application service for the employee reports.
+"""
+from employees_management.application.report_service import float_values, type_totals
+from employees_management.infrastructure.async_report_repository_impl import AsyncReportRepositoryImpl
+from employees_management.infrastructure.async_session_provider import AsyncSessionProvider
+
+
+class AsyncReportService:
+    """
+    asyncio counterpart of ReportService, each report runs in its own session
+    so several reports can be awaited together.
+    """
+
+    def __init__(self, session_provider: AsyncSessionProvider):
+        self._session_provider = session_provider
+
+    async def employees_by_position(self) -> dict[str, int]:
+        """
+        count employees of each position.
+        :return: number of employees by position name
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncReportRepositoryImpl(session).count_by_position()
+
+    async def employees_by_municipality(self) -> dict[str, int]:
+        """
+        count employees of each municipality.
+        :return: number of employees by municipality name
+        """
+        async with self._session_provider.session_scope() as session:
+            return await AsyncReportRepositoryImpl(session).count_by_municipality()
+
+    async def employees_by_type(self) -> dict[str, int]:
+        """
+        count BASE and HONORARY employees.
+        :return: number of employees by type, every type other than BASE counts as HONORARY
+        """
+        async with self._session_provider.session_scope() as session:
+            return type_totals(await AsyncReportRepositoryImpl(session).count_by_employee_type())
+
+    async def payroll_by_position(self) -> dict[str, float]:
+        """
+        add up the weekly payroll of each position.
+        :return: payroll by position name, BASE employees count 40 hours
+        """
+        async with self._session_provider.session_scope() as session:
+            return float_values(await AsyncReportRepositoryImpl(session).payroll_by_position())
+
+    async def payroll_by_municipality(self) -> dict[str, float]:
+        """
+        add up the weekly payroll of each municipality.
+        :return: payroll by municipality name, BASE employees count 40 hours
+        """
+        async with self._session_provider.session_scope() as session:
+            return float_values(await AsyncReportRepositoryImpl(session).payroll_by_municipality())
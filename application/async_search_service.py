@@ -0,0 +1,84 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio application service for the employee full-text search.
+"""
+from typing import Optional
+
+from sqlalchemy import Row
+
+from employees_management.application.search_service import SearchService
+from employees_management.infrastructure.async_employee_repository_impl import AsyncEmployeeRepositoryImpl
+from employees_management.infrastructure.search_index import search_terms
+from employees_management.infrastructure.async_session_provider import AsyncSessionProvider
+
+
+class AsyncSearchService:
+    """
+    asyncio counterpart of SearchService.
+    """
+
+    def __init__(self, session_provider: AsyncSessionProvider):
+        self._session_provider = session_provider
+
+    async def search(
+            self,
+            query: str,
+            limit: Optional[int] = SearchService.DEFAULT_LIMIT,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> list[Row]:
+        """
+        find employees matching every word of the query as a prefix.
+        :param query: text typed by the user
+        :param limit: maximum number of employees, the best ranked matches are
+            kept, None for all of them
+        :param position_id: optional position filter
+        :param municipality_id: optional municipality filter
+        :param employee_type: optional type filter, BASE or HONORARY
+        :return: read-only rows of the matching employees ordered by last name,
+            empty when the query has no word to search
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).search(
+                terms,
+                limit=limit,
+                position_id=position_id,
+                municipality_id=municipality_id,
+                employee_type=employee_type.upper() if employee_type else None,
+            )
+
+    async def count(
+            self,
+            query: str,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+            limit: Optional[int] = None,
+    ) -> int:
+        """
+        count the employees matching the query.
+        :param query: text typed by the user
+        :param position_id: optional position filter
+        :param municipality_id: optional municipality filter
+        :param employee_type: optional type filter, BASE or HONORARY
+        :param limit: stop counting at this number, None to count all of them
+        :return: number of matching employees, at most limit
+        """
+        terms = search_terms(query)
+        if not terms:
+            return 0
+
+        async with self._session_provider.session_scope() as session:
+            return await AsyncEmployeeRepositoryImpl(session).count_search(
+                terms,
+                position_id=position_id,
+                municipality_id=municipality_id,
+                employee_type=employee_type.upper() if employee_type else None,
+                limit=limit,
+            )
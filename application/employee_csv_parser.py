@@ -0,0 +1,197 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: CSV parsing helpers shared by the sequential and parallel import.
+The functions live at module level so they can be sent to worker processes.
+"""
+
+import csv
+import io
+import os
+from datetime import datetime
+
+# Valid values of the employee_type column.
+EMPLOYEE_TYPES = ("BASE", "HONORARY")
+
+# Order of the values in a parsed row.
+PARSED_COLUMNS = [
+    "nss",
+    "first_name",
+    "last_name_f",
+    "last_name_m",
+    "position",
+    "municipality",
+    "birth_date",
+    "employee_type",
+    "hourly_rate",
+    "hours_worked",
+]
+
+# Bytes sampled to estimate the average size of a CSV line.
+SAMPLE_SIZE = 64 * 1024
+
+
+def parse_row(row: dict) -> tuple:
+    """
+    Convert a CSV row into a compact tuple of typed values in PARSED_COLUMNS order.
+    :param row: CSV row keyed by column name
+    :return: parsed row
+    """
+    # csv.DictReader keeps the values beyond the header under the None key
+    if row.get(None):
+        raise ValueError("row has more fields than the header")
+
+    for name in ("position", "municipality"):
+        if not (row[name] or "").strip():
+            raise ValueError(f"{name} is required")
+
+    employee_type = row["employee_type"].upper()
+    if employee_type not in EMPLOYEE_TYPES:
+        raise ValueError("employee_type must be 'BASE' or 'HONORARY'")
+
+    hours_worked = int(row["hours_worked"])
+    if employee_type == "HONORARY" and not (1 <= hours_worked <= 40):
+        raise ValueError("Hours worked must be between 1 and 40")
+
+    return (
+        int(row["nss"]),
+        row["first_name"],
+        row["last_name_f"],
+        row["last_name_m"],
+        row["position"],
+        row["municipality"],
+        datetime.strptime(row["birth_date"], "%Y-%m-%d").date(),
+        employee_type,
+        float(row["hourly_rate"]),
+        hours_worked,
+    )
+
+
+def read_header(file_path: str) -> tuple[list[str], int]:
+    """
+    Read the column names of a CSV file.
+    :param file_path:
+    :return: column names and the byte offset where the data starts
+    """
+    with open(file_path, "rb") as csvfile:
+        first_line = csvfile.readline()
+        fieldnames = next(csv.reader([first_line.decode("utf-8")]))
+        return fieldnames, csvfile.tell()
+
+
+def estimate_range_size(file_path: str, start: int, rows: int) -> int:
+    """
+    Estimate how many bytes hold the given number of rows, sampling the lines
+    that follow the start offset.
+    :param file_path:
+    :param start: byte offset of the first data line
+    :param rows: wanted rows per range
+    :return: range size in bytes
+    """
+    with open(file_path, "rb") as csvfile:
+        csvfile.seek(start)
+        sample = csvfile.read(SAMPLE_SIZE)
+
+    lines = sample.count(b"\n") or 1
+    return max(1, len(sample) * rows // lines)
+
+
+def split_ranges(file_path: str, start: int, range_size: int) -> list[tuple[int, int]]:
+    """
+    Split the data section of a CSV file into byte ranges that begin and end
+    on line boundaries. Records with line breaks inside quoted values are not
+    supported, because a boundary could fall in the middle of them.
+    :param file_path:
+    :param start: byte offset of the first data line
+    :param range_size: approximate size of each range
+    :return: list of (start, end) offsets
+    """
+    file_size = os.path.getsize(file_path)
+    ranges = []
+
+    with open(file_path, "rb") as csvfile:
+        while start < file_size:
+            end = min(start + range_size, file_size)
+            if end < file_size:
+                # Move the boundary to the beginning of the next line
+                csvfile.seek(end)
+                csvfile.readline()
+                end = csvfile.tell()
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def parse_range(
+        file_path: str,
+        fieldnames: list[str],
+        start: int,
+        end: int,
+) -> tuple[int, list[tuple], list[int], list[tuple[int, list, str]], int]:
+    """
+    Parse and validate the lines of one byte range.
+    :param file_path:
+    :param fieldnames: column names from the header
+    :param start: offset of the first line of the range
+    :param end: offset where the next range begins
+    :return: number of rows read, parsed rows, line inside the range of each
+        parsed row, rejected rows as (line inside the range, values, reason)
+        and number of lines read
+    """
+    with open(file_path, "rb") as csvfile:
+        csvfile.seek(start)
+        data = csvfile.read(end - start).decode("utf-8")
+
+    rows_read = 0
+    parsed = []
+    parsed_lines = []
+    errors = []
+    reader = csv.DictReader(io.StringIO(data, newline=""), fieldnames=fieldnames)
+
+    for row in reader:
+        rows_read += 1
+        try:
+            parsed.append(parse_row(row))
+            parsed_lines.append(record_line(reader, row))
+        except Exception as exc:
+            errors.append((record_line(reader, row), row_values(row, fieldnames), str(exc)))
+
+    return rows_read, parsed, parsed_lines, errors, reader.line_num
+
+
+def record_line(reader: csv.DictReader, row: dict) -> int:
+    """
+    Line where the record just read starts. The reader skips blank lines
+    and quoted values may span several lines, so it is counted back from
+    the last line read.
+    :param reader:
+    :param row: record just read
+    :return:
+    """
+    values = []
+    for value in row.values():
+        values.extend(value if isinstance(value, list) else [value])
+    return reader.line_num - sum(value.count("\n") for value in values if isinstance(value, str))
+
+
+def row_values(row: dict, fieldnames: list[str]) -> list:
+    """
+    Original values of a CSV row in column order, used to report rejected rows.
+    :param row: row read by csv.DictReader
+    :param fieldnames:
+    :return:
+    """
+    return [row.get(name) for name in fieldnames]
+
+
+def parsed_values(parsed: tuple, fieldnames: list[str]) -> list:
+    """
+    Values of a parsed row in column order, used to report rows rejected
+    after parsing.
+    :param parsed: row in PARSED_COLUMNS order
+    :param fieldnames:
+    :return:
+    """
+    values = dict(zip(PARSED_COLUMNS, parsed))
+    return [values.get(name) for name in fieldnames]
@@ -1,5 +1,5 @@
 from typing import List
-from employees_management.domain.models import Employee
+from sqlalchemy import Row
 from employees_management.application.pandas_service import PandasService
 
 
@@ -12,14 +12,15 @@ class EmployeeExportService:
     def __init__(self, pandas_service: PandasService):
         self._pandas_service = pandas_service
 
-    def export_to_csv(self, employees: List[Employee], file_path: str) -> None:
+    def export_to_csv(self, employees: List[Row], file_path: str) -> None:
         """
         Export given employees to a CSV file.
 
         Parameters
         ----------
-        employees : List[Employee]
-            Employees after filtering (UI should pass this list).
+        employees : List[Row]
+            Read-only employee rows after filtering (UI should pass this list),
+            see EmployeeService.list_employee_rows.
 
         file_path : str
             Where to save the CSV file.
@@ -33,7 +34,7 @@ class EmployeeExportService:
         if not employees:
             raise ValueError("No employees to export.")
 
-        df = self._pandas_service.employees_to_dataframe(employees)
+        df = self._pandas_service.rows_to_dataframe(employees)
 
         try:
             df.to_csv(file_path, index=False)
@@ -1,67 +1,578 @@
-from employees_management.domain.models import Employee
-from datetime import datetime
+import csv
+import io
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterator, Optional
+
+import pandas as pd
+
+from employees_management.application.employee_csv_parser import (
+    estimate_range_size,
+    parse_range,
+    parse_row,
+    parsed_values,
+    read_header,
+    record_line,
+    row_values,
+    split_ranges,
+)
+from employees_management.application.import_checkpoint import ImportCheckpoint, sidecar_path
+from employees_management.application.import_errors import (
+    REJECTED_SUFFIX,
+    RateLimitedLogger,
+    RejectedRowsWriter,
+)
+from employees_management.application.pandas_service import PandasService
+from employees_management.infrastructure.employee_queries import EMPLOYEE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Number of rows committed per transaction when streaming a CSV file.
+DEFAULT_CHUNK_SIZE = 1000
+
+# "insert" always adds rows, "upsert" matches existing employees by NSS.
+IMPORT_MODES = ("insert", "upsert")
+
+# "python" parses row by row, "pandas" validates whole columns at once.
+IMPORT_ENGINES = ("python", "pandas")
 
 
 class EmployeeImportService:
     """
-
+    Service responsible for importing employees from CSV files.
+    Rows are streamed from disk and committed in chunks, so memory usage
+    depends on the chunk size and not on the size of the file. The position
+    of each committed chunk is checkpointed so a failed import can resume.
     """
 
-    def __init__(self, employee_service, position_service, municipality_service):
+    def __init__(
+            self,
+            employee_service,
+            position_service,
+            municipality_service,
+            pandas_service: Optional[PandasService] = None,
+    ):
         self._employee_service = employee_service
         self._position_service = position_service
         self._municipality_service = municipality_service
+        self._pandas_service = pandas_service or PandasService()
 
-    def import_csv(self, file_path: str) -> dict:
+    def import_csv(
+            self,
+            file_path: str,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            progress_callback: Optional[Callable[[dict], None]] = None,
+            workers: int = 0,
+            mode: str = "insert",
+            engine: str = "python",
+            resume: bool = False,
+            checkpoint: bool = True,
+            cancel_event: Optional[threading.Event] = None,
+            rejected_path: Optional[str] = None,
+            fast_path: bool = False,
+    ) -> dict:
         """
+        Import employees from a CSV file, committing once per chunk.
 
-        :param file_path:
-        :return:
+        :param file_path: path of the CSV file
+        :param chunk_size: number of rows inserted and committed per transaction
+        :param progress_callback: called after each committed chunk with the
+            current counters (chunk, rows_read, inserted, updated, unchanged,
+            superseded, failed) plus the byte offset reached, the file size and
+            the rows_read restored from the checkpoint of a resumed import
+        :param workers: when greater than 1, rows are parsed and validated by
+            this many processes while this process inserts them
+        :param mode: "insert" adds the rows whose NSS is new and rejects the
+            others, "upsert" matches rows by NSS,
+            inserting new employees and updating the ones that changed
+        :param engine: "python" validates row by row, "pandas" reads typed
+            chunks and validates whole columns at once
+        :param resume: continue after the last chunk committed by a previous
+            import of the same file, instead of starting from the first row
+        :param checkpoint: record the position of every committed chunk in a
+            sidecar state file, so a failed import can be resumed; when the
+            state file cannot be written the import goes on without it
+        :param cancel_event: when set, the import stops after the current
+            chunk; the checkpoint is kept so it can be resumed later
+        :param rejected_path: CSV file that receives every rejected row with
+            its line number and reason, defaults to the file path plus
+            ".rejected.csv", in the import state directory when the CSV
+            file's directory is read-only
+        :param fast_path: insert trusted, prevalidated files without ORM
+            objects. On MySQL it uses LOAD DATA LOCAL INFILE and rows skipped
+            by the loader are counted as failed without a line; on SQLite it
+            is a plain driver executemany, no faster than the regular insert
+        :return: summary with inserted, updated, unchanged and failed rows,
+            the upsert rows superseded by a later row with the same NSS in
+            their chunk, plus a capped sample of the errors
         """
-        import csv
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than zero")
+        if mode not in IMPORT_MODES:
+            raise ValueError(f"mode must be one of {', '.join(IMPORT_MODES)}")
+        if engine not in IMPORT_ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(IMPORT_ENGINES)}")
+        if engine == "pandas" and workers > 1:
+            raise ValueError("The pandas engine does not support workers")
+        if fast_path and mode != "insert":
+            raise ValueError("fast_path only supports the insert mode")
 
-        employees_to_insert = []
-        failed = 0
-        errors = []
+        totals = {
+            "chunk": 0, "rows_read": 0, "inserted": 0, "updated": 0, "unchanged": 0, "superseded": 0, "failed": 0,
+        }
+        fieldnames, start_offset = read_header(file_path)
+        # Line 1 is the header
+        line_number = 1
+        file_size = os.path.getsize(file_path)
+        cancelled = False
+
+        state_file = ImportCheckpoint(file_path)
+        state = state_file.load(mode, engine) if resume else None
+        if state is not None:
+            start_offset = state["offset"]
+            line_number = state["line"]
+            totals.update(state["totals"])
+        rows_resumed = totals["rows_read"]
+
+        rejected = RejectedRowsWriter(
+            rejected_path or sidecar_path(file_path, REJECTED_SUFFIX),
+            fieldnames,
+            append=state is not None,
+        )
+        if state is not None:
+            # Rows rejected before the interruption are already in the rejected file
+            rejected.samples = state.get("errors", [])
+        error_log = RateLimitedLogger(logger)
+
+        # Load reference data once, rows are resolved against these dictionaries
+        lookups = _ImportLookups(
+            positions=self._position_service.name_to_id(),
+            municipalities=self._municipality_service.name_to_id(),
+        )
+
+        if engine == "pandas":
+            blocks = self._parse_vectorized(file_path, fieldnames, start_offset, chunk_size)
+        elif workers > 1:
+            blocks = self._parse_parallel(file_path, fieldnames, start_offset, chunk_size, workers)
+        else:
+            blocks = self._parse_sequential(file_path, fieldnames, start_offset, chunk_size)
 
-        with open(file_path, newline='', encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
+        try:
+            for block_rows, parsed_rows, parsed_lines, block_errors, end_offset, block_lines in blocks:
+                duplicates = self._flush(parsed_rows, parsed_lines, lookups, mode, totals, fast_path)
+                if duplicates:
+                    block_errors = sorted(
+                        block_errors + [
+                            (block_line, parsed_values(parsed, fieldnames), reason)
+                            for block_line, parsed, reason in duplicates
+                        ],
+                        key=lambda error: error[0],
+                    )
+
+                # Rejected rows are reported once the chunk is committed, so a
+                # resumed import does not report them twice
+                totals["rows_read"] += block_rows
+                totals["failed"] += len(block_errors)
+                for block_line, values, reason in block_errors:
+                    rejected.write(line_number + block_line, values, reason)
+                    error_log.warning("Failed to import line %d: %s", line_number + block_line, reason)
+                rejected.flush()
+                line_number += block_lines
+                # The offset is saved after the commit, a crash in between replays one chunk
+                if checkpoint:
+                    try:
+                        state_file.save(end_offset, line_number, totals, mode, engine, rejected.samples)
+                    except OSError as exc:
+                        # The import goes on without a checkpoint, it just cannot be resumed
+                        logger.warning(
+                            "Cannot write the import checkpoint %s, resume is disabled: %s", state_file.path, exc
+                        )
+                        checkpoint = False
+                if progress_callback is not None:
+                    progress_callback({
+                        **totals, "offset": end_offset, "file_size": file_size, "rows_resumed": rows_resumed,
+                    })
+                if cancel_event is not None and cancel_event.is_set():
+                    cancelled = True
+                    break
+        finally:
+            rejected.close()
+            error_log.close()
+
+        if not cancelled:
+            state_file.clear()
+
+        return {
+            "inserted": totals["inserted"],
+            "updated": totals["updated"],
+            "unchanged": totals["unchanged"],
+            "superseded": totals["superseded"],
+            "failed": totals["failed"],
+            "errors": rejected.samples,
+            "rejected_path": rejected.path if os.path.exists(rejected.path) else None,
+            "positions_created": lookups.positions_created,
+            "municipalities_created": lookups.municipalities_created,
+            "resumed": state is not None,
+            "cancelled": cancelled,
+        }
+
+    @staticmethod
+    def _parse_sequential(
+            file_path: str,
+            fieldnames: list[str],
+            start: int,
+            block_size: int,
+    ) -> Iterator[tuple]:
+        """
+        Parse the file in this process, yielding blocks of rows without
+        loading the whole file.
+        :param file_path:
+        :param fieldnames: column names from the header
+        :param start: byte offset of the first row to read
+        :param block_size: rows read per block
+        :return: blocks of (rows read, parsed rows, parsed lines, rejected rows,
+            end offset, lines read); parsed lines hold the line inside the block
+            of each parsed row, rejected rows are (line inside the block,
+            values, reason)
+        """
+        with open(file_path, "rb") as csvfile:
+            csvfile.seek(start)
+            # Lines are pulled one at a time, so tell() is exact after each record
+            lines = (line.decode("utf-8") for line in iter(csvfile.readline, b""))
+            reader = csv.DictReader(lines, fieldnames=fieldnames)
+            block_start = 0
+            last_line = 0
+            rows_read = 0
+            parsed_rows = []
+            parsed_lines = []
+            errors = []
 
             for row in reader:
+                rows_read += 1
                 try:
-                    position = self._position_service.find_by_name(row["position"])
-                    if not position:
-                        position = self._position_service.create_position(row["position"], row["hourly_rate"])
-
-                    municipality = self._municipality_service.find_by_name(row["municipality"])
-                    if not municipality:
-                        municipality = self._municipality_service.create_municipality(row["municipality"])
-
-                    employee = Employee(
-                        nss=int(row["nss"]),
-                        first_name=row["first_name"],
-                        last_name_f=row["last_name_f"],
-                        last_name_m=row["last_name_m"],
-                        position_id=position.id,
-                        birth_date=datetime.strptime(row["birth_date"], "%Y-%m-%d").date(),
-                        municipality_id=municipality.id,
-                        employee_type=row["employee_type"].upper(),
-                        hourly_rate=float(row["hourly_rate"]),
-                        hours_worked=int(row["hours_worked"]),
+                    parsed_rows.append(parse_row(row))
+                    parsed_lines.append(record_line(reader, row) - block_start)
+                except Exception as exc:
+                    errors.append((record_line(reader, row) - block_start, row_values(row, fieldnames), str(exc)))
+                last_line = reader.line_num
+
+                if rows_read >= block_size:
+                    yield rows_read, parsed_rows, parsed_lines, errors, csvfile.tell(), last_line - block_start
+                    block_start = last_line
+                    rows_read = 0
+                    parsed_rows = []
+                    parsed_lines = []
+                    errors = []
+
+            if rows_read or reader.line_num > block_start:
+                yield (
+                    rows_read, parsed_rows, parsed_lines, errors, csvfile.tell(), reader.line_num - block_start
+                )
+
+    def _parse_vectorized(
+            self,
+            file_path: str,
+            fieldnames: list[str],
+            start: int,
+            block_size: int,
+    ) -> Iterator[tuple]:
+        """
+        Read the file in chunks of string columns and validate each chunk
+        with vectorized pandas operations. Chunks are cut on line boundaries,
+        so quoted values must not contain line breaks. Rows whose number of
+        fields differs from the header are parsed one by one with parse_row,
+        and chunks holding quotes are parsed like the python engine, so both
+        engines reject the same rows with the same line numbers.
+        :param file_path:
+        :param fieldnames: column names from the header
+        :param start: byte offset of the first row to read
+        :param block_size: rows read per block
+        :return: blocks of (rows read, parsed rows, parsed lines, rejected rows,
+            end offset, lines read); parsed lines hold the line inside the block
+            of each parsed row, rejected rows are (line inside the block,
+            values, reason)
+        """
+        with open(file_path, "rb") as csvfile:
+            csvfile.seek(start)
+            lines = iter(csvfile.readline, b"")
+
+            while True:
+                block_start = csvfile.tell()
+                block = list(islice(lines, block_size))
+                if not block:
+                    break
+
+                # Quoted values may hold separators or line breaks, only the csv
+                # module counts their fields and lines right
+                if any(b'"' in line for line in block):
+                    rows_read, parsed_rows, parsed_lines, errors, _ = parse_range(
+                        file_path, fieldnames, block_start, csvfile.tell()
                     )
+                    yield rows_read, parsed_rows, parsed_lines, errors, csvfile.tell(), len(block)
+                    continue
 
-                    employees_to_insert.append(employee)
+                # Keep the line of each non-blank row to report rejected rows
+                row_lines = [index + 1 for index, line in enumerate(block) if line.strip()]
+                regular_lines = [
+                    index for index in row_lines if block[index - 1].count(b",") == len(fieldnames) - 1
+                ]
+                parsed, errors = self._parse_irregular(block, fieldnames, row_lines, set(regular_lines))
 
-                except Exception as exc:
-                    print(f"Failed to import row: {exc}")
-                    failed += 1
-                    errors.append(str(exc))
+                if regular_lines:
+                    df = pd.read_csv(
+                        io.BytesIO(b"".join(block[index - 1] for index in regular_lines)),
+                        names=fieldnames,
+                        header=None,
+                        index_col=False,
+                        dtype=str,
+                        keep_default_na=False,
+                        encoding="utf-8",
+                    )
+                    valid, reasons = self._pandas_service.validate_import_frame(df)
+                    errors.extend(
+                        (regular_lines[position], df.iloc[position].tolist(), reason)
+                        for position, reason in zip(df.index.get_indexer(reasons.index), reasons)
+                    )
+                    parsed.extend(zip(
+                        [regular_lines[position] for position in df.index.get_indexer(valid.index)],
+                        valid.itertuples(index=False, name=None),
+                    ))
 
-        if employees_to_insert:
-            self._employee_service.bulk_insert(employees_to_insert)
+                # Rows keep the file order, the first or last row of a repeated NSS wins
+                parsed.sort(key=lambda row: row[0])
+                errors.sort(key=lambda error: error[0])
+                yield (
+                    len(row_lines),
+                    [row for _, row in parsed],
+                    [line for line, _ in parsed],
+                    errors,
+                    csvfile.tell(),
+                    len(block),
+                )
 
-        return {
-            "inserted": len(employees_to_insert),
-            "failed": failed,
-            "errors": errors
-        }
+    @staticmethod
+    def _parse_irregular(
+            block: list[bytes],
+            fieldnames: list[str],
+            row_lines: list[int],
+            regular_lines: set[int],
+    ) -> tuple[list[tuple[int, tuple]], list[tuple[int, list, str]]]:
+        """
+        Parse the rows of a block without quotes whose number of fields
+        differs from the header, with the same parse_row as the python engine.
+        :param block: lines of the block
+        :param fieldnames: column names from the header
+        :param row_lines: line inside the block of each non-blank row
+        :param regular_lines: lines left to pandas
+        :return: parsed rows as (line inside the block, parsed row) and the
+            rejected rows as (line inside the block, values, reason)
+        """
+        parsed = []
+        errors = []
+        for index in row_lines:
+            if index in regular_lines:
+                continue
+            row = next(csv.DictReader([block[index - 1].decode("utf-8")], fieldnames=fieldnames))
+            try:
+                parsed.append((index, parse_row(row)))
+            except Exception as exc:
+                errors.append((index, row_values(row, fieldnames), str(exc)))
+        return parsed, errors
+
+    @staticmethod
+    def _parse_parallel(
+            file_path: str,
+            fieldnames: list[str],
+            start: int,
+            block_size: int,
+            workers: int,
+    ) -> Iterator[tuple]:
+        """
+        Parse byte ranges of about block_size rows in a process pool. Results
+        are yielded in file order and only a few ranges are in flight at once,
+        so memory stays bounded when the writer is slower than the parsers.
+        :param file_path:
+        :param fieldnames: column names from the header
+        :param start: byte offset of the first row to read
+        :param block_size: approximate rows per range
+        :param workers: number of processes
+        :return: blocks of (rows read, parsed rows, parsed lines, rejected rows,
+            end offset, lines read); parsed lines hold the line inside the block
+            of each parsed row, rejected rows are (line inside the block,
+            values, reason)
+        """
+        range_size = estimate_range_size(file_path, start, block_size)
+        ranges = iter(split_ranges(file_path, start, range_size))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            for range_start, range_end in islice(ranges, workers * 2):
+                future = executor.submit(parse_range, file_path, fieldnames, range_start, range_end)
+                in_flight.append((future, range_end))
+
+            while in_flight:
+                future, range_end = in_flight.popleft()
+                rows_read, parsed_rows, parsed_lines, errors, lines_read = future.result()
+                for range_start, next_end in islice(ranges, 1):
+                    next_future = executor.submit(parse_range, file_path, fieldnames, range_start, next_end)
+                    in_flight.append((next_future, next_end))
+                yield rows_read, parsed_rows, parsed_lines, errors, range_end, lines_read
+
+    def _flush(
+            self,
+            parsed_rows: list[tuple],
+            parsed_lines: list[int],
+            lookups: "_ImportLookups",
+            mode: str,
+            totals: dict,
+            fast_path: bool = False,
+    ) -> list[tuple[int, tuple, str]]:
+        """
+        Create the new reference data of the chunk, then write and commit its
+        employees.
+        :param parsed_rows: valid rows of the chunk
+        :param parsed_lines: line inside the block of each valid row
+        :param lookups: name to id tables
+        :param mode: insert or upsert
+        :param totals: running counters, updated in place
+        :param fast_path: load with EmployeeService.fast_load
+        :return: rows rejected because of their NSS, as (line inside the
+            block, parsed row, reason); they are not counted yet
+        """
+        totals["chunk"] += 1
+        duplicates = []
+        if mode == "insert":
+            parsed_rows, duplicates = self._reject_duplicates(parsed_rows, parsed_lines)
+        if not parsed_rows:
+            return duplicates
+
+        for parsed in parsed_rows:
+            lookups.collect(parsed)
+
+        if lookups.new_positions:
+            lookups.positions.update(self._position_service.create_positions(lookups.new_positions))
+            lookups.positions_created += len(lookups.new_positions)
+            lookups.new_positions.clear()
+        if lookups.new_municipalities:
+            lookups.municipalities.update(
+                self._municipality_service.create_municipalities(lookups.new_municipalities)
+            )
+            lookups.municipalities_created += len(lookups.new_municipalities)
+            lookups.new_municipalities.clear()
+
+        rows = [lookups.resolve(parsed) for parsed in parsed_rows]
+
+        if mode == "upsert":
+            self._upsert_chunk(rows, totals)
+        elif fast_path:
+            loaded = self._employee_service.fast_load(rows)
+            totals["inserted"] += loaded
+            if loaded < len(rows):
+                # The bulk loader skipped them without telling which ones
+                totals["failed"] += len(rows) - loaded
+                logger.warning("The bulk loader skipped %d rows of chunk %d", len(rows) - loaded, totals["chunk"])
+        else:
+            self._employee_service.bulk_insert_rows([dict(zip(EMPLOYEE_FIELDS, row)) for row in rows])
+            totals["inserted"] += len(rows)
+        return duplicates
+
+    def _reject_duplicates(
+            self,
+            parsed_rows: list[tuple],
+            parsed_lines: list[int],
+    ) -> tuple[list[tuple], list[tuple[int, tuple, str]]]:
+        """
+        Split off the rows whose NSS is already stored or repeats an earlier
+        row of the chunk, the unique NSS index would reject the whole chunk.
+        Stored NSS values are fetched with a single query per chunk.
+        :param parsed_rows: valid rows of the chunk
+        :param parsed_lines: line inside the block of each valid row
+        :return: rows to insert and the rejected rows as (line inside the
+            block, parsed row, reason)
+        """
+        existing = self._employee_service.find_existing_by_nss(list({parsed[0] for parsed in parsed_rows}))
+        seen = set()
+        rows = []
+        duplicates = []
+
+        for block_line, parsed in zip(parsed_lines, parsed_rows):
+            nss = parsed[0]
+            if nss in existing:
+                duplicates.append((block_line, parsed, f"NSS {nss} already exists"))
+            elif nss in seen:
+                duplicates.append((block_line, parsed, f"NSS {nss} is repeated in the file"))
+            else:
+                seen.add(nss)
+                rows.append(parsed)
+        return rows, duplicates
+
+    def _upsert_chunk(self, rows: list[tuple], totals: dict) -> None:
+        """
+        Insert the rows whose NSS is new and update the ones that changed.
+        Existing employees are fetched with a single query per chunk. When an
+        NSS is repeated inside the chunk the last row wins, each NSS is counted
+        once against the stored employee and the earlier rows as superseded.
+        :param rows: resolved rows in EMPLOYEE_FIELDS order
+        :param totals: running counters, updated in place
+        :return:
+        """
+        latest = {row[0]: row for row in rows}
+        totals["superseded"] += len(rows) - len(latest)
+
+        existing = self._employee_service.find_existing_by_nss(list(latest))
+        new_rows = []
+        updates = []
+
+        for nss, row in latest.items():
+            stored = existing.get(nss)
+            if stored is None:
+                new_rows.append(dict(zip(EMPLOYEE_FIELDS, row)))
+            elif tuple(getattr(stored, field) for field in EMPLOYEE_FIELDS) == row:
+                totals["unchanged"] += 1
+            else:
+                updates.append({"id": stored.id, **dict(zip(EMPLOYEE_FIELDS, row))})
+
+        self._employee_service.bulk_upsert(new_rows, updates)
+        totals["inserted"] += len(new_rows)
+        totals["updated"] += len(updates)
+
+
+class _ImportLookups:
+    """
+    Name to id tables used while importing, plus the names that are not
+    stored yet and must be created before the next flush.
+    """
+
+    def __init__(self, positions: dict[str, int], municipalities: dict[str, int]):
+        self.positions = positions
+        self.municipalities = municipalities
+        self.new_positions: dict[str, float] = {}
+        self.new_municipalities: set[str] = set()
+        self.positions_created = 0
+        self.municipalities_created = 0
+
+    def collect(self, parsed: tuple) -> None:
+        """
+        Remember the position and municipality names that do not exist yet.
+        The first hourly rate seen for a new position becomes its base salary.
+        """
+        position, municipality, hourly_rate = parsed[4], parsed[5], parsed[8]
+        if position not in self.positions and position not in self.new_positions:
+            self.new_positions[position] = hourly_rate
+        if municipality not in self.municipalities:
+            self.new_municipalities.add(municipality)
+
+    def resolve(self, parsed: tuple) -> tuple:
+        """
+        Replace the position and municipality names of a parsed row with
+        their ids, giving a row in EMPLOYEE_FIELDS order.
+        """
+        return (
+            parsed[:4]
+            + (self.positions[parsed[4]], self.municipalities[parsed[5]])
+            + parsed[6:]
+        )
@@ -4,13 +4,17 @@ Company: Swipall
 Description: Application service for managing employees using SQLAlchemy.
 """
 from datetime import date, datetime
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Iterator, Optional
+from sqlalchemy import Row
 
+from employees_management.application.lru_cache import LruCache
+from employees_management.application.municipality_service import MunicipalityService
+from employees_management.application.position_service import PositionService
 from employees_management.domain.models import Employee, Municipality, Position
 from employees_management.infrastructure.employee_repository_impl import EmployeeRepositoryImpl
 from employees_management.infrastructure.position_repository_impl import PositionRepositoryImpl
 from employees_management.infrastructure.municipality_repository_impl import MunicipalityRepositoryImpl
+from employees_management.infrastructure.session_provider import SessionProvider
 
 
 class EmployeeService:
@@ -26,18 +30,96 @@ class EmployeeService:
         "TECHNICIAN": 110.0,
     }
 
-    def __init__(self, session: Session):
-        self._session = session
-        self._employee_repo = EmployeeRepositoryImpl(session)
-        self._position_repo = PositionRepositoryImpl(session)
-        self._municipality_repo = MunicipalityRepositoryImpl(session)
+    def __init__(
+            self,
+            session_provider: SessionProvider,
+            position_service: Optional[PositionService] = None,
+            municipality_service: Optional[MunicipalityService] = None,
+            lookup_cache_size: int = 256,
+    ):
+        """
+        :param session_provider:
+        :param position_service: optional, validates positions from its cache instead of the database
+        :param municipality_service: optional, validates municipalities from its cache instead of the database
+        :param lookup_cache_size: NSS lookups kept by lookup_employee
+        """
+        self._session_provider = session_provider
+        self._position_service = position_service
+        self._municipality_service = municipality_service
+        # Recent lookup_employee results, cleared by every write of this service
+        self._lookup_cache: LruCache[int, Optional[Employee]] = LruCache(lookup_cache_size)
 
     def list_employees(self) -> list[type[Employee]]:
         """
         Returns a list of employees that are currently registered.
         :return:
         """
-        return self._employee_repo.list_employees()
+        with self._session_provider.session_scope() as session:
+            return EmployeeRepositoryImpl(session).list_employees()
+
+    def list_employee_rows(
+            self,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> list[Row]:
+        """
+        Returns read-only rows of the employees with their position and municipality names,
+        for list views and exports that do not modify employees.
+        :param position_id: optional position filter
+        :param municipality_id: optional municipality filter
+        :param employee_type: optional type filter, BASE or HONORARY
+        :return: rows with the EMPLOYEE_ROW_FIELDS fields, ordered by last name
+        """
+        with self._session_provider.session_scope() as session:
+            return EmployeeRepositoryImpl(session).list_employee_rows(
+                position_id=position_id,
+                municipality_id=municipality_id,
+                employee_type=employee_type.upper() if employee_type else None,
+            )
+
+    def list_employees_page(
+            self,
+            cursor: Optional[tuple[str, int]] = None,
+            page_size: int = 100,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> tuple[list[Employee], Optional[tuple[str, int]]]:
+        """
+        Returns one page of employees ordered by last name and the cursor of the next page.
+        :param cursor: (last_name_f, id) returned with the previous page, None for the first one
+        :param page_size: maximum number of employees per page
+        :param position_id: optional position filter
+        :param municipality_id: optional municipality filter
+        :param employee_type: optional type filter, BASE or HONORARY
+        :return: employees and next cursor (None on the last page)
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be greater than zero")
+        with self._session_provider.session_scope() as session:
+            return EmployeeRepositoryImpl(session).list_employees_page(
+                cursor=cursor,
+                page_size=page_size,
+                position_id=position_id,
+                municipality_id=municipality_id,
+                employee_type=employee_type.upper() if employee_type else None,
+            )
+
+    def iter_employees(self, page_size: int = 1000, **filters) -> Iterator[Employee]:
+        """
+        Yields every employee page by page. Each page is loaded in its own
+        session, so pages already consumed are released.
+        :param page_size: employees loaded per query
+        :param filters: position_id, municipality_id and employee_type filters
+        :return:
+        """
+        cursor = None
+        while True:
+            employees, cursor = self.list_employees_page(cursor=cursor, page_size=page_size, **filters)
+            yield from employees
+            if cursor is None:
+                return
 
     def find_employee(self, nss: int) -> Optional[Employee]:
         """
@@ -45,7 +127,31 @@ class EmployeeService:
         :param nss:
         :return:
         """
-        return self._employee_repo.find_by_nss(nss)
+        with self._session_provider.session_scope() as session:
+            return EmployeeRepositoryImpl(session).find_by_nss(nss)
+
+    def lookup_employee(self, nss: int) -> Optional[Employee]:
+        """
+        find employee with given nss, serving repeated lookups from a bounded LRU cache.
+        Meant for interactive lookups such as the salary calculator.
+        :param nss:
+        :return: employee, None if not found
+        """
+        return self._lookup_cache.get(nss, self.find_employee)
+
+    def invalidate_lookup_cache(self) -> None:
+        """
+        Drop the cached NSS lookups, e.g. after another service instance wrote employees.
+        :return:
+        """
+        self._lookup_cache.clear()
+
+    def lookup_cache_stats(self) -> dict:
+        """
+        Hit and miss counters of the NSS lookup cache.
+        :return:
+        """
+        return self._lookup_cache.stats()
 
     def delete_employee(self, employee_id: int):
         """
@@ -53,24 +159,69 @@ class EmployeeService:
         :param employee_id:
         :return:
         """
-        employee = self.find_employee(employee_id)
-        if employee is None:
-            raise ValueError(f"NSS {employee_id} not found")
-        return self._employee_repo.delete(employee.id)
+        with self._session_provider.session_scope() as session:
+            employee_repo = EmployeeRepositoryImpl(session)
+            employee = employee_repo.find_by_nss(employee_id)
+            if employee is None:
+                raise ValueError(f"NSS {employee_id} not found")
+            deleted = employee_repo.delete(employee.id)
+        self._lookup_cache.clear()
+        return deleted
+
+    def update_many(self, filters: dict, values: dict) -> int:
+        """
+        update every employee matching the filters with one set-based statement.
+        e.g. update_many({"employee_type": "HONORARY"}, {"hourly_rate": Employee.hourly_rate * 1.05})
+        :param filters: column values to match, lists match any of their values
+        :param values: new column values or SQL expressions
+        :return: number of updated employees
+        """
+        if not filters:
+            raise ValueError("At least one filter is required to update employees")
+        if not values:
+            raise ValueError("At least one value is required to update employees")
+        if isinstance(values.get("employee_type"), str):
+            values = {**values, "employee_type": values["employee_type"].upper()}
+        with self._session_provider.session_scope() as session:
+            updated = EmployeeRepositoryImpl(session).update_many(filters, values)
+        self._lookup_cache.clear()
+        return updated
+
+    def delete_many(self, filters: Optional[dict] = None, nss_list: Optional[list[int]] = None) -> int:
+        """
+        delete every employee matching the filters and/or NSS list with one set-based statement.
+        e.g. delete_many({"municipality_id": 12}) or delete_many(nss_list=[...])
+        :param filters: column values to match, lists match any of their values
+        :param nss_list: NSS values of the employees to delete
+        :return: number of deleted employees
+        """
+        if not filters and nss_list is None:
+            raise ValueError("A filter or an NSS list is required to delete employees")
+        if nss_list is not None and not nss_list and not filters:
+            return 0
+        with self._session_provider.session_scope() as session:
+            deleted = EmployeeRepositoryImpl(session).delete_many(filters, nss_list)
+        self._lookup_cache.clear()
+        return deleted
 
     def update_employee(self, employee: Employee, **updates) -> Employee:
         """
         update employee with given employee id using employee repository.
-        :param employee: employee instance
+        :param employee: employee instance, possibly loaded by another session
         :param updates: fields to update
-        :return:
+        :return: updated employee
         """
-        # update fields with new values
-        for key, value in updates.items():
-            if key == "birth_date":
-                value = datetime.strptime(value, "%Y-%m-%d").date()
-            setattr(employee, key, value)
-        return self._employee_repo.update(employee=employee)
+        with self._session_provider.session_scope() as session:
+            employee_repo = EmployeeRepositoryImpl(session)
+            # Apply the changes to the instance of this unit of work
+            persistent = employee_repo.get(employee.id)
+            if persistent is None:
+                raise ValueError(f"NSS {employee.nss} not found")
+
+            apply_employee_updates(persistent, updates)
+            employee = employee_repo.update(employee=persistent)
+        self._lookup_cache.clear()
+        return employee
 
     def add_employee(
             self,
@@ -100,45 +251,35 @@ class EmployeeService:
         :param hours_worked:
         :return:
         """
+        with self._session_provider.session_scope() as session:
+            employee_repo = EmployeeRepositoryImpl(session)
+            if employee_repo.find_by_nss(nss):
+                raise ValueError(f"NSS {nss} must be unique")
 
-        if self.find_employee(nss):
-            raise ValueError(f"NSS {nss} must be unique")
-
-        position = self._position_repo.get(position_id)
-        if not position:
-            raise ValueError("Invalid position ID")
-
-        municipality = self._municipality_repo.get(municipality_id)
-        if not municipality:
-            raise ValueError("Invalid municipality ID")
-
-        employee_type = employee_type.upper()
-
-        if employee_type == "BASE":
-            hourly_rate = position.base_salary
-            hours_worked = 0
-
-        elif employee_type == "HONORARY":
-            if hourly_rate is None or hours_worked is None:
-                raise ValueError("Honorary employees must provide hourly rate and hours worked")
-            if not (1 <= hours_worked <= 40):
-                raise ValueError("Hours worked must be between 1 and 40")
-        else:
-            raise ValueError("employee_type must be 'BASE' or 'HONORARY'")
-        employee = Employee(
-            nss=nss,
-            first_name=first_name,
-            last_name_f=last_name_f,
-            last_name_m=last_name_m,
-            birth_date=birth_date,
-            employee_type=employee_type,
-            position_id=position_id,
-            municipality_id=municipality_id,
-            hourly_rate=hourly_rate,
-            hours_worked=hours_worked,
-        )
-
-        return self._employee_repo.add(employee)
+            if self._position_service is not None:
+                position = self._position_service.get_position(position_id)
+            else:
+                position = PositionRepositoryImpl(session).get(position_id)
+            if self._municipality_service is not None:
+                municipality = self._municipality_service.get_municipality(municipality_id)
+            else:
+                municipality = MunicipalityRepositoryImpl(session).get(municipality_id)
+
+            employee = build_employee(
+                position,
+                municipality,
+                nss=nss,
+                first_name=first_name,
+                last_name_f=last_name_f,
+                last_name_m=last_name_m,
+                birth_date=birth_date,
+                employee_type=employee_type,
+                hourly_rate=hourly_rate,
+                hours_worked=hours_worked,
+            )
+            employee = employee_repo.add(employee)
+        self._lookup_cache.clear()
+        return employee
 
     def bulk_insert(self, employees: list[Employee]) -> None:
         """
@@ -146,4 +287,118 @@ class EmployeeService:
         :param employees:
         :return:
         """
-        self._employee_repo.bulk_insert(employees)
+        with self._session_provider.session_scope() as session:
+            EmployeeRepositoryImpl(session).bulk_insert(employees)
+        self._lookup_cache.clear()
+
+    def find_existing_by_nss(self, nss_list: list[int]) -> dict:
+        """
+        find the stored employees of many NSS values, a few hundred per query.
+        :param nss_list:
+        :return: rows keyed by nss
+        """
+        with self._session_provider.session_scope() as session:
+            return EmployeeRepositoryImpl(session).find_existing_by_nss(nss_list)
+
+    def bulk_insert_rows(self, rows: list[dict]) -> None:
+        """
+        insert many employees from plain column values.
+        :param rows:
+        :return:
+        """
+        with self._session_provider.session_scope() as session:
+            EmployeeRepositoryImpl(session).bulk_insert_rows(rows)
+        self._lookup_cache.clear()
+
+    def fast_load(self, rows: list[tuple]) -> int:
+        """
+        load trusted, prevalidated employees without ORM objects, in a unit
+        of work of its own. Only MySQL uses a native bulk loader, elsewhere
+        it is a plain executemany. On MySQL, LOAD DATA commits by itself
+        and is not rolled back with the scope: it must not be called inside
+        an enclosing scope that already wrote, and the rows it loaded stay
+        when a later step fails.
+        :param rows: column values in EMPLOYEE_FIELDS order
+        :return: number of loaded employees
+        """
+        with self._session_provider.session_scope() as session:
+            loaded = EmployeeRepositoryImpl(session).fast_load(rows)
+        self._lookup_cache.clear()
+        return loaded
+
+    def bulk_upsert(self, rows: list[dict], updates: list[dict]) -> None:
+        """
+        insert new employees and update existing ones in one transaction.
+        :param rows: column values of the new employees
+        :param updates: changed columns of existing employees, with their id
+        :return:
+        """
+        with self._session_provider.session_scope() as session:
+            EmployeeRepositoryImpl(session).bulk_upsert(rows, updates)
+        self._lookup_cache.clear()
+
+
+def build_employee(
+        position: Optional[Position],
+        municipality: Optional[Municipality],
+        *,
+        nss: int,
+        first_name: str,
+        last_name_f: str,
+        last_name_m: str,
+        birth_date: date,
+        employee_type: str,
+        hourly_rate: Optional[float] = None,
+        hours_worked: Optional[int] = None,
+) -> Employee:
+    """
+    validate a new employee and build it, shared by the sync and async services.
+    :param position: position loaded for the given position id, None if it does not exist
+    :param municipality: municipality loaded for the given municipality id, None if it does not exist
+    :return: new, not persisted employee
+    """
+    if not position:
+        raise ValueError("Invalid position ID")
+
+    if not municipality:
+        raise ValueError("Invalid municipality ID")
+
+    employee_type = employee_type.upper()
+
+    if employee_type == "BASE":
+        hourly_rate = position.base_salary
+        hours_worked = 0
+
+    elif employee_type == "HONORARY":
+        if hourly_rate is None or hours_worked is None:
+            raise ValueError("Honorary employees must provide hourly rate and hours worked")
+        if not (1 <= hours_worked <= 40):
+            raise ValueError("Hours worked must be between 1 and 40")
+    else:
+        raise ValueError("employee_type must be 'BASE' or 'HONORARY'")
+    return Employee(
+        nss=nss,
+        first_name=first_name,
+        last_name_f=last_name_f,
+        last_name_m=last_name_m,
+        birth_date=birth_date,
+        employee_type=employee_type,
+        position_id=position.id,
+        municipality_id=municipality.id,
+        hourly_rate=hourly_rate,
+        hours_worked=hours_worked,
+    )
+
+
+def apply_employee_updates(employee: Employee, updates: dict) -> None:
+    """
+    set the edited fields of an employee, parsing the birth date of the dialog.
+    :param employee:
+    :param updates: fields to update
+    :return:
+    """
+    # update fields with new values
+    for key, value in updates.items():
+        if key == "birth_date":
+            value = datetime.strptime(value, "%Y-%m-%d").date()
+        setattr(employee, key, value)
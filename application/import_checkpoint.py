@@ -0,0 +1,122 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Sidecar state file used to resume interrupted CSV imports.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+from employees_management.config.settings import get_import_state_dir
+
+# Suffix added to the CSV path to build the state file path.
+CHECKPOINT_SUFFIX = ".import-state.json"
+
+
+def sidecar_path(file_path: str, suffix: str) -> str:
+    """
+    Path of a file that belongs to an import of file_path: next to the CSV
+    file when its directory is writable, otherwise in the import state
+    directory under a name keyed by the absolute path of the CSV file.
+    :param file_path: path of the CSV file
+    :param suffix: suffix that identifies the kind of file
+    :return:
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    if os.access(directory, os.W_OK):
+        return file_path + suffix
+
+    state_dir = get_import_state_dir()
+    os.makedirs(state_dir, exist_ok=True)
+    key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(state_dir, f"{os.path.basename(file_path)}.{key}{suffix}")
+
+
+class ImportCheckpoint:
+    """
+    Stores the byte offset, line number, counters and error sample of the
+    last committed chunk of an import next to the CSV file, or in the import
+    state directory when the CSV file is on a read-only location. The state
+    also records the size and modification time of the CSV file, so a
+    checkpoint is never applied to a file that changed after it was written.
+    """
+
+    def __init__(self, file_path: str):
+        self._file_path = file_path
+        self.path = sidecar_path(file_path, CHECKPOINT_SUFFIX)
+
+    def exists(self) -> bool:
+        """
+        Whether an interrupted import of the file left a state to resume.
+        :return:
+        """
+        return os.path.exists(self.path)
+
+    def load(self, mode: str, engine: str) -> Optional[dict]:
+        """
+        Read the saved state of a previous import of the same file.
+        :param mode: import mode of the current call
+        :param engine: import engine of the current call
+        :return: saved state, or None when there is nothing to resume
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, encoding="utf-8") as state_file:
+            state = json.load(state_file)
+
+        stat = os.stat(self._file_path)
+        if state["file_size"] != stat.st_size or state["file_mtime"] != stat.st_mtime:
+            raise ValueError("The CSV file changed since the checkpoint was written, it cannot be resumed")
+        if state["mode"] != mode or state["engine"] != engine:
+            raise ValueError(
+                f"The checkpoint was written by a {state['mode']}/{state['engine']} import, "
+                f"it cannot be resumed as {mode}/{engine}"
+            )
+        return state
+
+    def save(
+            self,
+            offset: int,
+            line: int,
+            totals: dict,
+            mode: str,
+            engine: str,
+            errors: Optional[list[str]] = None,
+    ) -> None:
+        """
+        Record the position after the last committed chunk.
+        The file is replaced atomically so a crash never leaves half a state.
+        :param offset: byte offset where the next chunk starts
+        :param line: number of the last line read
+        :param totals: counters of the rows committed so far
+        :param mode: import mode
+        :param engine: import engine
+        :param errors: sample of the errors reported so far, shown again by a resumed import
+        :return:
+        """
+        stat = os.stat(self._file_path)
+        state = {
+            "file_size": stat.st_size,
+            "file_mtime": stat.st_mtime,
+            "mode": mode,
+            "engine": engine,
+            "offset": offset,
+            "line": line,
+            "totals": totals,
+            "errors": errors or [],
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            json.dump(state, state_file)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        """
+        Remove the state file once the import finished.
+        :return:
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,125 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Bounded-memory reporting of the rows rejected by a CSV import.
+"""
+
+import csv
+import logging
+import os
+import time
+
+# Suffix added to the CSV path to build the rejected rows file path.
+REJECTED_SUFFIX = ".rejected.csv"
+
+# Number of error messages kept in the import summary.
+MAX_ERROR_SAMPLES = 20
+
+
+class RejectedRowsWriter:
+    """
+    Streams rejected rows to a CSV file with their line number and reason,
+    keeping only a counter and a small sample in memory. The file is created
+    when the first row is rejected.
+    """
+
+    def __init__(self, path: str, fieldnames: list[str], append: bool = False):
+        self.path = path
+        self.count = 0
+        self.samples: list[str] = []
+        self._fieldnames = fieldnames
+        self._append = append
+        self._file = None
+        self._writer = None
+
+        # A new import replaces the report of a previous one
+        if not append and os.path.exists(path):
+            os.remove(path)
+
+    def write(self, line_number: int, values: list, reason: str) -> None:
+        """
+        Record one rejected row.
+        :param line_number: line of the row in the source file
+        :param values: original values of the row
+        :param reason: why the row was rejected
+        :return:
+        """
+        if self._writer is None:
+            self._open()
+
+        self._writer.writerow([line_number, reason, *values])
+        self.count += 1
+        if len(self.samples) < MAX_ERROR_SAMPLES:
+            self.samples.append(f"Line {line_number}: {reason}")
+
+    def flush(self) -> None:
+        """
+        Push written rows to disk, called after every committed chunk.
+        :return:
+        """
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """
+        Close the report file.
+        :return:
+        """
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._writer = None
+
+    def _open(self) -> None:
+        write_header = not (self._append and os.path.exists(self.path))
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(["line_number", "reason", *self._fieldnames])
+
+
+class RateLimitedLogger:
+    """
+    Wraps a logger and emits at most max_messages per interval seconds.
+    Dropped messages are counted and reported with the next emitted one.
+    """
+
+    def __init__(self, logger: logging.Logger, max_messages: int = 10, interval: float = 5.0):
+        self._logger = logger
+        self._max_messages = max_messages
+        self._interval = interval
+        self._window_start = 0.0
+        self._emitted = 0
+        self._suppressed = 0
+
+    def warning(self, message: str, *args) -> None:
+        """
+        Log a warning unless the rate limit of the current window is reached.
+        :param message:
+        :param args:
+        :return:
+        """
+        now = time.monotonic()
+        if now - self._window_start >= self._interval:
+            self._report_suppressed()
+            self._window_start = now
+            self._emitted = 0
+
+        if self._emitted >= self._max_messages:
+            self._suppressed += 1
+            return
+
+        self._emitted += 1
+        self._logger.warning(message, *args)
+
+    def close(self) -> None:
+        """
+        Report the messages dropped in the last window.
+        :return:
+        """
+        self._report_suppressed()
+
+    def _report_suppressed(self) -> None:
+        if self._suppressed:
+            self._logger.warning("%d similar messages suppressed", self._suppressed)
+            self._suppressed = 0
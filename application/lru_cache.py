@@ -0,0 +1,81 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Bounded least-recently-used read-through cache.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LruCache(Generic[K, V]):
+    """
+    Keeps the results of the last max_size lookups, the least recently used
+    one is evicted first. Missing results (None) are cached too, so repeated
+    lookups of unknown keys do not reach the database.
+    clear() must be called whenever the underlying data changes.
+    """
+
+    def __init__(self, max_size: int = 256):
+        if max_size < 1:
+            raise ValueError("max_size must be greater than zero")
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        # Incremented by clear(), values loaded before a clear are not stored
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: K, loader: Callable[[K], V]) -> V:
+        """
+        Cached value of key, loaded with loader on a miss.
+        :param key:
+        :param loader: called outside the lock with the key
+        :return:
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+            generation = self._generation
+
+        value = loader(key)
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                if len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """
+        Drop every cached value.
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        """
+        Usage counters since the cache was created.
+        :return: hits, misses, evictions, size and max_size
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+            }
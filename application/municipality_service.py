@@ -1,7 +1,9 @@
-from sqlalchemy.orm import Session
+from typing import Optional
 
+from employees_management.application.reference_cache import ReferenceCache
 from employees_management.infrastructure.municipality_repository_impl import MunicipalityRepositoryImpl
-from students.domain.models import Municipality
+from employees_management.infrastructure.session_provider import SessionProvider
+from employees_management.domain.models import Municipality
 
 
 class MunicipalityService:
@@ -9,17 +11,33 @@ class MunicipalityService:
     Municipality Service
     """
 
-    def __init__(self, session: Session):
-        self._session = session
+    def __init__(self, session_provider: SessionProvider, cache_ttl: Optional[float] = None):
+        """
+        :param session_provider:
+        :param cache_ttl: seconds the cached municipalities are served, None to keep them until this service writes
+        """
+        self._session_provider = session_provider
+        # Municipalities are read far more often than written, the table is served from memory
+        self._cache: ReferenceCache[Municipality] = ReferenceCache(self._load_municipalities, ttl=cache_ttl)
 
-        self._municipality_repo = MunicipalityRepositoryImpl(session)
+    def _load_municipalities(self) -> list[Municipality]:
+        with self._session_provider.session_scope() as session:
+            return MunicipalityRepositoryImpl(session).list_municipalities()
 
     def list_municipalities(self) -> list[type[Municipality]]:
         """
 
         :return:
         """
-        return self._municipality_repo.list_municipalities()
+        return self._cache.all()
+
+    def get_municipality(self, municipality_id: int) -> Optional[Municipality]:
+        """
+        Get Municipality by id
+        :param municipality_id:
+        :return:
+        """
+        return self._cache.get(municipality_id)
 
     def create_municipality(self, name: str) -> Municipality:
         """
@@ -29,7 +47,10 @@ class MunicipalityService:
         """
         if not name:
             raise ValueError("Name is required")
-        return self._municipality_repo.add(name)
+        with self._session_provider.session_scope() as session:
+            municipality = MunicipalityRepositoryImpl(session).add(name)
+        self._cache.invalidate()
+        return municipality
 
     def update_municipality(self, municipality: Municipality, **updates) -> Municipality:
         """
@@ -37,17 +58,45 @@ class MunicipalityService:
         :param municipality:
         :return:
         """
-        # update fields with new values
-        municipality.name = updates.get("name", municipality.name)
-        return self._municipality_repo.update(municipality)
+        with self._session_provider.session_scope() as session:
+            municipality_repo = MunicipalityRepositoryImpl(session)
+            persistent = municipality_repo.get(municipality.id)
+            if persistent is None:
+                raise ValueError(f"Municipality {municipality.name} not found")
 
-    def find_by_name(self, name: str) -> Municipality:
+            # update fields with new values
+            persistent.name = updates.get("name", persistent.name)
+            municipality = municipality_repo.update(persistent)
+        self._cache.invalidate()
+        return municipality
+
+    def find_by_name(self, name: str) -> Optional[Municipality]:
         """
         Get Municipality by name
         :param name:
         :return:
         """
-        return self._municipality_repo.find_by_name(name)
+        return self._cache.find_by_name(name)
+
+    def name_to_id(self) -> dict[str, int]:
+        """
+        Lookup table of municipality ids by name
+        :return:
+        """
+        return self._cache.name_to_id()
+
+    def create_municipalities(self, names: set[str]) -> dict[str, int]:
+        """
+        Create many municipalities in one batch
+        :param names:
+        :return: id of each new municipality by name
+        """
+        if any(not name for name in names):
+            raise ValueError("Name is required")
+        with self._session_provider.session_scope() as session:
+            ids = MunicipalityRepositoryImpl(session).bulk_add(names)
+        self._cache.invalidate()
+        return ids
 
     def delete_municipality(self, municipality: Municipality):
         """
@@ -55,4 +104,25 @@ class MunicipalityService:
         :param municipality:
         :return:
         """
-        return self._municipality_repo.delete(municipality)
+        with self._session_provider.session_scope() as session:
+            municipality_repo = MunicipalityRepositoryImpl(session)
+            persistent = municipality_repo.get(municipality.id)
+            if persistent is None:
+                return False
+            deleted = municipality_repo.delete(persistent)
+        self._cache.invalidate()
+        return deleted
+
+    def invalidate_cache(self) -> None:
+        """
+        Drop the cached municipalities, e.g. after another service instance wrote them
+        :return:
+        """
+        self._cache.invalidate()
+
+    def cache_stats(self) -> dict:
+        """
+        Hit and miss counters of the municipalities cache
+        :return:
+        """
+        return self._cache.stats()
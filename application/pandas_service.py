@@ -1,5 +1,25 @@
 import pandas as pd
 
+from employees_management.application.employee_csv_parser import EMPLOYEE_TYPES, PARSED_COLUMNS
+from employees_management.infrastructure.employee_queries import EMPLOYEE_ROW_FIELDS
+
+# Columns of the employee DataFrames, before the computed age.
+DATAFRAME_COLUMNS = (
+    "nss",
+    "first_name",
+    "last_name_f",
+    "last_name_m",
+    "position",
+    "municipality",
+    "employee_type",
+    "hourly_rate",
+    "hours_worked",
+    "birth_date",
+)
+
+# Text accepted as an integer, the same values int() parses.
+INTEGER_PATTERN = r"\s*[+-]?\d+\s*"
+
 
 class PandasService:
     """
@@ -38,3 +58,80 @@ class PandasService:
         df["age"] = (today - df["birth_date"]).dt.days // 365
 
         return df
+
+    @staticmethod
+    def rows_to_dataframe(rows):
+        """
+        Generates the same DataFrame as employees_to_dataframe from the
+        read-only rows of EmployeeService.list_employee_rows.
+        :param rows:
+        :return:
+        """
+        df = pd.DataFrame.from_records(rows, columns=EMPLOYEE_ROW_FIELDS)
+        df = df[list(DATAFRAME_COLUMNS)]
+
+        # Convert birth_date to datetime safely
+        df["birth_date"] = pd.to_datetime(df["birth_date"], errors="coerce")
+
+        # Calculate age correctly
+        today = pd.Timestamp.today()
+        df["age"] = (today - df["birth_date"]).dt.days // 365
+
+        return df
+
+    @staticmethod
+    def validate_import_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+        """
+        Validate a chunk of raw CSV rows column by column.
+        Every check runs over whole columns, the first failing check of each
+        row becomes its error reason.
+        :param df: CSV rows read as strings
+        :return: typed valid rows in PARSED_COLUMNS order and the error reason
+            of each invalid row, indexed like the input
+        """
+        # Integers are matched as text, like int() in the python engine, so
+        # values such as "7.0" are rejected by both engines
+        nss_is_integer = df["nss"].str.fullmatch(INTEGER_PATTERN, na=False)
+        hours_is_integer = df["hours_worked"].str.fullmatch(INTEGER_PATTERN, na=False)
+        nss = pd.to_numeric(df["nss"].where(nss_is_integer), errors="coerce")
+        birth_date = pd.to_datetime(df["birth_date"], format="%Y-%m-%d", errors="coerce")
+        employee_type = df["employee_type"].str.upper()
+        hourly_rate = pd.to_numeric(df["hourly_rate"], errors="coerce")
+        hours_worked = pd.to_numeric(df["hours_worked"].where(hours_is_integer), errors="coerce")
+
+        checks = [
+            (~nss_is_integer, "nss must be numeric"),
+            (df["position"].fillna("").str.strip() == "", "position is required"),
+            (df["municipality"].fillna("").str.strip() == "", "municipality is required"),
+            (birth_date.isna(), "birth_date must be a valid YYYY-MM-DD date"),
+            (~employee_type.isin(EMPLOYEE_TYPES), "employee_type must be 'BASE' or 'HONORARY'"),
+            (hourly_rate.isna(), "hourly_rate must be numeric"),
+            (~hours_is_integer, "hours_worked must be an integer"),
+            (
+                (employee_type == "HONORARY") & ~hours_worked.between(1, 40),
+                "Hours worked must be between 1 and 40",
+            ),
+        ]
+
+        # Per-row error mask, keeping only the first failing reason
+        error_mask = pd.Series(False, index=df.index)
+        reasons = pd.Series(None, index=df.index, dtype=object)
+        for failed, reason in checks:
+            reasons[failed & ~error_mask] = reason
+            error_mask |= failed
+
+        valid = ~error_mask
+        typed = pd.DataFrame({
+            "nss": nss[valid].astype("int64"),
+            "first_name": df["first_name"][valid],
+            "last_name_f": df["last_name_f"][valid],
+            "last_name_m": df["last_name_m"][valid],
+            "position": df["position"][valid],
+            "municipality": df["municipality"][valid],
+            "birth_date": birth_date[valid].dt.date,
+            "employee_type": employee_type[valid],
+            "hourly_rate": hourly_rate[valid].astype("float64"),
+            "hours_worked": hours_worked[valid].astype("int64"),
+        }, columns=PARSED_COLUMNS)
+
+        return typed, reasons[error_mask]
@@ -1,8 +1,9 @@
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from employees_management.application.reference_cache import ReferenceCache
 from employees_management.domain.models import Position
 from employees_management.infrastructure.position_repository_impl import PositionRepositoryImpl
+from employees_management.infrastructure.session_provider import SessionProvider
 
 
 class PositionService:
@@ -10,17 +11,33 @@ class PositionService:
     Position Service
     """
 
-    def __init__(self, session: Session):
-        self._session = session
+    def __init__(self, session_provider: SessionProvider, cache_ttl: Optional[float] = None):
+        """
+        :param session_provider:
+        :param cache_ttl: seconds the cached positions are served, None to keep them until this service writes
+        """
+        self._session_provider = session_provider
+        # Positions are read far more often than written, the table is served from memory
+        self._cache: ReferenceCache[Position] = ReferenceCache(self._load_positions, ttl=cache_ttl)
 
-        self._position_repo = PositionRepositoryImpl(session)
+    def _load_positions(self) -> list[Position]:
+        with self._session_provider.session_scope() as session:
+            return PositionRepositoryImpl(session).list_positions()
 
     def list_positions(self) -> list[type[Position]]:
         """
 
         :return:
         """
-        return self._position_repo.list_positions()
+        return self._cache.all()
+
+    def get_position(self, position_id: int) -> Optional[Position]:
+        """
+        Get position by id
+        :param position_id:
+        :return:
+        """
+        return self._cache.get(position_id)
 
     def create_position(self, name: str, base_salary: float) -> Position:
         """
@@ -31,7 +48,10 @@ class PositionService:
         """
         if not name and base_salary > 0:
             raise ValueError("Name is required")
-        return self._position_repo.add(name, base_salary)
+        with self._session_provider.session_scope() as session:
+            position = PositionRepositoryImpl(session).add(name, base_salary)
+        self._cache.invalidate()
+        return position
 
     def update_position(self, position: Position, **updates) -> Position:
         """
@@ -39,11 +59,18 @@ class PositionService:
         :param position:
         :return:
         """
-        # update fields with new values
-        # update fields with new values
-        for key, value in updates.items():
-            setattr(position, key, value)
-        return self._position_repo.update(position)
+        with self._session_provider.session_scope() as session:
+            position_repo = PositionRepositoryImpl(session)
+            persistent = position_repo.get(position.id)
+            if persistent is None:
+                raise ValueError(f"Position {position.name} not found")
+
+            # update fields with new values
+            for key, value in updates.items():
+                setattr(persistent, key, value)
+            position = position_repo.update(persistent)
+        self._cache.invalidate()
+        return position
 
     def find_by_name(self, name) -> Optional[Position]:
         """
@@ -51,4 +78,53 @@ class PositionService:
         :param name:
         :return:
         """
-        return self._position_repo.find_by_name(name)
+        return self._cache.find_by_name(name)
+
+    def name_to_id(self) -> dict[str, int]:
+        """
+        Lookup table of position ids by name
+        :return:
+        """
+        return self._cache.name_to_id()
+
+    def create_positions(self, positions: dict[str, float]) -> dict[str, int]:
+        """
+        Create many positions in one batch
+        :param positions: base salary by position name
+        :return: id of each new position by name
+        """
+        if any(not name for name in positions):
+            raise ValueError("Name is required")
+        with self._session_provider.session_scope() as session:
+            ids = PositionRepositoryImpl(session).bulk_add(positions)
+        self._cache.invalidate()
+        return ids
+
+    def delete_position(self, position: Position) -> bool:
+        """
+        delete position with given position id using position repository.
+        :param position:
+        :return:
+        """
+        with self._session_provider.session_scope() as session:
+            position_repo = PositionRepositoryImpl(session)
+            persistent = position_repo.get(position.id)
+            if persistent is None:
+                return False
+            deleted = position_repo.delete(persistent)
+        self._cache.invalidate()
+        return deleted
+
+    def invalidate_cache(self) -> None:
+        """
+        Drop the cached positions, e.g. after another service instance wrote them
+        :return:
+        """
+        self._cache.invalidate()
+
+    def cache_stats(self) -> dict:
+        """
+        Hit and miss counters of the positions cache
+        :return:
+        """
+        return self._cache.stats()
@@ -0,0 +1,121 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Read-through cache of a small reference table (positions, municipalities).
+"""
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ReferenceCache(Generic[T]):
+    """
+    Keeps every row of a small, rarely changing table in memory, indexed by
+    id and by name. The table is loaded again on the first access after
+    invalidate(), after the optional TTL expires, or the first time an id or
+    name is not found (it may have been added by another writer). Later
+    misses are answered from the loaded table until the TTL expires or the
+    cache is invalidated, so unknown names never reload it once per lookup.
+    Rows are detached objects shared by every caller and must not be modified.
+    """
+
+    def __init__(self, loader: Callable[[], list[T]], ttl: Optional[float] = None):
+        """
+        :param loader: returns every row of the table, in display order
+        :param ttl: seconds a loaded table is served, None to keep it until invalidated
+        """
+        self._loader = loader
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._rows: Optional[list[T]] = None
+        self._by_id: dict[int, T] = {}
+        self._by_name: dict[str, T] = {}
+        self._loaded_at = 0.0
+        # Whether a missing id or name already reloaded the current table
+        self._reloaded_for_missing = False
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def _is_fresh(self) -> bool:
+        if self._rows is None:
+            return False
+        return self._ttl is None or time.monotonic() - self._loaded_at < self._ttl
+
+    def _load(self) -> None:
+        rows = self._loader()
+        self._rows = rows
+        self._by_id = {row.id: row for row in rows}
+        self._by_name = {row.name: row for row in rows}
+        self._loaded_at = time.monotonic()
+
+    def _read(self, read: Callable[[], object], required: bool = False):
+        with self._lock:
+            if not self._is_fresh():
+                self._misses += 1
+                self._load()
+                self._reloaded_for_missing = False
+            elif required and read() is None and not self._reloaded_for_missing:
+                # Reload once to find rows added by other writers
+                self._misses += 1
+                self._load()
+                self._reloaded_for_missing = True
+            else:
+                self._hits += 1
+            return read()
+
+    def all(self) -> list[T]:
+        """
+        Every row of the table.
+        :return: new list, callers may sort or filter it
+        """
+        return self._read(lambda: list(self._rows))
+
+    def get(self, row_id: int) -> Optional[T]:
+        """
+        Row with the given id.
+        :param row_id:
+        :return: None if the table has no such row
+        """
+        return self._read(lambda: self._by_id.get(row_id), required=True)
+
+    def find_by_name(self, name: str) -> Optional[T]:
+        """
+        Row with the given name.
+        :param name:
+        :return: None if the table has no such row
+        """
+        return self._read(lambda: self._by_name.get(name), required=True)
+
+    def name_to_id(self) -> dict[str, int]:
+        """
+        Lookup table of ids by name.
+        :return:
+        """
+        return self._read(lambda: {name: row.id for name, row in self._by_name.items()})
+
+    def invalidate(self) -> None:
+        """
+        Drop the loaded table, the next access loads it again.
+        :return:
+        """
+        with self._lock:
+            self._rows = None
+            self._by_id = {}
+            self._by_name = {}
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        """
+        Usage counters since the cache was created.
+        :return: hits, misses (table loads), invalidations and cached rows
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "size": len(self._rows) if self._rows is not None else 0,
+            }
@@ -0,0 +1,79 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Application service for the employee reports.
+"""
+from employees_management.infrastructure.report_repository_impl import ReportRepositoryImpl
+from employees_management.infrastructure.session_provider import SessionProvider
+
+
+class ReportService:
+    """
+    Headcount and payroll reports read from the employee summary table,
+    their cost does not depend on the number of employees.
+    """
+
+    def __init__(self, session_provider: SessionProvider):
+        self._session_provider = session_provider
+
+    def employees_by_position(self) -> dict[str, int]:
+        """
+        count employees of each position.
+        :return: number of employees by position name
+        """
+        with self._session_provider.session_scope() as session:
+            return ReportRepositoryImpl(session).count_by_position()
+
+    def employees_by_municipality(self) -> dict[str, int]:
+        """
+        count employees of each municipality.
+        :return: number of employees by municipality name
+        """
+        with self._session_provider.session_scope() as session:
+            return ReportRepositoryImpl(session).count_by_municipality()
+
+    def employees_by_type(self) -> dict[str, int]:
+        """
+        count BASE and HONORARY employees.
+        :return: number of employees by type, every type other than BASE counts as HONORARY
+        """
+        with self._session_provider.session_scope() as session:
+            return type_totals(ReportRepositoryImpl(session).count_by_employee_type())
+
+    def payroll_by_position(self) -> dict[str, float]:
+        """
+        add up the weekly payroll of each position.
+        :return: payroll by position name, BASE employees count 40 hours
+        """
+        with self._session_provider.session_scope() as session:
+            return float_values(ReportRepositoryImpl(session).payroll_by_position())
+
+    def payroll_by_municipality(self) -> dict[str, float]:
+        """
+        add up the weekly payroll of each municipality.
+        :return: payroll by municipality name, BASE employees count 40 hours
+        """
+        with self._session_provider.session_scope() as session:
+            return float_values(ReportRepositoryImpl(session).payroll_by_municipality())
+
+
+def type_totals(counts: dict[str, int]) -> dict[str, int]:
+    """
+    fold the stored employee types into the BASE and HONORARY totals.
+    :param counts: number of employees by stored type
+    :return: number of employees by type, every type other than BASE counts as HONORARY
+    """
+    totals = {"BASE": 0, "HONORARY": 0}
+    for employee_type, count in counts.items():
+        key = "BASE" if employee_type.upper() == "BASE" else "HONORARY"
+        totals[key] += count
+    return totals
+
+
+def float_values(payroll: dict) -> dict[str, float]:
+    """
+    convert the payroll sums to float, MySQL returns them as Decimal.
+    :param payroll: payroll by name
+    :return:
+    """
+    return {name: float(value) for name, value in payroll.items()}
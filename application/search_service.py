@@ -0,0 +1,98 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Application service for the employee full-text search.
+"""
+from typing import Optional
+
+from sqlalchemy import Row
+
+from employees_management.infrastructure.employee_repository_impl import EmployeeRepositoryImpl
+from employees_management.infrastructure.search_index import search_terms
+from employees_management.infrastructure.session_provider import SessionProvider
+
+
+class SearchService:
+    """
+    Prefix search of employees by NSS, names, position and municipality,
+    answered by the full-text index instead of scanning loaded employees.
+    """
+
+    # Maximum number of employees returned when no limit is given.
+    DEFAULT_LIMIT = 100
+
+    def __init__(self, session_provider: SessionProvider):
+        self._session_provider = session_provider
+
+    @staticmethod
+    def has_terms(query: str) -> bool:
+        """
+        whether the query holds a word to search, text made only of
+        punctuation matches nothing and should show the unfiltered listing.
+        :param query: text typed by the user
+        :return:
+        """
+        return bool(search_terms(query))
+
+    def search(
+            self,
+            query: str,
+            limit: Optional[int] = DEFAULT_LIMIT,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> list[Row]:
+        """
+        find employees matching every word of the query as a prefix.
+        e.g. "jua her" matches JUAN HERNANDEZ
+        :param query: text typed by the user
+        :param limit: maximum number of employees, the best ranked matches are
+            kept, None for all of them
+        :param position_id: optional position filter
+        :param municipality_id: optional municipality filter
+        :param employee_type: optional type filter, BASE or HONORARY
+        :return: read-only rows of the matching employees ordered by last name,
+            empty when the query has no word to search
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        with self._session_provider.session_scope() as session:
+            return EmployeeRepositoryImpl(session).search(
+                terms,
+                limit=limit,
+                position_id=position_id,
+                municipality_id=municipality_id,
+                employee_type=employee_type.upper() if employee_type else None,
+            )
+
+    def count(
+            self,
+            query: str,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+            limit: Optional[int] = None,
+    ) -> int:
+        """
+        count the employees matching the query, to tell how many a limited search left out.
+        :param query: text typed by the user
+        :param position_id: optional position filter
+        :param municipality_id: optional municipality filter
+        :param employee_type: optional type filter, BASE or HONORARY
+        :param limit: stop counting at this number, None to count all of them
+        :return: number of matching employees, at most limit
+        """
+        terms = search_terms(query)
+        if not terms:
+            return 0
+
+        with self._session_provider.session_scope() as session:
+            return EmployeeRepositoryImpl(session).count_search(
+                terms,
+                position_id=position_id,
+                municipality_id=municipality_id,
+                employee_type=employee_type.upper() if employee_type else None,
+                limit=limit,
+            )
@@ -0,0 +1,139 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Lookup latency of the employee table with and without the indexes
+added by the 0001_employee_indexes migration.
+
+Usage:
+    python -m employees_management.benchmarks.lookup_latency --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from employees_management.benchmarks.synthetic_data import generate_employees_csv
+
+
+def _latencies_ms(action, samples: int) -> dict:
+    """
+    Run an action several times and summarize its latency in milliseconds.
+    """
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+def measure(session, employee_repo, rows: int, samples: int, seed: int) -> dict:
+    """
+    Measure the NSS lookup, the first page of the listing and a filtered
+    first page.
+    """
+    from employees_management.domain.models import Employee
+
+    rng = random.Random(seed)
+    nss_values = [10_000_000_000 + rng.randrange(rows) for _ in range(samples)]
+    nss_iter = iter(nss_values)
+
+    def first_page(**filters):
+        return (
+            session.query(Employee)
+            .filter_by(**filters)
+            .order_by(Employee.last_name_f, Employee.id)
+            .limit(50)
+            .all()
+        )
+
+    results = {
+        "find_by_nss": _latencies_ms(lambda: employee_repo.find_by_nss(next(nss_iter)), samples),
+        "list_first_page": _latencies_ms(first_page, samples),
+        "list_by_position": _latencies_ms(lambda: first_page(position_id=1), samples),
+        "list_by_type": _latencies_ms(lambda: first_page(employee_type="HONORARY"), samples),
+    }
+    session.expunge_all()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results_lookup.json")
+    args = parser.parse_args(argv)
+
+    from employees_management.application.employee_import_service import EmployeeImportService
+    from employees_management.application.employee_service import EmployeeService
+    from employees_management.application.municipality_service import MunicipalityService
+    from employees_management.application.position_service import PositionService
+    from employees_management.domain.models import Employee
+    from employees_management.infrastructure.db import Base
+    from employees_management.infrastructure.employee_repository_impl import EmployeeRepositoryImpl
+    from employees_management.infrastructure.migrations import apply_migrations
+    from employees_management.infrastructure.session_provider import SessionProvider
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = generate_employees_csv(os.path.join(work_dir, "employees.csv"), args.rows, seed=args.seed)
+        engine = create_engine(f"sqlite:///{os.path.join(work_dir, 'lookup.db')}", future=True)
+
+        # Build the table without the employee indexes, as older databases have it
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            for index in Employee.__table__.indexes:
+                index.drop(connection, checkfirst=True)
+
+        session_factory = sessionmaker(bind=engine, expire_on_commit=False, future=True)
+        session_provider = SessionProvider(session_factory)
+        EmployeeImportService(
+            EmployeeService(session_provider=session_provider),
+            PositionService(session_provider=session_provider),
+            MunicipalityService(session_provider=session_provider),
+        ).import_csv(csv_path, chunk_size=50_000, checkpoint=False, fast_path=True,
+                     rejected_path=os.path.join(work_dir, "rejected.csv"))
+
+        session = session_factory()
+        employee_repo = EmployeeRepositoryImpl(session)
+        before = measure(session, employee_repo, args.rows, args.samples, args.seed)
+
+        # 0002 and 0003 also run here, each migration is timed on its own
+        migration_seconds = {}
+        apply_migrations(engine, durations=migration_seconds)
+
+        after = measure(session, employee_repo, args.rows, args.samples, args.seed)
+        session.close()
+        engine.dispose()
+
+    report = {
+        "rows": args.rows,
+        "samples": args.samples,
+        "index_migration_seconds": round(migration_seconds["0001_employee_indexes"], 3),
+        "migration_seconds": {name: round(seconds, 3) for name, seconds in migration_seconds.items()},
+        "without_indexes": before,
+        "with_indexes": after,
+    }
+    for name, seconds in report["migration_seconds"].items():
+        print(f"{name:24} {seconds:>8} s")
+    for name in before:
+        print(f"{name:18} {before[name]['median_ms']:>10} ms -> {after[name]['median_ms']:>8} ms (median)")
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Read and write latency of a file-based SQLite database with the
+default settings and with the performance profile of DB_SQLITE_PROFILE.
+
+Usage:
+    python -m employees_management.benchmarks.sqlite_profile --rows 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from employees_management.benchmarks.lookup_latency import _latencies_ms
+from employees_management.benchmarks.synthetic_data import generate_employees_csv
+
+PROFILES = ("default", "performance")
+
+
+def run_profile(profile: str, database_path: str, csv_path: str, rows: int, samples: int, seed: int) -> dict:
+    """
+    Load the CSV into a new database using the given profile, then measure
+    single-row writes and the most common reads.
+    """
+    from employees_management.application.employee_import_service import EmployeeImportService
+    from employees_management.application.employee_service import EmployeeService
+    from employees_management.application.municipality_service import MunicipalityService
+    from employees_management.application.position_service import PositionService
+    from employees_management.config.settings import SQLITE_PERFORMANCE_PROFILE
+    from employees_management.infrastructure.db import Base, apply_sqlite_pragmas
+    from employees_management.infrastructure.migrations import apply_migrations
+    from employees_management.infrastructure.session_provider import SessionProvider
+
+    engine = create_engine(f"sqlite:///{database_path}", future=True)
+    apply_sqlite_pragmas(engine, SQLITE_PERFORMANCE_PROFILE if profile == "performance" else {})
+    Base.metadata.create_all(engine)
+    apply_migrations(engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False, future=True)
+    session_provider = SessionProvider(session_factory)
+
+    employee_service = EmployeeService(session_provider=session_provider)
+    EmployeeImportService(
+        employee_service,
+        PositionService(session_provider=session_provider),
+        MunicipalityService(session_provider=session_provider),
+    ).import_csv(csv_path, chunk_size=10_000, checkpoint=False,
+                 rejected_path=database_path + ".rejected.csv")
+
+    rng = random.Random(seed)
+    existing = iter([10_000_000_000 + rng.randrange(rows) for _ in range(samples)])
+    new_nss = iter(range(90_000_000_000, 90_000_000_000 + samples))
+    updated_nss = iter([10_000_000_000 + rng.randrange(rows) for _ in range(samples)])
+
+    def insert_one():
+        employee_service.add_employee(
+            nss=next(new_nss), first_name="BENCH", last_name_f="BENCH", last_name_m="BENCH",
+            position_id=1, municipality_id=1, birth_date=date(1990, 1, 1), employee_type="BASE",
+        )
+
+    def update_one():
+        employee = employee_service.find_employee(next(updated_nss))
+        employee_service.update_employee(employee, hourly_rate=employee.hourly_rate + 1)
+
+    results = {
+        "insert_commit": _latencies_ms(insert_one, samples),
+        "update_commit": _latencies_ms(update_one, samples),
+        "find_by_nss": _latencies_ms(lambda: employee_service.find_employee(next(existing)), samples),
+        "list_first_page": _latencies_ms(lambda: employee_service.list_employees_page(page_size=50), samples),
+    }
+    engine.dispose()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results_sqlite_profile.json")
+    args = parser.parse_args(argv)
+
+    report = {"rows": args.rows, "samples": args.samples}
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = generate_employees_csv(os.path.join(work_dir, "employees.csv"), args.rows, seed=args.seed)
+        for profile in PROFILES:
+            report[profile] = run_profile(profile, os.path.join(work_dir, f"{profile}.db"),
+                                          csv_path, args.rows, args.samples, args.seed)
+
+    default, performance = report["default"], report["performance"]
+    for name in default:
+        print(f"{name:16} {default[name]['median_ms']:>10} ms -> {performance[name]['median_ms']:>8} ms (median)")
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Reproducible synthetic employee CSV files for benchmarks.
+"""
+
+import csv
+import random
+from datetime import date, timedelta
+
+from employees_management.application.employee_csv_parser import PARSED_COLUMNS
+
+FIRST_NAMES = [
+    "JUAN", "MARIA", "JOSE", "GUADALUPE", "LUIS", "ANA", "CARLOS", "SOFIA",
+    "MIGUEL", "LAURA", "JORGE", "ELENA", "PEDRO", "CARMEN", "RAUL", "ROSA",
+]
+
+LAST_NAMES = [
+    "HERNANDEZ", "GARCIA", "MARTINEZ", "LOPEZ", "GONZALEZ", "PEREZ",
+    "RODRIGUEZ", "SANCHEZ", "RAMIREZ", "CRUZ", "FLORES", "GOMEZ",
+    "MORALES", "VAZQUEZ", "REYES", "JIMENEZ", "TORRES", "DIAZ",
+]
+
+# Oldest and youngest birth dates generated.
+MIN_BIRTH_DATE = date(1960, 1, 1)
+MAX_BIRTH_DATE = date(2005, 12, 31)
+
+
+def generate_employees_csv(
+        file_path: str,
+        rows: int,
+        positions: int = 20,
+        municipalities: int = 50,
+        honorary_ratio: float = 0.3,
+        seed: int = 42,
+) -> str:
+    """
+    Write a CSV file in the format read by EmployeeImportService.
+    The same arguments always produce the same file.
+
+    :param file_path: where to write the CSV
+    :param rows: number of employees
+    :param positions: number of distinct position names
+    :param municipalities: number of distinct municipality names
+    :param honorary_ratio: share of HONORARY employees
+    :param seed: random seed
+    :return: the file path
+    """
+    rng = random.Random(seed)
+    position_names = [f"POSITION {index:04d}" for index in range(positions)]
+    position_rates = [round(rng.uniform(80, 200), 2) for _ in range(positions)]
+    municipality_names = [f"MUNICIPALITY {index:05d}" for index in range(municipalities)]
+    birth_days = (MAX_BIRTH_DATE - MIN_BIRTH_DATE).days
+
+    with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(PARSED_COLUMNS)
+
+        for index in range(rows):
+            position = rng.randrange(positions)
+            honorary = rng.random() < honorary_ratio
+            writer.writerow([
+                10_000_000_000 + index,
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                rng.choice(LAST_NAMES),
+                position_names[position],
+                municipality_names[rng.randrange(municipalities)],
+                (MIN_BIRTH_DATE + timedelta(days=rng.randrange(birth_days))).isoformat(),
+                "HONORARY" if honorary else "BASE",
+                round(rng.uniform(50, 150), 2) if honorary else position_rates[position],
+                rng.randint(1, 40) if honorary else 0,
+            ])
+
+    return file_path
@@ -5,6 +5,8 @@ Description: Build database URL for SQLAlchemy.
 """
 
 import os
+import tempfile
+from typing import Optional
 
 
 def get_database_url() -> str:
@@ -25,3 +27,154 @@ def get_database_url() -> str:
     # Default to SQLite
     database_path = os.getenv("DB_NAME", "employees.db")
     return f"sqlite:///{database_path}"
+
+
+def get_connect_args() -> dict:
+    """
+    Extra DBAPI connection arguments.
+    DB_LOCAL_INFILE=1 lets MySQL connections run LOAD DATA LOCAL INFILE,
+    used by the fast-path CSV import.
+    """
+    engine = os.getenv("DB_ENGINE", "sqlite").lower()
+
+    if engine == "mysql" and os.getenv("DB_LOCAL_INFILE", "0") == "1":
+        return {"local_infile": True}
+    return {}
+
+
+def get_eager_loading() -> str:
+    """
+    Strategy used by listing queries to load the position and municipality
+    of each employee: "selectin" (default), "joined" or "lazy".
+    Configured with DB_EAGER_LOADING.
+    """
+    strategy = os.getenv("DB_EAGER_LOADING", "selectin").lower()
+    if strategy not in ("selectin", "joined", "lazy"):
+        raise ValueError("DB_EAGER_LOADING must be 'selectin', 'joined' or 'lazy'")
+    return strategy
+
+
+def is_strict_loading() -> bool:
+    """
+    DB_STRICT_LOADING=1 makes every lazy relationship load raise an error
+    instead of running a hidden query. Meant for tests and development.
+    """
+    return os.getenv("DB_STRICT_LOADING", "0") == "1"
+
+
+def is_query_stats_enabled() -> bool:
+    """
+    DB_QUERY_STATS=1 records the time and row count of every SQL statement,
+    grouped by the service method that issued it. Off by default.
+    """
+    return os.getenv("DB_QUERY_STATS", "0") == "1"
+
+
+def get_slow_query_ms() -> float:
+    """
+    Statements slower than DB_SLOW_QUERY_MS milliseconds (200 by default)
+    are written to the slow-query log when query stats are enabled.
+    """
+    return float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+
+def get_slow_query_log() -> Optional[str]:
+    """
+    File of the slow-query log (DB_SLOW_QUERY_LOG). Without it slow queries
+    go to the employees_management.sql.slow logger only.
+    """
+    return os.getenv("DB_SLOW_QUERY_LOG") or None
+
+
+def get_reference_cache_ttl() -> Optional[float]:
+    """
+    Seconds the positions and municipalities cached by their services are
+    served before being read again (DB_REFERENCE_CACHE_TTL). Unset keeps
+    them until the service itself writes, set it when other applications
+    edit these tables.
+    """
+    ttl = os.getenv("DB_REFERENCE_CACHE_TTL")
+    return float(ttl) if ttl else None
+
+
+def get_import_state_dir() -> str:
+    """
+    Directory that receives the checkpoint and rejected rows files of the
+    CSV files whose own directory is read-only (IMPORT_STATE_DIR), by
+    default a folder in the system temporary directory.
+    """
+    return os.getenv("IMPORT_STATE_DIR") or os.path.join(tempfile.gettempdir(), "employees_management")
+
+
+# PRAGMA values of the SQLite performance profile.
+SQLITE_PERFORMANCE_PROFILE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268_435_456,
+    "cache_size": -65_536,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+def get_sqlite_pragmas() -> dict:
+    """
+    PRAGMA statements applied to every new SQLite connection.
+    DB_SQLITE_PROFILE selects "default" (default), which keeps the SQLite
+    defaults, or "performance". The performance profile switches the file
+    to WAL, which persists in the file and adds -wal/-shm files next to it,
+    so it is opt-in. Each value of the profile can be overridden
+    with DB_SQLITE_JOURNAL_MODE, DB_SQLITE_SYNCHRONOUS, DB_SQLITE_MMAP_SIZE
+    (bytes), DB_SQLITE_CACHE_SIZE (pages, negative for KiB),
+    DB_SQLITE_TEMP_STORE and DB_BUSY_TIMEOUT (milliseconds).
+    """
+    if os.getenv("DB_ENGINE", "sqlite").lower() != "sqlite":
+        return {}
+
+    profile = os.getenv("DB_SQLITE_PROFILE", "default").lower()
+    if profile not in ("performance", "default"):
+        raise ValueError("DB_SQLITE_PROFILE must be 'performance' or 'default'")
+
+    pragmas = dict(SQLITE_PERFORMANCE_PROFILE) if profile == "performance" else {}
+    overrides = {
+        "journal_mode": os.getenv("DB_SQLITE_JOURNAL_MODE"),
+        "synchronous": os.getenv("DB_SQLITE_SYNCHRONOUS"),
+        "mmap_size": os.getenv("DB_SQLITE_MMAP_SIZE"),
+        "cache_size": os.getenv("DB_SQLITE_CACHE_SIZE"),
+        "temp_store": os.getenv("DB_SQLITE_TEMP_STORE"),
+        "busy_timeout": os.getenv("DB_BUSY_TIMEOUT"),
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            pragmas[name] = int(value) if name in ("mmap_size", "cache_size", "busy_timeout") else value.upper()
+    return pragmas
+
+
+def get_pool_options() -> dict:
+    """
+    Connection pool arguments of the MySQL engine.
+    DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds),
+    DB_POOL_RECYCLE (seconds, stale connections are replaced after it) and
+    DB_POOL_PRE_PING (checks each connection before handing it out).
+    """
+    if os.getenv("DB_ENGINE", "sqlite").lower() != "mysql":
+        return {}
+
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+    }
+
+
+def get_async_database_url() -> str:
+    """
+    Build the database URL used by the asyncio engine, with the aiosqlite
+    driver for SQLite and asyncmy for MySQL.
+    """
+    url = get_database_url()
+    if url.startswith("mysql+pymysql://"):
+        return "mysql+asyncmy://" + url[len("mysql+pymysql://"):]
+    return "sqlite+aiosqlite://" + url[len("sqlite://"):]
@@ -48,3 +48,44 @@ class IEmployeeRepository(ABC):
         :return: success status
         """
         pass
+
+
+class IAsyncEmployeeRepository(ABC):
+    """
+    asyncio interface for Employee repository.
+    """
+
+    @abstractmethod
+    async def list_employees(self) -> list[Employee]:
+        """
+        Retrieve all employees.
+        :return: list of Employee
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, employee_id: int) -> Optional[Employee]:
+        """
+        Retrieve employee by ID.
+        :param employee_id: int
+        :return: Optional[Employee]
+        """
+        pass
+
+    @abstractmethod
+    async def add(self, employee: Employee) -> Employee:
+        """
+        Add a new employee.
+        :param employee: Employee instance
+        :return: persisted Employee with ID
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, employee_id: int) -> bool:
+        """
+        Delete employee by ID.
+        :param employee_id: int
+        :return: success status
+        """
+        pass
@@ -4,7 +4,7 @@ Company: Swipall
 Description: data models
 """
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DATE
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, Float, DATE, Index
 from sqlalchemy.orm import relationship
 
 from employees_management.infrastructure.db import Base
@@ -41,9 +41,20 @@ class Employee(Base):
     Domain model for Student entity.
     """
     __tablename__ = "employee"
+    __table_args__ = (
+        # NSS lookups (salary calculator, uniqueness check, upsert import)
+        Index("ux_employee_nss", "nss", unique=True),
+        # Listing ordered by last name, id breaks ties for pagination
+        Index("ix_employee_last_name_f_id", "last_name_f", "id"),
+        # Filters and reports by position, municipality and type, in list order
+        Index("ix_employee_position_last_name_f", "position_id", "last_name_f", "id"),
+        Index("ix_employee_municipality_last_name_f", "municipality_id", "last_name_f", "id"),
+        Index("ix_employee_type_last_name_f", "employee_type", "last_name_f", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    nss = Column(Integer)
+    # 11-digit NSS values do not fit in a 32-bit INT
+    nss = Column(BigInteger)
     first_name = Column(String(100), nullable=False)
     last_name_f = Column(String(100), nullable=False)
     last_name_m = Column(String(100), nullable=False)
@@ -61,3 +72,26 @@ class Employee(Base):
 
     def __repr__(self) -> str:
         return f"<Employee id={self.id} name={self.first_name} {self.last_name_m}>"
+
+
+class EmployeeSummary(Base):
+    """
+    Headcount and weekly payroll of the employees of each position,
+    municipality and type, kept up to date by database triggers
+    (see infrastructure.employee_summary). Reports read these few rows
+    instead of aggregating every employee.
+    """
+    __tablename__ = "employee_summary"
+
+    position_id = Column(Integer, primary_key=True)
+    municipality_id = Column(Integer, primary_key=True)
+    employee_type = Column(String(150), primary_key=True)
+    headcount = Column(Integer, nullable=False)
+    # BASE: hourly_rate * 40, HONORARY: hourly_rate * hours_worked
+    payroll = Column(Float, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<EmployeeSummary position_id={self.position_id} municipality_id={self.municipality_id} "
+            f"type={self.employee_type} headcount={self.headcount}>"
+        )
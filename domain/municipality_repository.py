@@ -33,3 +33,35 @@ class IMunicipalityRepository(ABC):
         :return:
         """
         pass
+
+
+class IAsyncMunicipalityRepository(ABC):
+    """
+    asyncio interface for Municipality repository
+    """
+
+    @abstractmethod
+    async def list_municipalities(self) -> List[Municipality]:
+        """
+
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, municipality_id: int) -> Optional[Municipality]:
+        """
+
+        :param municipality_id:
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    async def add(self, name: str) -> Municipality:
+        """
+
+        :param name:
+        :return:
+        """
+        pass
@@ -34,3 +34,36 @@ class IPositionRepository(ABC):
         :return:
         """
         pass
+
+
+class IAsyncPositionRepository(ABC):
+    """
+    asyncio interface for Position repository
+    """
+
+    @abstractmethod
+    async def list_positions(self) -> List[Position]:
+        """
+
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, position_id: int) -> Optional[Position]:
+        """
+
+        :param position_id:
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    async def add(self, name: str, salary_base: float) -> Position:
+        """
+
+        :param salary_base:
+        :param name:
+        :return:
+        """
+        pass
@@ -0,0 +1,93 @@
+from abc import ABC, abstractmethod
+
+
+class IReportRepository(ABC):
+    """
+    Aggregated employee figures computed by the database
+    """
+
+    @abstractmethod
+    def count_by_position(self) -> dict[str, int]:
+        """
+
+        :return: number of employees by position name
+        """
+        pass
+
+    @abstractmethod
+    def count_by_municipality(self) -> dict[str, int]:
+        """
+
+        :return: number of employees by municipality name
+        """
+        pass
+
+    @abstractmethod
+    def count_by_employee_type(self) -> dict[str, int]:
+        """
+
+        :return: number of employees by employee type
+        """
+        pass
+
+    @abstractmethod
+    def payroll_by_position(self) -> dict[str, float]:
+        """
+
+        :return: weekly payroll by position name
+        """
+        pass
+
+    @abstractmethod
+    def payroll_by_municipality(self) -> dict[str, float]:
+        """
+
+        :return: weekly payroll by municipality name
+        """
+        pass
+
+
+class IAsyncReportRepository(ABC):
+    """
+    asyncio interface of the aggregated employee figures
+    """
+
+    @abstractmethod
+    async def count_by_position(self) -> dict[str, int]:
+        """
+
+        :return: number of employees by position name
+        """
+        pass
+
+    @abstractmethod
+    async def count_by_municipality(self) -> dict[str, int]:
+        """
+
+        :return: number of employees by municipality name
+        """
+        pass
+
+    @abstractmethod
+    async def count_by_employee_type(self) -> dict[str, int]:
+        """
+
+        :return: number of employees by employee type
+        """
+        pass
+
+    @abstractmethod
+    async def payroll_by_position(self) -> dict[str, float]:
+        """
+
+        :return: weekly payroll by position name
+        """
+        pass
+
+    @abstractmethod
+    async def payroll_by_municipality(self) -> dict[str, float]:
+        """
+
+        :return: weekly payroll by municipality name
+        """
+        pass
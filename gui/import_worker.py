@@ -0,0 +1,101 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Background CSV import that keeps the main window responsive.
+"""
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from sqlalchemy.orm import sessionmaker
+
+from employees_management.application.employee_import_service import EmployeeImportService
+from employees_management.application.employee_service import EmployeeService
+from employees_management.application.municipality_service import MunicipalityService
+from employees_management.application.position_service import PositionService
+from employees_management.infrastructure.db import SessionLocal
+from employees_management.infrastructure.session_provider import SessionProvider
+
+
+class ImportWorkerSignals(QObject):
+    """
+    Signals emitted by ImportWorker. QRunnable is not a QObject, so the
+    signals live in this helper object.
+    """
+    # rows_read, inserted, updated, failed, rows_per_second, percent
+    progress = pyqtSignal(dict)
+    # import summary
+    finished = pyqtSignal(dict)
+    # error message
+    failed = pyqtSignal(str)
+
+
+class ImportWorker(QRunnable):
+    """
+    Runs EmployeeImportService.import_csv in a QThreadPool thread.
+    The services of the worker open their own sessions and never touch the
+    sessions of the GUI thread. Every chunk is its own unit of work, so the
+    chunks committed before a cancel or an error stay and can be resumed.
+    """
+
+    def __init__(
+            self,
+            file_path: str,
+            session_factory: sessionmaker = SessionLocal,
+            **import_options,
+    ) -> None:
+        super().__init__()
+        self._file_path = file_path
+        self._session_factory = session_factory
+        self._import_options = import_options
+        self._cancel_event = threading.Event()
+        self._started_at = 0.0
+        self.signals = ImportWorkerSignals()
+
+    def cancel(self) -> None:
+        """
+        Ask the import to stop after the chunk being written.
+        :return:
+        """
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        """
+        Entry point called by QThreadPool in the worker thread.
+        :return:
+        """
+        session_provider = SessionProvider(self._session_factory)
+        try:
+            import_service = EmployeeImportService(
+                EmployeeService(session_provider=session_provider),
+                PositionService(session_provider=session_provider),
+                MunicipalityService(session_provider=session_provider),
+            )
+            self._started_at = time.perf_counter()
+            result = import_service.import_csv(
+                self._file_path,
+                progress_callback=self._on_progress,
+                cancel_event=self._cancel_event,
+                **self._import_options,
+            )
+            self.signals.finished.emit(result)
+        except Exception as exc:
+            self.signals.failed.emit(str(exc))
+
+    def _on_progress(self, progress: dict) -> None:
+        """
+        Translate the import counters into a progress signal.
+        :param progress:
+        :return:
+        """
+        elapsed = time.perf_counter() - self._started_at
+        # Rows restored from the checkpoint of a resumed import were not read by this run
+        rows_read = progress["rows_read"] - progress["rows_resumed"]
+        self.signals.progress.emit({
+            "rows_read": progress["rows_read"],
+            "inserted": progress["inserted"],
+            "updated": progress["updated"],
+            "failed": progress["failed"],
+            "rows_per_second": rows_read / elapsed if elapsed > 0 else 0.0,
+            "percent": int(progress["offset"] * 100 / progress["file_size"]) if progress["file_size"] else 100,
+        })
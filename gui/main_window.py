@@ -5,29 +5,34 @@ from PyQt6 import QtGui
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTableWidget, QTableWidgetItem, QMessageBox,
-    QLineEdit, QLabel, QComboBox
+    QLineEdit, QLabel, QComboBox, QProgressDialog
 )
 
 from PyQt6.QtWidgets import QToolBar, QMenu
 from PyQt6.QtGui import QIcon, QAction
 # set size for components
-from PyQt6.QtCore import QSize
+from PyQt6.QtCore import QSize, Qt, QThreadPool
+from sqlalchemy import Row
 
 from employees_management.application.employee_export_service import EmployeeExportService
 from employees_management.application.employee_import_service import EmployeeImportService
+from employees_management.application.import_checkpoint import ImportCheckpoint
 from employees_management.application.pandas_service import PandasService
-from employees_management.domain.models import Employee
+from employees_management.application.report_service import ReportService
+from employees_management.application.search_service import SearchService
 from employees_management.application.employee_service import EmployeeService
 from employees_management.application.position_service import PositionService
 from employees_management.application.municipality_service import MunicipalityService
 from employees_management.gui.chart_window import ChartWindow
 from employees_management.gui.chart_window_pie import PieChartWindow
+from employees_management.gui.import_worker import ImportWorker
 from employees_management.gui.municipality_window import MunicipalityWindow
 from employees_management.gui.position_window import PositionWindow
 
 from employees_management.gui.window_employee import EmployeeDialog
 from employees_management.gui.window_salary import SalaryWindow
 from employees_management.gui.about_dialog import AboutDialog
+from employees_management.infrastructure.query_metrics import QueryRecorder
 
 from employees_management.translations.es import TEXT
 
@@ -46,7 +51,10 @@ class MainWindow(QMainWindow):
             municipality_service: MunicipalityService,
             import_service: EmployeeImportService,
             pandas_service: PandasService,
-            export_service=EmployeeExportService,
+            export_service: EmployeeExportService,
+            report_service: ReportService,
+            search_service: SearchService,
+            query_recorder: Optional[QueryRecorder] = None,
     ) -> None:
         super().__init__()
         self._employee_service = employee_service
@@ -55,12 +63,20 @@ class MainWindow(QMainWindow):
         self._import_service = import_service
         self._pandas_service = pandas_service
         self._export_service = export_service
+        self._report_service = report_service
+        self._search_service = search_service
+        # Engine instrumentation, only when DB_QUERY_STATS=1
+        self._query_recorder = query_recorder
 
         self.setWindowTitle(TEXT["APP_TITLE"])
 
         # Current selection
         self._selected_id: Optional[int] = None
-        self._employees_cache: List[Employee] = []
+        self._employees_cache: List[Row] = []
+
+        # Background CSV import
+        self._import_worker: Optional[ImportWorker] = None
+        self._import_progress: Optional[QProgressDialog] = None
 
         self._setup_toolbar()
         self._setup_ui()
@@ -153,6 +169,10 @@ class MainWindow(QMainWindow):
         # Layout stacking
         main_layout.addLayout(search_layout)
         main_layout.addWidget(self.table)
+        # Tells when a text search shows only part of its matches
+        self.results_label = QLabel()
+        self.results_label.setVisible(False)
+        main_layout.addWidget(self.results_label)
         main_layout.addLayout(buttons_layout)
 
     def _setup_toolbar(self) -> None:
@@ -176,6 +196,9 @@ class MainWindow(QMainWindow):
         reports_by_municipality = QAction("Empledos por municipio", self)
         reports_by_municipality.triggered.connect(self._open_report_employees_by_municipality)
 
+        report_payroll_by_position = QAction("Nomina por puesto", self)
+        report_payroll_by_position.triggered.connect(self._open_report_payroll_by_position)
+
         report_base_vs_honorary = QAction("Base vs Honorarios", self)
         report_base_vs_honorary.triggered.connect(self._open_report_base_vs_honorary)
 
@@ -185,6 +208,7 @@ class MainWindow(QMainWindow):
         # Add items to menu
         reports_menu.addAction(reports_by_position)
         reports_menu.addAction(reports_by_municipality)
+        reports_menu.addAction(report_payroll_by_position)
         reports_menu.addAction(report_base_vs_honorary)
         reports_menu.addSeparator()
         reports_menu.addAction(salary_report)
@@ -211,6 +235,11 @@ class MainWindow(QMainWindow):
 
         utils_menu.addAction(about_action)
 
+        if self._query_recorder is not None:
+            query_stats_action = QAction("Estadisticas SQL", self)
+            query_stats_action.triggered.connect(self._open_query_stats)
+            utils_menu.addAction(query_stats_action)
+
         utils_action = QAction(QIcon("icons/tools.png"), "Utils", self)
         utils_action.setMenu(utils_menu)
         toolbar.addAction(utils_action)
@@ -235,7 +264,8 @@ class MainWindow(QMainWindow):
         toolbar.addAction(pandas_action)
 
     def _load_employees(self) -> None:
-        self._employees_cache = self._employee_service.list_employees()
+        # Read-only rows, the edit dialog loads the employee it modifies
+        self._employees_cache = self._employee_service.list_employee_rows()
         self._apply_filter()
         self._selected_id = None
 
@@ -263,7 +293,7 @@ class MainWindow(QMainWindow):
         self._load_employees()
         self._load_filters()
 
-    def _fill_table(self, employees: List[Employee]) -> None:
+    def _fill_table(self, employees: List[Row]) -> None:
         self.table.setRowCount(0)
         for employee in employees:
             row = self.table.rowCount()
@@ -272,13 +302,38 @@ class MainWindow(QMainWindow):
             self.table.setItem(row, 1, QTableWidgetItem(employee.first_name))
             self.table.setItem(row, 2, QTableWidgetItem(employee.last_name_f))
             self.table.setItem(row, 3, QTableWidgetItem(employee.last_name_m))
-            self.table.setItem(row, 4, QTableWidgetItem(employee.position_rel.name))
+            self.table.setItem(row, 4, QTableWidgetItem(employee.position))
             self.table.setItem(row, 5, QTableWidgetItem(employee.birth_date.strftime('%Y-%m-%d')))
-            self.table.setItem(row, 6, QTableWidgetItem(employee.municipality_rel.name))
+            self.table.setItem(row, 6, QTableWidgetItem(employee.municipality))
 
     def _apply_filter(self):
         filtered = self._compute_filtered_employees()
         self._fill_table(filtered)
+        self._show_search_truncation(len(filtered))
+
+    def _show_search_truncation(self, shown: int) -> None:
+        """
+        Show how many matches a text search left out of the table.
+        :param shown: number of employees in the table
+        :return:
+        """
+        query = self.search_edit.text().strip()
+        if shown < SearchService.DEFAULT_LIMIT or not self._search_service.has_terms(query):
+            self.results_label.setVisible(False)
+            return
+
+        # The count stops one past the page, it only tells whether more matches exist
+        total = self._search_service.count(
+            query,
+            position_id=self.position_filter.currentData(),
+            municipality_id=self.municipality_filter.currentData(),
+            employee_type=self.type_filter.currentData(),
+            limit=shown + 1,
+        )
+        self.results_label.setText(
+            f"Showing the best {shown} of {shown}+ matches, type more to narrow the search."
+        )
+        self.results_label.setVisible(total > shown)
 
     def _on_row_selected(self) -> None:
         selected_rows = self.table.selectionModel().selectedRows()
@@ -386,12 +441,7 @@ class MainWindow(QMainWindow):
         self.municipality_window.show()
 
     def _open_report_employees_by_position(self):
-        data = {}
-        for employee in self._employees_cache:
-            if not employee.position_rel:
-                continue
-            name = employee.position_rel.name
-            data[name] = data.get(name, 0) + 1
+        data = self._report_service.employees_by_position()
 
         if not data:
             self._show_info("No data available to display chart.")
@@ -407,12 +457,7 @@ class MainWindow(QMainWindow):
         self.chart_window.show()
 
     def _open_report_employees_by_municipality(self):
-        data = {}
-        for employee in self._employees_cache:
-            if not employee.municipality_rel:
-                continue
-            name = employee.municipality_rel.name
-            data[name] = data.get(name, 0) + 1
+        data = self._report_service.employees_by_municipality()
 
         if not data:
             self._show_info("No data available to display chart.")
@@ -427,15 +472,29 @@ class MainWindow(QMainWindow):
             })
         self.chart_window.show()
 
-    def _open_report_base_vs_honorary(self):
-        base = 0
-        honorary = 0
+    def _open_report_payroll_by_position(self):
+        data = {
+            position: round(payroll, 2)
+            for position, payroll in self._report_service.payroll_by_position().items()
+        }
+
+        if not data:
+            self._show_info("No data available to display chart.")
+            return
 
-        for employee in self._employees_cache:
-            if employee.employee_type.upper() == "BASE":
-                base += 1
-            else:
-                honorary += 1
+        self.chart_window = ChartWindow(
+            data, self, **{
+                "title": "Nomina semanal por puesto",
+                "ax_title": "Nomina semanal por puesto",
+                "ax_ylabel": "Nomina semanal",
+                "ax_xlabel": "Puestos",
+            })
+        self.chart_window.show()
+
+    def _open_report_base_vs_honorary(self):
+        counts = self._report_service.employees_by_type()
+        base = counts["BASE"]
+        honorary = counts["HONORARY"]
 
         data = {
             "Base": base,
@@ -460,29 +519,114 @@ class MainWindow(QMainWindow):
     def _import_csv(self):
         from PyQt6.QtWidgets import QFileDialog
 
+        if self._import_worker is not None:
+            self._show_info("An import is already running.")
+            return
+
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Select CSV", "", "CSV Files (*.csv)"
         )
         if not file_path:
             return
 
-        try:
-            result = self._import_service.import_csv(file_path)
-
-            summary = (
-                f"Imported: {result['inserted']}\n"
-                f"Failed: {result['failed']}"
+        resume = False
+        if ImportCheckpoint(file_path).exists():
+            answer = QMessageBox.question(
+                self,
+                "CSV Import",
+                "A previous import of this file was interrupted.\n"
+                "Resume it from the last imported row?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                | QMessageBox.StandardButton.Cancel,
             )
+            if answer == QMessageBox.StandardButton.Cancel:
+                return
+            resume = answer == QMessageBox.StandardButton.Yes
+
+        # The import runs in a worker thread with its own session
+        self._import_worker = ImportWorker(file_path, resume=resume)
+        self._import_worker.signals.progress.connect(self._on_import_progress)
+        self._import_worker.signals.finished.connect(self._on_import_finished)
+        self._import_worker.signals.failed.connect(self._on_import_failed)
+
+        self._import_progress = QProgressDialog("Importing CSV...", "Cancel", 0, 100, self)
+        self._import_progress.setWindowTitle("CSV Import")
+        self._import_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self._import_progress.setAutoClose(False)
+        self._import_progress.setAutoReset(False)
+        self._import_progress.setMinimumDuration(0)
+        self._import_progress.canceled.connect(self._import_worker.cancel)
+        self._import_progress.show()
+
+        QThreadPool.globalInstance().start(self._import_worker)
+
+    def _on_import_progress(self, progress: dict) -> None:
+        """
+        Show the counters reported by the import worker.
+        :param progress:
+        :return:
+        """
+        if self._import_progress is None:
+            return
+        self._import_progress.setValue(progress["percent"])
+        self._import_progress.setLabelText(
+            f"Rows parsed: {progress['rows_read']}\n"
+            f"Rows inserted: {progress['inserted']}\n"
+            f"Rows per second: {progress['rows_per_second']:.0f}"
+        )
 
-            QMessageBox.information(self, "CSV Import Summary", summary)
-            # refresh content of main windows
-            self._on_child_window_closed()
+    def _on_import_finished(self, result: dict) -> None:
+        """
+        Show the import summary and reload only the data that changed.
+        :param result:
+        :return:
+        """
+        self._close_import_progress()
+        self._invalidate_caches()
 
-        except Exception as exc:
-            QMessageBox.critical(self, "Import error", str(exc))
+        summary = (
+            f"Imported: {result['inserted']}\n"
+            f"Updated: {result['updated']}\n"
+            f"Failed: {result['failed']}"
+        )
+        if result["cancelled"]:
+            summary = "Import cancelled, select the same file again to resume it.\n" + summary
+
+        QMessageBox.information(self, "CSV Import Summary", summary)
+
+        if result["positions_created"] or result["municipalities_created"]:
+            self._load_filters()
+        if result["inserted"] or result["updated"]:
+            self._load_employees()
+
+    def _on_import_failed(self, message: str) -> None:
+        """
+        Show the error raised by the import worker.
+        :param message:
+        :return:
+        """
+        self._close_import_progress()
+        # Chunks written before the error may be committed
+        self._invalidate_caches()
+        QMessageBox.critical(self, "Import error", message)
+
+    def _invalidate_caches(self) -> None:
+        """
+        The import worker writes through its own services, drop what the services of this window cached.
+        :return:
+        """
+        self._position_service.invalidate_cache()
+        self._municipality_service.invalidate_cache()
+        self._employee_service.invalidate_lookup_cache()
+
+    def _close_import_progress(self) -> None:
+        if self._import_progress is not None:
+            self._import_progress.close()
+        self._import_progress = None
+        self._import_worker = None
 
     def _open_filter_age(self):
-        df = self._pandas_service.employees_to_dataframe(self._employees_cache)
+        df = self._pandas_service.rows_to_dataframe(self._employees_cache)
 
         filtered = df[(df["age"] >= 25) & (df["age"] <= 35)]
 
@@ -496,7 +640,7 @@ class MainWindow(QMainWindow):
     def _open_filter_position(self):
         from employees_management.gui.pandas_table_window import PandasTableWindow
 
-        df = self._pandas_service.employees_to_dataframe(self._employees_cache)
+        df = self._pandas_service.rows_to_dataframe(self._employees_cache)
 
         grouped = df.groupby("position").size().reset_index(name="count")
 
@@ -509,7 +653,7 @@ class MainWindow(QMainWindow):
         """
         import pandas as pd
         try:
-            df = self._pandas_service.employees_to_dataframe(self._employees_cache)
+            df = self._pandas_service.rows_to_dataframe(self._employees_cache)
         except Exception as exc:
             QMessageBox.critical(self, "Pandas error", f"Could not build DataFrame: {exc}")
             return
@@ -560,31 +704,35 @@ class MainWindow(QMainWindow):
         )
         self.chart_window.show()
 
-    def _compute_filtered_employees(self) -> List[Employee]:
-        """Return the list of employees after applying all filters."""
-        query = self.search_edit.text().strip().lower()
+    def _compute_filtered_employees(self, limit: Optional[int] = SearchService.DEFAULT_LIMIT) -> List[Row]:
+        """
+        Return the list of employees after applying all filters.
+        Text searches are answered by the full-text index, limited to the
+        first limit employees by last name. A query without any word to
+        search (only punctuation) shows the unfiltered listing.
+        """
+        query = self.search_edit.text().strip()
         selected_position_id = self.position_filter.currentData()
         selected_municipality_id = self.municipality_filter.currentData()
         selected_type = self.type_filter.currentData()
 
+        if self._search_service.has_terms(query):
+            return self._search_service.search(
+                query,
+                limit=limit,
+                position_id=selected_position_id,
+                municipality_id=selected_municipality_id,
+                employee_type=selected_type,
+            )
+
         filtered = []
 
         for e in self._employees_cache:
-
-            matches_text = (
-                    query in str(e.nss).lower()
-                    or query in e.first_name.lower()
-                    or query in e.last_name_f.lower()
-                    or query in e.last_name_m.lower()
-                    or query in e.position_rel.name.lower()
-                    or query in e.municipality_rel.name.lower()
-            ) if query else True
-
             matches_position = e.position_id == selected_position_id if selected_position_id else True
             matches_municipality = e.municipality_id == selected_municipality_id if selected_municipality_id else True
             matches_type = e.employee_type.upper() == selected_type if selected_type else True
 
-            if matches_text and matches_position and matches_municipality and matches_type:
+            if matches_position and matches_municipality and matches_type:
                 filtered.append(e)
 
         return filtered
@@ -595,7 +743,7 @@ class MainWindow(QMainWindow):
         UI is only responsible for: picking file, showing messages, sending data.
         """
 
-        filtered = self._compute_filtered_employees()
+        filtered = self._compute_filtered_employees(limit=None)
 
         if not filtered:
             QMessageBox.information(self, "No data", "No employees match the current filters.")
@@ -620,6 +768,21 @@ class MainWindow(QMainWindow):
         except Exception as exc:
             QMessageBox.critical(self, "Export error", str(exc))
 
+    def _open_query_stats(self):
+        """
+        Show the statements recorded by the engine instrumentation, most expensive first.
+        """
+        import pandas as pd
+        from employees_management.gui.pandas_table_window import PandasTableWindow
+
+        statements = self._query_recorder.top_statements(limit=50)
+        if not statements:
+            QMessageBox.information(self, "No data", "No SQL statements recorded yet.")
+            return
+
+        window = PandasTableWindow(pd.DataFrame(statements), "Estadisticas SQL (top 50 por tiempo total)", self)
+        window.show()
+
     def _open_about_dialog(self):
         dialog = AboutDialog(self)
         dialog.exec()
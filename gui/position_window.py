@@ -211,9 +211,7 @@ class PositionWindow(QMainWindow):
             position = self._find_by_id(self._selected_id)
             if position:
                 try:
-                    session = self._service._repository._session
-                    session.delete(position)
-                    session.commit()
+                    self._service.delete_position(position)
                     self._load_positions()
                 except Exception as exc:
                     self._show_error(str(exc))
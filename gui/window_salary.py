@@ -6,6 +6,7 @@ Description: Salary calculator window for employees (DB + SQLAlchemy version).
 
 from __future__ import annotations
 from PyQt6 import QtWidgets
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QMessageBox, QLabel, QFormLayout, QLineEdit, QDialogButtonBox
 
 from employees_management.application.employee_service import EmployeeService
@@ -17,6 +18,9 @@ class SalaryWindow(QtWidgets.QDialog):
     Dialog to calculate salary for an employee.
     """
 
+    # Milliseconds without typing before the NSS is looked up
+    SEARCH_DELAY_MS = 300
+
     def __init__(
             self,
             employee_service: EmployeeService,
@@ -25,6 +29,12 @@ class SalaryWindow(QtWidgets.QDialog):
         super().__init__(parent)
         self._employee_service = employee_service
 
+        # Restarted on every keystroke, only the NSS left when typing pauses is looked up
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._on_search_employee)
+
         self.setWindowTitle("Salary Calculator")
         self._build_ui()
 
@@ -34,7 +44,8 @@ class SalaryWindow(QtWidgets.QDialog):
 
         # NSS input
         self.nss_input = QLineEdit()
-        self.nss_input.textChanged.connect(self._on_search_employee)
+        self.nss_input.textChanged.connect(self._on_nss_changed)
+        self.nss_input.returnPressed.connect(self._flush_search)
         layout.addRow("NSS:", self.nss_input)
 
         # Employee readonly info
@@ -74,6 +85,20 @@ class SalaryWindow(QtWidgets.QDialog):
         self._current_employee: Employee | None = None
 
     # QUERY EMPLOYEE DATA WHEN NSS CHANGES
+    def _on_nss_changed(self) -> None:
+        # The shown employee no longer matches the text
+        self._clear_employee_info()
+        if self.nss_input.text().strip().isdigit():
+            self._search_timer.start()
+        else:
+            self._search_timer.stop()
+
+    def _flush_search(self) -> None:
+        # Look up a pending NSS right away, e.g. on Enter or before calculating
+        if self._search_timer.isActive():
+            self._search_timer.stop()
+            self._on_search_employee()
+
     def _on_search_employee(self) -> None:
         text = self.nss_input.text().strip()
 
@@ -82,7 +107,8 @@ class SalaryWindow(QtWidgets.QDialog):
             return
 
         nss = int(text)
-        employee = self._employee_service.find_employee(nss)
+        # Repeated NSS values are served by the service LRU cache
+        employee = self._employee_service.lookup_employee(nss)
 
         if not employee:
             self._clear_employee_info()
@@ -114,6 +140,7 @@ class SalaryWindow(QtWidgets.QDialog):
 
     # SALARY CALCULATION
     def _on_calculate(self) -> None:
+        self._flush_search()
         if not self._current_employee:
             QMessageBox.warning(self, "Error", "Employee not found.")
             return
@@ -0,0 +1,67 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio db engine and session factory, created on first use so
+greenlet and the async drivers (aiosqlite or asyncmy) stay optional.
+"""
+import importlib.util
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from employees_management.config.settings import (
+    get_async_database_url,
+    get_connect_args,
+    get_pool_options,
+    get_sqlite_pragmas,
+)
+from employees_management.infrastructure.db import apply_sqlite_pragmas
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    asyncio engine of the configured database, with the same connection
+    arguments, pool settings and SQLite profile as the synchronous engine.
+    :return:
+    """
+    global _async_engine
+    if _async_engine is None:
+        # SQLAlchemy only reports a missing greenlet on the first query
+        if importlib.util.find_spec("greenlet") is None:
+            raise ImportError(
+                "The async services need greenlet and an async database driver: "
+                "pip install -r requirements-async.txt"
+            )
+        try:
+            _async_engine = create_async_engine(
+                get_async_database_url(),
+                connect_args=get_connect_args(),
+                echo=False,
+                **get_pool_options()
+            )
+        except ImportError as exc:
+            raise ImportError(
+                "The async services need an async database driver: pip install aiosqlite (SQLite) "
+                "or pip install asyncmy (MySQL), see requirements-async.txt"
+            ) from exc
+        apply_sqlite_pragmas(_async_engine.sync_engine, get_sqlite_pragmas())
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    Factory of AsyncSession objects bound to the async engine.
+    Objects stay readable after commit, as with SessionLocal.
+    :return:
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
@@ -0,0 +1,335 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio repository for employee CRUD operations using SQLAlchemy.
+"""
+
+from typing import Any, Optional
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from employees_management.config.settings import get_eager_loading
+from employees_management.domain.employee_repository import IAsyncEmployeeRepository
+from employees_management.domain.models import Employee
+from employees_management.infrastructure.employee_queries import (
+    EMPLOYEE_FIELDS,
+    NSS_BATCH_SIZE,
+    after_cursor,
+    count_search_select,
+    filter_clauses,
+    filter_rows,
+    loader_options,
+    rows_select,
+    search_select,
+)
+
+
+class AsyncEmployeeRepositoryImpl(IAsyncEmployeeRepository):
+    """
+    SQLAlchemy asyncio implementation of the IAsyncEmployeeRepository interface.
+    Runs the same statements as EmployeeRepositoryImpl on an AsyncSession.
+    Writes are only flushed, the unit of work of the session provider
+    commits them.
+    """
+
+    def __init__(self, session: AsyncSession, eager_loading: Optional[str] = None):
+        self._session = session
+        eager_loading = eager_loading or get_eager_loading()
+        # Lazy loads cannot run inside the event loop, relationships are always loaded eagerly
+        self._eager_loading = "selectin" if eager_loading == "lazy" else eager_loading
+
+    async def list_employees(self) -> list[Employee]:
+        """
+        Retrieve all employees from the database, ordered by last name.
+
+        Returns:
+            list[Employee]: List of all Employee instances.
+        """
+        result = await self._session.execute(
+            select(Employee).options(*loader_options(self._eager_loading)).order_by(Employee.last_name_f)
+        )
+        return list(result.scalars().all())
+
+    async def list_employees_page(
+            self,
+            cursor: Optional[tuple[str, int]] = None,
+            page_size: int = 100,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> tuple[list[Employee], Optional[tuple[str, int]]]:
+        """
+        Retrieve one page of employees ordered by (last_name_f, id) using
+        keyset pagination.
+
+        Args:
+            cursor (Optional[tuple[str, int]]): (last_name_f, id) of the last
+                employee of the previous page, None for the first page.
+            page_size (int): Maximum number of employees in the page.
+            position_id (Optional[int]): Only employees with this position.
+            municipality_id (Optional[int]): Only employees in this municipality.
+            employee_type (Optional[str]): Only employees of this type.
+
+        Returns:
+            tuple: The employees of the page and the cursor of the next page,
+                None when this is the last page.
+        """
+        statement = filter_rows(
+            select(Employee).options(*loader_options(self._eager_loading)),
+            position_id, municipality_id, employee_type,
+        )
+        if cursor is not None:
+            statement = statement.where(after_cursor(cursor))
+
+        # One extra row tells whether another page exists
+        result = await self._session.execute(
+            statement.order_by(Employee.last_name_f, Employee.id).limit(page_size + 1)
+        )
+        employees = list(result.scalars().all())
+        if len(employees) <= page_size:
+            return employees, None
+
+        employees = employees[:page_size]
+        last = employees[-1]
+        return employees, (last.last_name_f, last.id)
+
+    async def list_employee_rows(
+            self,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> list[Row]:
+        """
+        Read-only rows of the employees ordered by last name, with the
+        position and municipality names joined in.
+
+        Args:
+            position_id (Optional[int]): Only employees of this position.
+            municipality_id (Optional[int]): Only employees of this municipality.
+            employee_type (Optional[str]): Only employees of this type.
+
+        Returns:
+            list[Row]: Rows with the EMPLOYEE_ROW_FIELDS fields.
+        """
+        statement = filter_rows(rows_select(), position_id, municipality_id, employee_type)
+        result = await self._session.execute(statement.order_by(Employee.last_name_f, Employee.id))
+        return list(result.all())
+
+    async def search(
+            self,
+            terms: list[str],
+            limit: Optional[int] = None,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> list[Row]:
+        """
+        Employees whose NSS, names, position or municipality start with every
+        term, using the full-text index (see EmployeeRepositoryImpl.search).
+
+        Args:
+            terms (list[str]): Prefixes to match.
+            limit (Optional[int]): Maximum number of employees, None for all.
+            position_id (Optional[int]): Only employees of this position.
+            municipality_id (Optional[int]): Only employees of this municipality.
+            employee_type (Optional[str]): Only employees of this type.
+
+        Returns:
+            list[Row]: Matching employees as read-only rows.
+        """
+        dialect = self._session.bind.dialect.name
+        statement = search_select(dialect, terms, position_id, municipality_id, employee_type, limit)
+        result = await self._session.execute(statement.order_by(Employee.last_name_f, Employee.id))
+        return list(result.all())
+
+    async def count_search(
+            self,
+            terms: list[str],
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+            limit: Optional[int] = None,
+    ) -> int:
+        """
+        Number of employees a search without limit would return, counting
+        at most limit of them.
+
+        Args:
+            terms (list[str]): Prefixes to match.
+            position_id (Optional[int]): Only employees of this position.
+            municipality_id (Optional[int]): Only employees of this municipality.
+            employee_type (Optional[str]): Only employees of this type.
+            limit (Optional[int]): Stop counting at this number, None to count all.
+
+        Returns:
+            int: Number of matching employees, at most limit.
+        """
+        dialect = self._session.bind.dialect.name
+        statement = count_search_select(dialect, terms, position_id, municipality_id, employee_type, limit)
+        return (await self._session.execute(statement)).scalar()
+
+    async def get(self, employee_id: int) -> Optional[Employee]:
+        """
+        Retrieve a single employee by ID.
+
+        Args:
+            employee_id (int): The ID of the employee to retrieve.
+
+        Returns:
+            Optional[Employee]: The employee instance if found, None otherwise.
+        """
+        return await self._session.get(Employee, employee_id)
+
+    async def find_by_nss(self, nss: int) -> Optional[Employee]:
+        """
+        Retrieve a single employee by nss, with its position and municipality.
+
+        Args:
+            nss (int): The nss of the employee to retrieve.
+
+        Returns:
+            Optional[Employee]: The employee instance if found, None otherwise.
+        """
+        result = await self._session.execute(
+            select(Employee).options(*loader_options(self._eager_loading)).where(Employee.nss == nss).limit(1)
+        )
+        return result.scalars().first()
+
+    async def add(self, employee: Employee) -> Employee:
+        """
+        Add a new employee to the database.
+
+        Args:
+            employee (Employee): The Employee object to add.
+
+        Returns:
+            Employee: The persisted Employee instance with ID assigned.
+        """
+        self._session.add(employee)
+        await self._session.flush()
+        await self._refresh(employee)
+        return employee
+
+    async def update(self, employee: Employee) -> Employee:
+        """
+        update employee to the database.
+
+        Args:
+            employee (Employee): The Employee object to update.
+
+        Returns:
+            Employee: The persisted Employee instance.
+        """
+        await self._session.flush()
+        await self._refresh(employee)
+        return employee
+
+    async def delete(self, employee_id: int) -> bool:
+        """
+        Delete an employee by ID.
+
+        Args:
+            employee_id (int): ID of the employee to delete.
+
+        Returns:
+            bool: True if deletion was successful, False if employee was not found.
+        """
+        employee = await self.get(employee_id)
+        if not employee:
+            return False
+        await self._session.delete(employee)
+        await self._session.flush()
+        return True
+
+    async def _refresh(self, employee: Employee) -> None:
+        """
+        Reload the employee with its position and municipality, relationships
+        cannot be lazy loaded once the session is closed.
+
+        Args:
+            employee (Employee): The persisted Employee instance.
+        """
+        await self._session.refresh(employee)
+        await self._session.refresh(employee, attribute_names=["position_rel", "municipality_rel"])
+
+    async def find_existing_by_nss(self, nss_list: list[int]) -> dict[int, Any]:
+        """
+        Retrieve the stored values of the employees whose NSS is in the list
+        with one IN query per NSS_BATCH_SIZE values.
+
+        Args:
+            nss_list (list[int]): NSS values to look for.
+
+        Returns:
+            dict[int, Row]: Rows with the id and editable columns, keyed by NSS.
+        """
+        existing = {}
+        for start in range(0, len(nss_list), NSS_BATCH_SIZE):
+            result = await self._session.execute(
+                select(Employee.id, *[getattr(Employee, field) for field in EMPLOYEE_FIELDS])
+                .where(Employee.nss.in_(nss_list[start:start + NSS_BATCH_SIZE]))
+            )
+            existing.update((row.nss, row) for row in result.all())
+        return existing
+
+    async def bulk_insert_rows(self, rows: list[dict]) -> None:
+        """
+        Insert many employees from plain column values with one executemany.
+
+        Args:
+            rows (list[dict]): Column values of each new employee.
+        """
+        await self._session.execute(insert(Employee), rows)
+
+    async def bulk_upsert(self, rows: list[dict], updates: list[dict]) -> None:
+        """
+        Insert new employees and update existing ones in a single transaction.
+
+        Args:
+            rows (list[dict]): Column values of each new employee.
+            updates (list[dict]): Column values to update, each one including the employee id.
+        """
+        if rows:
+            await self._session.execute(insert(Employee), rows)
+        if updates:
+            # ORM bulk UPDATE by primary key
+            await self._session.execute(update(Employee), updates)
+
+    async def update_many(self, filters: dict[str, Any], values: dict[str, Any]) -> int:
+        """
+        Update every employee matching the filters with one UPDATE statement.
+
+        Args:
+            filters (dict): Column values to match, a list/tuple/set matches any of its values.
+            values (dict): New column values or SQL expressions.
+
+        Returns:
+            int: Number of updated employees.
+        """
+        statement = (
+            update(Employee)
+            .where(*filter_clauses(filters))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(statement)
+        return result.rowcount
+
+    async def delete_many(self, filters: Optional[dict[str, Any]] = None, nss_list: Optional[list[int]] = None) -> int:
+        """
+        Delete every employee matching the filters and/or NSS list with one
+        DELETE statement.
+
+        Args:
+            filters (Optional[dict]): Column values to match, a list/tuple/set matches any of its values.
+            nss_list (Optional[list[int]]): NSS values of the employees to delete.
+
+        Returns:
+            int: Number of deleted employees.
+        """
+        clauses = filter_clauses(filters or {})
+        if nss_list is not None:
+            clauses.append(Employee.nss.in_(nss_list))
+
+        statement = delete(Employee).where(*clauses).execution_options(synchronize_session=False)
+        result = await self._session.execute(statement)
+        return result.rowcount
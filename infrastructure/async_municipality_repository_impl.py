@@ -0,0 +1,93 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio repository for municipality crud
+"""
+
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from employees_management.domain.models import Municipality
+from employees_management.domain.municipality_repository import IAsyncMunicipalityRepository
+
+
+class AsyncMunicipalityRepositoryImpl(IAsyncMunicipalityRepository):
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def list_municipalities(self) -> list[Municipality]:
+        """
+        List all municipalities
+        :return:
+        """
+        result = await self._session.execute(select(Municipality).order_by(Municipality.name))
+        return list(result.scalars().all())
+
+    async def get(self, municipality_id: int) -> Optional[Municipality]:
+        """
+        Get municipality by id
+        :param municipality_id:
+        :return:
+        """
+        return await self._session.get(Municipality, municipality_id)
+
+    async def add(self, name: str) -> Municipality:
+        """
+        Add a municipality
+        :param name:
+        :return:
+        """
+        municipality = Municipality(name=name)
+        self._session.add(municipality)
+        await self._session.flush()
+        await self._session.refresh(municipality)
+        return municipality
+
+    async def update(self, municipality: Municipality) -> Municipality:
+        """
+        update municipality to the database.
+        :param municipality:
+        :return:
+        """
+        await self._session.flush()
+        await self._session.refresh(municipality)
+        return municipality
+
+    async def find_by_name(self, name: str) -> Optional[Municipality]:
+        """
+        Get municipality by name
+        :param name:
+        :return:
+        """
+        result = await self._session.execute(select(Municipality).where(Municipality.name == name).limit(1))
+        return result.scalars().first()
+
+    async def name_to_id(self) -> dict[str, int]:
+        """
+        Map every municipality name to its id using a single query
+        :return:
+        """
+        result = await self._session.execute(select(Municipality.name, Municipality.id))
+        return dict(result.all())
+
+    async def bulk_add(self, names: set[str]) -> dict[str, int]:
+        """
+        Add many municipalities with one flush
+        :param names:
+        :return: id of each new municipality by name
+        """
+        created = [Municipality(name=name) for name in names]
+        self._session.add_all(created)
+        await self._session.flush()
+        return {municipality.name: municipality.id for municipality in created}
+
+    async def delete(self, municipality: Municipality) -> bool:
+        """
+        Delete municipality
+        :param municipality:
+        :return:
+        """
+        await self._session.delete(municipality)
+        await self._session.flush()
+        return True
@@ -0,0 +1,94 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio repository for position crud
+"""
+
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from employees_management.domain.models import Position
+from employees_management.domain.position_repository import IAsyncPositionRepository
+
+
+class AsyncPositionRepositoryImpl(IAsyncPositionRepository):
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def list_positions(self) -> list[Position]:
+        """
+        List all positions
+        :return:
+        """
+        result = await self._session.execute(select(Position).order_by(Position.name))
+        return list(result.scalars().all())
+
+    async def get(self, position_id: int) -> Optional[Position]:
+        """
+        Get position by id
+        :param position_id:
+        :return:
+        """
+        return await self._session.get(Position, position_id)
+
+    async def add(self, name: str, base_salary: float) -> Position:
+        """
+        Add a position
+        :param base_salary:
+        :param name:
+        :return:
+        """
+        position = Position(name=name, base_salary=base_salary)
+        self._session.add(position)
+        await self._session.flush()
+        await self._session.refresh(position)
+        return position
+
+    async def update(self, position: Position) -> Position:
+        """
+        update position to the database.
+        :param position:
+        :return:
+        """
+        await self._session.flush()
+        await self._session.refresh(position)
+        return position
+
+    async def find_by_name(self, name: str) -> Optional[Position]:
+        """
+        Get position by name
+        :param name:
+        :return:
+        """
+        result = await self._session.execute(select(Position).where(Position.name == name).limit(1))
+        return result.scalars().first()
+
+    async def name_to_id(self) -> dict[str, int]:
+        """
+        Map every position name to its id using a single query
+        :return:
+        """
+        result = await self._session.execute(select(Position.name, Position.id))
+        return dict(result.all())
+
+    async def bulk_add(self, positions: dict[str, float]) -> dict[str, int]:
+        """
+        Add many positions with one flush
+        :param positions: base salary by position name
+        :return: id of each new position by name
+        """
+        created = [Position(name=name, base_salary=salary) for name, salary in positions.items()]
+        self._session.add_all(created)
+        await self._session.flush()
+        return {position.name: position.id for position in created}
+
+    async def delete(self, position: Position) -> bool:
+        """
+        Delete position
+        :param position:
+        :return:
+        """
+        await self._session.delete(position)
+        await self._session.flush()
+        return True
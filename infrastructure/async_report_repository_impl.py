@@ -0,0 +1,69 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: asyncio repository for employee reports, read from the employee summary table
+"""
+
+from sqlalchemy import FromClause
+from sqlalchemy.ext.asyncio import AsyncSession
+from employees_management.domain.report_repository import IAsyncReportRepository
+from employees_management.infrastructure.report_repository_impl import (
+    count_by_employee_type_select,
+    count_by_municipality_select,
+    count_by_position_select,
+    payroll_by_municipality_select,
+    payroll_by_position_select,
+    report_source,
+    summary_missing_select,
+)
+
+
+class AsyncReportRepositoryImpl(IAsyncReportRepository):
+    """
+    Runs the statements of ReportRepositoryImpl on an AsyncSession.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def count_by_position(self) -> dict[str, int]:
+        """
+        Number of employees by position name
+        :return:
+        """
+        return dict((await self._session.execute(count_by_position_select(await self._source()))).all())
+
+    async def count_by_municipality(self) -> dict[str, int]:
+        """
+        Number of employees by municipality name
+        :return:
+        """
+        return dict((await self._session.execute(count_by_municipality_select(await self._source()))).all())
+
+    async def count_by_employee_type(self) -> dict[str, int]:
+        """
+        Number of employees by employee type
+        :return:
+        """
+        return dict((await self._session.execute(count_by_employee_type_select(await self._source()))).all())
+
+    async def payroll_by_position(self) -> dict[str, float]:
+        """
+        Weekly payroll by position name
+        :return:
+        """
+        return dict((await self._session.execute(payroll_by_position_select(await self._source()))).all())
+
+    async def payroll_by_municipality(self) -> dict[str, float]:
+        """
+        Weekly payroll by municipality name
+        :return:
+        """
+        return dict((await self._session.execute(payroll_by_municipality_select(await self._source()))).all())
+
+    async def _source(self) -> FromClause:
+        """
+        Summary rows the reports add up (see ReportRepositoryImpl).
+        :return:
+        """
+        return report_source(bool((await self._session.execute(summary_missing_select())).scalar()))
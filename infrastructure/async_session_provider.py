@@ -0,0 +1,39 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Unit-of-work session scoping used by the asyncio application services.
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class AsyncSessionProvider:
+    """
+    asyncio counterpart of SessionProvider: one AsyncSession per unit of
+    work. Concurrent tasks each get their own session, so lookups, reports
+    and imports can run together on one event loop.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker):
+        self._session_factory = session_factory
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[AsyncSession]:
+        """
+        AsyncSession of one unit of work. It is committed when the block
+        ends, rolled back when the block raises, and closed in both cases.
+
+        Yields:
+            AsyncSession: The session of the unit of work.
+        """
+        session = self._session_factory()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -3,21 +3,140 @@ Author: Raul Granados
 Company: Swipall
 Description: initial db engine a local session
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from employees_management.config.settings import get_database_url
+import logging
+from typing import Optional
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import ORMExecuteState, declarative_base, raiseload, sessionmaker
+from employees_management.config.settings import (
+    get_connect_args,
+    get_database_url,
+    get_pool_options,
+    get_slow_query_log,
+    get_slow_query_ms,
+    get_sqlite_pragmas,
+    is_query_stats_enabled,
+    is_strict_loading,
+)
+from employees_management.infrastructure.pool_metrics import MeteredQueuePool
+from employees_management.infrastructure.query_metrics import QueryRecorder, slow_query_logger
+
+pool_options = get_pool_options()
+if pool_options:
+    pool_options["poolclass"] = MeteredQueuePool
 
 engine = create_engine(
     get_database_url(),
+    connect_args=get_connect_args(),
     echo=False,
-    future=True
+    future=True,
+    **pool_options
 )
 
+# Sessions live for one unit of work (see session_provider), objects they
+# loaded must stay readable after the commit that ends it
 SessionLocal = sessionmaker(
     bind=engine,
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     future=True
 )
 
 Base = declarative_base()
+
+# Set by enable_query_stats when DB_QUERY_STATS=1
+query_recorder: Optional[QueryRecorder] = None
+
+
+def apply_sqlite_pragmas(db_engine: Engine, pragmas: dict) -> None:
+    """
+    Run the given PRAGMA statements on every new connection of a SQLite
+    engine, e.g. the journal mode, page cache size and busy timeout.
+    :param db_engine:
+    :param pragmas: PRAGMA name to value
+    :return:
+    """
+    if not pragmas or db_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(db_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def enable_strict_loading(session_factory: sessionmaker) -> None:
+    """
+    Make every ORM query of the sessions created by session_factory raise
+    on lazy relationship loads. Relationships must then be loaded eagerly,
+    so hidden per-row queries (N+1) fail loudly instead of slowly.
+    :param session_factory:
+    :return:
+    """
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _raise_on_lazy_load(execute_state: ORMExecuteState) -> None:
+        if execute_state.is_select and not execute_state.is_relationship_load:
+            # Explicit eager options of the statement still take precedence
+            execute_state.statement = execute_state.statement.options(raiseload("*"))
+
+
+def get_pool_metrics(db_engine: Engine = engine) -> dict:
+    """
+    Usage metrics of the connection pool of an engine.
+    Engines without a MeteredQueuePool only report their pool status.
+    :param db_engine:
+    :return: metrics dictionary
+    """
+    pool = db_engine.pool
+    if isinstance(pool, MeteredQueuePool):
+        return pool.metrics()
+    return {"status": pool.status()}
+
+
+def enable_query_stats(
+        db_engine: Engine,
+        slow_query_ms: float = 200.0,
+        slow_query_log: Optional[str] = None,
+) -> QueryRecorder:
+    """
+    Record the time and row count of every statement of an engine, grouped
+    by the service method that issued it, and log the slow ones.
+    :param db_engine:
+    :param slow_query_ms: statements slower than this are logged
+    :param slow_query_log: optional file the slow queries are appended to
+    :return: the recorder, see QueryRecorder.summary
+    """
+    recorder = QueryRecorder(slow_query_ms)
+    recorder.install(db_engine)
+    if slow_query_log:
+        handler = logging.FileHandler(slow_query_log)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_logger.addHandler(handler)
+    return recorder
+
+
+def get_query_stats(limit: Optional[int] = 10, order_by: str = "total_ms") -> list[dict]:
+    """
+    Top statements recorded by the engine instrumentation.
+    :param limit: number of statements, None for all
+    :param order_by: total_ms, avg_ms, max_ms, count or rows
+    :return: empty when DB_QUERY_STATS is not enabled
+    """
+    if query_recorder is None:
+        return []
+    return query_recorder.top_statements(limit, order_by)
+
+
+apply_sqlite_pragmas(engine, get_sqlite_pragmas())
+
+if is_query_stats_enabled():
+    query_recorder = enable_query_stats(engine, get_slow_query_ms(), get_slow_query_log())
+
+if is_strict_loading():
+    enable_strict_loading(SessionLocal)
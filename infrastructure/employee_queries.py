@@ -0,0 +1,165 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Employee columns and SQLAlchemy statement builders shared by
+the synchronous and asyncio employee repositories.
+"""
+from typing import Any, Optional
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.orm import joinedload, selectinload
+from employees_management.domain.models import Employee, Municipality, Position
+from employees_management.infrastructure.search_index import matching_ids
+
+# Columns that identify and describe an employee, in the order used by the CSV import.
+EMPLOYEE_FIELDS = (
+    "nss",
+    "first_name",
+    "last_name_f",
+    "last_name_m",
+    "position_id",
+    "municipality_id",
+    "birth_date",
+    "employee_type",
+    "hourly_rate",
+    "hours_worked",
+)
+
+# NSS values bound per IN query, far below SQLite's limit of 32766 variables
+# and MySQL's max_allowed_packet whatever the import chunk size.
+NSS_BATCH_SIZE = 500
+
+# Fields of the read-only employee rows, with the position and municipality names.
+EMPLOYEE_ROW_FIELDS = (
+    "id",
+    "nss",
+    "first_name",
+    "last_name_f",
+    "last_name_m",
+    "position_id",
+    "position",
+    "municipality_id",
+    "municipality",
+    "birth_date",
+    "employee_type",
+    "hourly_rate",
+    "hours_worked",
+)
+
+
+def loader_options(eager_loading: str) -> list:
+    """
+    Loader options for the position and municipality of listed employees.
+    "selectin" runs one extra query per relationship, "joined" adds
+    LEFT JOINs to the listing query and "lazy" loads them on first access.
+    """
+    if eager_loading == "selectin":
+        return [selectinload(Employee.position_rel), selectinload(Employee.municipality_rel)]
+    if eager_loading == "joined":
+        return [joinedload(Employee.position_rel), joinedload(Employee.municipality_rel)]
+    return []
+
+
+def rows_select() -> Select:
+    """
+    Columns of the read-only employee rows.
+    """
+    return (
+        select(
+            Employee.id,
+            Employee.nss,
+            Employee.first_name,
+            Employee.last_name_f,
+            Employee.last_name_m,
+            Employee.position_id,
+            Position.name.label("position"),
+            Employee.municipality_id,
+            Municipality.name.label("municipality"),
+            Employee.birth_date,
+            Employee.employee_type,
+            Employee.hourly_rate,
+            Employee.hours_worked,
+        )
+        .join(Position, Employee.position_id == Position.id)
+        .join(Municipality, Employee.municipality_id == Municipality.id)
+    )
+
+
+def search_select(
+        dialect: str,
+        terms: list[str],
+        position_id: Optional[int],
+        municipality_id: Optional[int],
+        employee_type: Optional[str],
+        limit: Optional[int] = None,
+) -> Select:
+    """
+    Read-only rows of the employees matching every search term and the
+    filters, unordered. With a limit only the best ranked matches are joined.
+    """
+    # The full-text query applies the filters, filtering the employee table
+    # too would make the SQLite planner scan it instead
+    matches = matching_ids(dialect, terms, position_id, municipality_id, employee_type, limit).subquery()
+    return rows_select().join(matches, Employee.id == matches.c[0])
+
+
+def count_search_select(
+        dialect: str,
+        terms: list[str],
+        position_id: Optional[int],
+        municipality_id: Optional[int],
+        employee_type: Optional[str],
+        limit: Optional[int] = None,
+) -> Select:
+    """
+    Number of employees matching every search term and the filters,
+    counting at most limit of them.
+    """
+    matches = matching_ids(dialect, terms, position_id, municipality_id, employee_type)
+    if limit is not None:
+        matches = matches.limit(limit)
+    return select(func.count()).select_from(matches.subquery())
+
+
+def after_cursor(cursor: tuple[str, int]):
+    """
+    Condition selecting the employees after a (last_name_f, id) keyset cursor.
+    """
+    last_name_f, employee_id = cursor
+    return or_(
+        Employee.last_name_f > last_name_f,
+        and_(Employee.last_name_f == last_name_f, Employee.id > employee_id),
+    )
+
+
+def filter_rows(
+        statement: Select,
+        position_id: Optional[int],
+        municipality_id: Optional[int],
+        employee_type: Optional[str],
+) -> Select:
+    """
+    Apply the optional listing filters to an employee statement.
+    """
+    if position_id is not None:
+        statement = statement.where(Employee.position_id == position_id)
+    if municipality_id is not None:
+        statement = statement.where(Employee.municipality_id == municipality_id)
+    if employee_type is not None:
+        statement = statement.where(Employee.employee_type == employee_type)
+    return statement
+
+
+def filter_clauses(filters: dict[str, Any]) -> list:
+    """
+    Build WHERE clauses from a dictionary of employee column values.
+    """
+    clauses = []
+    for column_name, value in filters.items():
+        column = Employee.__table__.columns.get(column_name)
+        if column is None:
+            raise ValueError(f"Unknown employee column: {column_name}")
+        if isinstance(value, (list, tuple, set)):
+            clauses.append(column.in_(value))
+        else:
+            clauses.append(column == value)
+    return clauses
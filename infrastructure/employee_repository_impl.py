@@ -4,29 +4,183 @@ Company: Swipall
 Description: Repository for employee CRUD operations using SQLAlchemy.
 """
 
+import os
+import tempfile
+from datetime import date
 from typing import Optional, Any
+from sqlalchemy import Connection, Row, delete, insert, update
 from sqlalchemy.orm import Session
+from employees_management.config.settings import get_eager_loading
 from employees_management.domain.models import Employee
 from employees_management.domain.employee_repository import IEmployeeRepository
+from employees_management.infrastructure.employee_queries import (
+    EMPLOYEE_FIELDS,
+    NSS_BATCH_SIZE,
+    after_cursor,
+    count_search_select,
+    filter_clauses,
+    filter_rows,
+    loader_options,
+    rows_select,
+    search_select,
+)
 
 
 class EmployeeRepositoryImpl(IEmployeeRepository):
     """
     SQLAlchemy implementation of the IEmployeeRepository interface.
-    Provides basic CRUD operations on Employee entities.
+    Provides basic CRUD operations on Employee entities. Writes are only
+    flushed, the unit of work of the session provider commits them.
     """
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, eager_loading: Optional[str] = None):
         self._session = session
+        self._eager_loading = eager_loading or get_eager_loading()
 
     def list_employees(self) -> list[type[Employee]]:
         """
         Retrieve all employees from the database, ordered by last name.
+        Position and municipality are loaded with the configured eager strategy.
 
         Returns:
             list[Employee]: List of all Employee instances.
         """
-        return self._session.query(Employee).order_by(Employee.last_name_f).all()
+        return (
+            self._session.query(Employee)
+            .options(*self._relationship_options())
+            .order_by(Employee.last_name_f)
+            .all()
+        )
+
+    def list_employees_page(
+            self,
+            cursor: Optional[tuple[str, int]] = None,
+            page_size: int = 100,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> tuple[list[Employee], Optional[tuple[str, int]]]:
+        """
+        Retrieve one page of employees ordered by (last_name_f, id) using
+        keyset pagination, so every page costs the same no matter how deep it is.
+
+        Args:
+            cursor (Optional[tuple[str, int]]): (last_name_f, id) of the last
+                employee of the previous page, None for the first page.
+            page_size (int): Maximum number of employees in the page.
+            position_id (Optional[int]): Only employees with this position.
+            municipality_id (Optional[int]): Only employees in this municipality.
+            employee_type (Optional[str]): Only employees of this type.
+
+        Returns:
+            tuple: The employees of the page and the cursor of the next page,
+                None when this is the last page.
+        """
+        query = self._session.query(Employee).options(*self._relationship_options())
+
+        if position_id is not None:
+            query = query.filter(Employee.position_id == position_id)
+        if municipality_id is not None:
+            query = query.filter(Employee.municipality_id == municipality_id)
+        if employee_type is not None:
+            query = query.filter(Employee.employee_type == employee_type)
+        if cursor is not None:
+            query = query.filter(after_cursor(cursor))
+
+        # One extra row tells whether another page exists
+        employees = query.order_by(Employee.last_name_f, Employee.id).limit(page_size + 1).all()
+        if len(employees) <= page_size:
+            return employees, None
+
+        employees = employees[:page_size]
+        last = employees[-1]
+        return employees, (last.last_name_f, last.id)
+
+    def search(
+            self,
+            terms: list[str],
+            limit: Optional[int] = None,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> list[Row]:
+        """
+        Employees whose NSS, names, position or municipality start with every
+        term, found through the full-text index. A limited search keeps the
+        best ranked matches and sorts only those by last name, so a broad
+        prefix does not sort every match on each keystroke.
+
+        Args:
+            terms (list[str]): Prefixes to match.
+            limit (Optional[int]): Maximum number of employees, None for all.
+            position_id (Optional[int]): Only employees of this position.
+            municipality_id (Optional[int]): Only employees of this municipality.
+            employee_type (Optional[str]): Only employees of this type.
+
+        Returns:
+            list[Row]: Matching employees as read-only rows (see list_employee_rows).
+        """
+        dialect = self._session.get_bind().dialect.name
+        statement = search_select(dialect, terms, position_id, municipality_id, employee_type, limit)
+        return self._session.execute(statement.order_by(Employee.last_name_f, Employee.id)).all()
+
+    def count_search(
+            self,
+            terms: list[str],
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+            limit: Optional[int] = None,
+    ) -> int:
+        """
+        Number of employees a search without limit would return, counting
+        at most limit of them.
+
+        Args:
+            terms (list[str]): Prefixes to match.
+            position_id (Optional[int]): Only employees of this position.
+            municipality_id (Optional[int]): Only employees of this municipality.
+            employee_type (Optional[str]): Only employees of this type.
+            limit (Optional[int]): Stop counting at this number, None to count all.
+
+        Returns:
+            int: Number of matching employees, at most limit.
+        """
+        dialect = self._session.get_bind().dialect.name
+        return self._session.execute(
+            count_search_select(dialect, terms, position_id, municipality_id, employee_type, limit)
+        ).scalar()
+
+    def list_employee_rows(
+            self,
+            position_id: Optional[int] = None,
+            municipality_id: Optional[int] = None,
+            employee_type: Optional[str] = None,
+    ) -> list[Row]:
+        """
+        Read-only rows of the employees ordered by last name, with the
+        position and municipality names joined in. Rows are plain named
+        tuples, no ORM object is built or tracked by the session.
+
+        Args:
+            position_id (Optional[int]): Only employees of this position.
+            municipality_id (Optional[int]): Only employees of this municipality.
+            employee_type (Optional[str]): Only employees of this type.
+
+        Returns:
+            list[Row]: Rows with the EMPLOYEE_ROW_FIELDS fields.
+        """
+        statement = filter_rows(rows_select(), position_id, municipality_id, employee_type)
+        return self._session.execute(statement.order_by(Employee.last_name_f, Employee.id)).all()
+
+    def _relationship_options(self) -> list:
+        """
+        Loader options for the position and municipality of listed employees.
+
+        Returns:
+            list: SQLAlchemy loader options.
+        """
+        return loader_options(self._eager_loading)
 
     def get(self, employee_id: int) -> Optional[Employee]:
         """
@@ -63,18 +217,98 @@ class EmployeeRepositoryImpl(IEmployeeRepository):
             Employee: The persisted Employee instance with ID assigned.
         """
         self._session.add(employee)
-        self._session.commit()
+        self._session.flush()
         self._session.refresh(employee)
         return employee
 
     def bulk_insert(self, employees: list[Employee]) -> None:
         """Insert many Employee records efficiently."""
-        try:
-            self._session.bulk_save_objects(employees)
-            self._session.commit()
-        except Exception:
-            self._session.rollback()
-            raise
+        self._session.bulk_save_objects(employees)
+
+    def find_existing_by_nss(self, nss_list: list[int]) -> dict[int, Any]:
+        """
+        Retrieve the stored values of the employees whose NSS is in the list
+        with one IN query per NSS_BATCH_SIZE values.
+
+        Args:
+            nss_list (list[int]): NSS values to look for.
+
+        Returns:
+            dict[int, Row]: Rows with the id and editable columns, keyed by NSS.
+        """
+        existing = {}
+        for start in range(0, len(nss_list), NSS_BATCH_SIZE):
+            rows = (
+                self._session.query(Employee.id, *[getattr(Employee, field) for field in EMPLOYEE_FIELDS])
+                .filter(Employee.nss.in_(nss_list[start:start + NSS_BATCH_SIZE]))
+                .all()
+            )
+            existing.update((row.nss, row) for row in rows)
+        return existing
+
+    def bulk_insert_rows(self, rows: list[dict]) -> None:
+        """
+        Insert many employees from plain column values with one executemany,
+        without building Employee objects.
+
+        Args:
+            rows (list[dict]): Column values of each new employee.
+        """
+        self._session.execute(insert(Employee), rows)
+
+    def bulk_upsert(self, rows: list[dict], updates: list[dict]) -> None:
+        """
+        Insert new employees and update existing ones in a single transaction.
+
+        Args:
+            rows (list[dict]): Column values of each new employee.
+            updates (list[dict]): Column values to update, each one including the employee id.
+        """
+        if rows:
+            self._session.execute(insert(Employee), rows)
+        if updates:
+            self._session.bulk_update_mappings(Employee, updates)
+
+    def fast_load(self, rows: list[tuple]) -> int:
+        """
+        Load many trusted, already validated employees without ORM objects.
+        Only MySQL has a native bulk loader. SQLite runs one executemany of
+        the driver and other databases a Core executemany, both on the
+        connection of the session: they are plain inserts that bypass no
+        constraint, trigger or journaling, and the load is part of the unit
+        of work, which commits or rolls it back.
+        MySQL runs LOAD DATA LOCAL INFILE on its own connection. It commits
+        by itself and is not rolled back with the unit of work, so it only
+        runs in a session that has not started a transaction: the caller
+        must commit earlier work first and give the load its own scope.
+
+        Args:
+            rows (list[tuple]): Column values in EMPLOYEE_FIELDS order.
+
+        Returns:
+            int: Number of loaded employees. LOAD DATA skips rows with a
+                duplicate key or a value it cannot convert, the count can be
+                lower than the number of rows.
+        """
+        if not rows:
+            return 0
+
+        dialect = self._session.get_bind().dialect.name
+        if dialect == "mysql":
+            if self._session.in_transaction():
+                raise RuntimeError(
+                    "LOAD DATA commits on its own connection, it cannot run inside a unit of work "
+                    "that already started a transaction"
+                )
+            with self._session.get_bind().connect() as connection:
+                return _fast_load_mysql(connection, rows)
+
+        connection = self._session.connection()
+        if dialect == "sqlite":
+            _fast_load_sqlite(connection, rows)
+        else:
+            connection.execute(insert(Employee), [dict(zip(EMPLOYEE_FIELDS, row)) for row in rows])
+        return len(rows)
 
     def update(self, employee: Employee) -> Employee:
         """
@@ -86,7 +320,7 @@ class EmployeeRepositoryImpl(IEmployeeRepository):
         Returns:
             Employee: The persisted Employee instance with ID assigned.
         """
-        self._session.commit()
+        self._session.flush()
         self._session.refresh(employee)
         return employee
 
@@ -104,5 +338,107 @@ class EmployeeRepositoryImpl(IEmployeeRepository):
         if not employee:
             return False
         self._session.delete(employee)
-        self._session.commit()
+        self._session.flush()
         return True
+
+    def update_many(self, filters: dict[str, Any], values: dict[str, Any]) -> int:
+        """
+        Update every employee matching the filters with one UPDATE statement.
+        Loaded Employee objects are not synchronized, they are refreshed on
+        their next access after the commit.
+
+        Args:
+            filters (dict): Column values to match, a list/tuple/set matches any of its values.
+            values (dict): New column values, SQL expressions such as
+                Employee.hourly_rate * 1.05 are allowed.
+
+        Returns:
+            int: Number of updated employees.
+        """
+        statement = (
+            update(Employee)
+            .where(*filter_clauses(filters))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        result = self._session.execute(statement)
+        return result.rowcount
+
+    def delete_many(self, filters: Optional[dict[str, Any]] = None, nss_list: Optional[list[int]] = None) -> int:
+        """
+        Delete every employee matching the filters and/or NSS list with one
+        DELETE statement.
+
+        Args:
+            filters (Optional[dict]): Column values to match, a list/tuple/set matches any of its values.
+            nss_list (Optional[list[int]]): NSS values of the employees to delete.
+
+        Returns:
+            int: Number of deleted employees.
+        """
+        clauses = filter_clauses(filters or {})
+        if nss_list is not None:
+            clauses.append(Employee.nss.in_(nss_list))
+
+        statement = delete(Employee).where(*clauses).execution_options(synchronize_session=False)
+        result = self._session.execute(statement)
+        return result.rowcount
+
+
+def _fast_load_sqlite(connection: Connection, rows: list[tuple]) -> None:
+    """
+    Insert rows with one executemany of the driver, without compiling a
+    statement or building a dictionary per row. It is the same insert as
+    the regular import, with the same journaling and triggers: durability
+    follows the PRAGMA profile of the engine and the transaction belongs to
+    the caller.
+    """
+    placeholders = ", ".join("?" for _ in EMPLOYEE_FIELDS)
+    connection.exec_driver_sql(
+        f"INSERT INTO {Employee.__tablename__} ({', '.join(EMPLOYEE_FIELDS)}) VALUES ({placeholders})",
+        rows,
+    )
+
+
+def _fast_load_mysql(connection: Connection, rows: list[tuple]) -> int:
+    """
+    Write rows to a temporary tab separated file and load it with
+    LOAD DATA LOCAL INFILE, committed on the given connection. The
+    connection must be created with local_infile enabled (DB_LOCAL_INFILE=1).
+    LOCAL loads turn duplicate keys and conversion errors into warnings and
+    skip those rows, the affected row count is the number of loaded rows.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", encoding="utf-8", newline="", delete=False) as data_file:
+        for row in rows:
+            data_file.write("\t".join(_infile_value(value) for value in row))
+            data_file.write("\n")
+
+    try:
+        with connection.begin():
+            result = connection.exec_driver_sql(
+                f"LOAD DATA LOCAL INFILE '{_infile_path(data_file.name)}' "
+                f"INTO TABLE {Employee.__tablename__} CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                f"({', '.join(EMPLOYEE_FIELDS)})"
+            )
+        return result.rowcount
+    finally:
+        os.remove(data_file.name)
+
+
+def _infile_value(value: Any) -> str:
+    """
+    Format a value for LOAD DATA, escaping the field and line separators.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _infile_path(path: str) -> str:
+    """
+    Quote a file path for a LOAD DATA statement.
+    """
+    return path.replace("\\", "/").replace("'", "\\'")
@@ -0,0 +1,214 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Headcount and payroll summary of employees by position,
+municipality and type. Triggers update it in the transaction of every
+employee write (ORM, bulk inserts, set-based updates and the fast-path
+loader), so reports read pre-aggregated rows. A rebuild repairs drift.
+
+Usage:
+    python -m employees_management.infrastructure.employee_summary [--check]
+"""
+import argparse
+
+from sqlalchemy import Connection, Engine, delete, select
+
+from employees_management.domain.models import EmployeeSummary
+from employees_management.infrastructure.db import engine as default_engine
+
+# Name of the summary table.
+SUMMARY_TABLE = EmployeeSummary.__tablename__
+
+# Weekly hours paid to BASE employees.
+BASE_WEEKLY_HOURS = 40
+
+
+def _payroll(row: str) -> str:
+    # Weekly payroll of one employee row (NEW, OLD or a table alias)
+    return (
+        f"CASE WHEN {row}.employee_type = 'BASE' THEN COALESCE({row}.hourly_rate, 0) * {BASE_WEEKLY_HOURS} "
+        f"ELSE COALESCE({row}.hourly_rate, 0) * COALESCE({row}.hours_worked, 0) END"
+    )
+
+
+def _key(row: str) -> str:
+    return (
+        f"position_id = {row}.position_id AND municipality_id = {row}.municipality_id "
+        f"AND employee_type = {row}.employee_type"
+    )
+
+
+_COLUMNS = "position_id, municipality_id, employee_type, headcount, payroll"
+
+# Statements run for the OLD row of an update or delete, rows without
+# employees are dropped so the table only holds existing groups
+_SUBTRACT_OLD = f"""
+        UPDATE {SUMMARY_TABLE} SET headcount = headcount - 1, payroll = payroll - ({_payroll("OLD")})
+        WHERE {_key("OLD")};
+        DELETE FROM {SUMMARY_TABLE} WHERE {_key("OLD")} AND headcount <= 0;
+"""
+
+_SQLITE_ADD_NEW = f"""
+        INSERT INTO {SUMMARY_TABLE} ({_COLUMNS})
+        VALUES (NEW.position_id, NEW.municipality_id, NEW.employee_type, 1, {_payroll("NEW")})
+        ON CONFLICT (position_id, municipality_id, employee_type)
+        DO UPDATE SET headcount = headcount + 1, payroll = payroll + excluded.payroll;
+"""
+
+_MYSQL_ADD_NEW = f"""
+        INSERT INTO {SUMMARY_TABLE} ({_COLUMNS})
+        VALUES (NEW.position_id, NEW.municipality_id, NEW.employee_type, 1, {_payroll("NEW")})
+        ON DUPLICATE KEY UPDATE headcount = headcount + 1, payroll = payroll + VALUES(payroll);
+"""
+
+# Columns that move an employee between groups or change its payroll
+_SUMMARY_COLUMNS = ("position_id", "municipality_id", "employee_type", "hourly_rate", "hours_worked")
+
+SQLITE_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_summary_insert AFTER INSERT ON employee BEGIN
+        {_SQLITE_ADD_NEW}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_summary_update
+    AFTER UPDATE OF {", ".join(_SUMMARY_COLUMNS)} ON employee BEGIN
+        {_SUBTRACT_OLD}
+        {_SQLITE_ADD_NEW}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_summary_delete AFTER DELETE ON employee BEGIN
+        {_SUBTRACT_OLD}
+    END
+    """,
+]
+
+_MYSQL_CHANGED = " OR ".join(f"NOT (OLD.{name} <=> NEW.{name})" for name in _SUMMARY_COLUMNS)
+
+MYSQL_DDL = [
+    f"""
+    CREATE TRIGGER employee_summary_insert AFTER INSERT ON employee FOR EACH ROW
+        {_MYSQL_ADD_NEW.strip().rstrip(";")}
+    """,
+    f"""
+    CREATE TRIGGER employee_summary_update AFTER UPDATE ON employee FOR EACH ROW
+    BEGIN
+        IF {_MYSQL_CHANGED} THEN
+            {_SUBTRACT_OLD}
+            {_MYSQL_ADD_NEW}
+        END IF;
+    END
+    """,
+    f"""
+    CREATE TRIGGER employee_summary_delete AFTER DELETE ON employee FOR EACH ROW
+    BEGIN
+        {_SUBTRACT_OLD}
+    END
+    """,
+]
+
+# Summary rows computed from the employee table.
+SUMMARY_SELECT = f"""
+    SELECT e.position_id, e.municipality_id, e.employee_type, COUNT(*), SUM({_payroll("e")})
+    FROM employee e
+    GROUP BY e.position_id, e.municipality_id, e.employee_type
+"""
+
+REBUILD = f"INSERT INTO {SUMMARY_TABLE} ({_COLUMNS}) {SUMMARY_SELECT}"
+
+
+def create_employee_summary(connection: Connection) -> None:
+    """
+    Create the summary table and its triggers, then fill it from the
+    existing employees.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction.
+
+    Raises:
+        RuntimeError: If the database has no trigger support used here.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_DDL
+    elif dialect == "mysql":
+        statements = MYSQL_DDL
+    else:
+        raise RuntimeError(f"The employee summary is not supported on {dialect}")
+
+    EmployeeSummary.__table__.create(connection, checkfirst=True)
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+    rebuild_employee_summary(connection)
+
+
+def rebuild_employee_summary(connection: Connection) -> int:
+    """
+    Recompute the summary from the employee table.
+
+    Args:
+        connection (Connection): Connection inside a transaction, employee
+            writes of other transactions wait until it ends on MySQL.
+
+    Returns:
+        int: Number of summary rows.
+    """
+    connection.execute(delete(EmployeeSummary))
+    return connection.exec_driver_sql(REBUILD).rowcount
+
+
+def find_summary_drift(connection: Connection) -> list[tuple]:
+    """
+    Groups whose stored headcount or payroll differ from the employee table.
+
+    Args:
+        connection (Connection): Open connection.
+
+    Returns:
+        list[tuple]: (position_id, municipality_id, employee_type, stored, actual)
+            where stored and actual are (headcount, payroll) or None.
+    """
+    stored = {
+        (row.position_id, row.municipality_id, row.employee_type): (row.headcount, row.payroll)
+        for row in connection.execute(select(EmployeeSummary))
+    }
+    actual = {
+        (row[0], row[1], row[2]): (row[3], row[4])
+        for row in connection.exec_driver_sql(SUMMARY_SELECT)
+    }
+
+    def differs(key) -> bool:
+        if key not in stored or key not in actual:
+            return True
+        # Payroll is updated by increments, rounding errors below a cent are not drift
+        return stored[key][0] != actual[key][0] or abs(stored[key][1] - actual[key][1]) >= 0.01
+
+    return [
+        (*key, stored.get(key), actual.get(key))
+        for key in sorted(stored.keys() | actual.keys(), key=str)
+        if differs(key)
+    ]
+
+
+def main(db_engine: Engine = default_engine, check_only: bool = False) -> None:
+    """
+    Report the drift of the summary and rebuild it.
+    :param db_engine:
+    :param check_only: only report the drift
+    :return:
+    """
+    with db_engine.begin() as connection:
+        drift = find_summary_drift(connection)
+        print(f"{len(drift)} summary groups out of date")
+        for position_id, municipality_id, employee_type, stored, actual in drift[:20]:
+            print(f"  position={position_id} municipality={municipality_id} type={employee_type}: "
+                  f"stored={stored} actual={actual}")
+        if not check_only:
+            print(f"Rebuilt {rebuild_employee_summary(connection)} summary groups")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and rebuild the employee summary table.")
+    parser.add_argument("--check", action="store_true", help="only report out of date groups")
+    main(check_only=parser.parse_args().check)
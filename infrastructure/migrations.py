@@ -0,0 +1,140 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Schema migrations for databases created by older versions.
+
+Usage:
+    python -m employees_management.infrastructure.migrations
+"""
+import logging
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import Column, Connection, Engine, MetaData, String, Table, delete, func, inspect, select
+
+from employees_management.domain.models import Employee
+from employees_management.infrastructure.db import engine as default_engine
+from employees_management.infrastructure.employee_summary import create_employee_summary
+from employees_management.infrastructure.search_index import create_search_index, rebuild_search_index
+
+logger = logging.getLogger(__name__)
+
+# Table that records the migrations already applied to a database.
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("name", String(100), primary_key=True),
+)
+
+# Employees moved aside because their NSS was already used by another row.
+employee_nss_duplicates = Table(
+    "employee_nss_duplicates",
+    MetaData(),
+    *[Column(column.name, column.type) for column in Employee.__table__.columns],
+)
+
+
+def move_duplicated_employees(connection: Connection) -> int:
+    """
+    Keep the employee with the lowest id of each NSS and move the other
+    rows to the employee_nss_duplicates table, so they can be reviewed.
+    Older versions stored a new copy of every row on each re-import.
+    :param connection: connection inside the migration transaction
+    :return: number of moved employees
+    """
+    employee = Employee.__table__
+    kept = (
+        select(func.min(employee.c.id).label("id"))
+        .where(employee.c.nss.is_not(None))
+        .group_by(employee.c.nss)
+        .subquery()
+    )
+    # The derived table lets MySQL read the table it deletes from
+    duplicated = employee.c.nss.is_not(None) & employee.c.id.not_in(select(kept.c.id))
+
+    moved = connection.execute(select(func.count()).select_from(employee).where(duplicated)).scalar()
+    if not moved:
+        return 0
+
+    employee_nss_duplicates.create(connection, checkfirst=True)
+    connection.execute(
+        employee_nss_duplicates.insert().from_select(
+            [column.name for column in employee.columns],
+            select(employee).where(duplicated),
+        )
+    )
+    connection.execute(delete(employee).where(duplicated))
+    logger.warning(
+        "Moved %d employees with a repeated NSS to %s, the lowest id of each NSS was kept",
+        moved, employee_nss_duplicates.name,
+    )
+    return moved
+
+
+def add_employee_indexes(connection: Connection) -> None:
+    """
+    Create the unique NSS index and the composite indexes used by the
+    listing, filters and reports. Duplicated NSS values would make the
+    unique index fail, they are moved aside first.
+    """
+    move_duplicated_employees(connection)
+
+    for index in Employee.__table__.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def widen_employee_nss(connection: Connection) -> None:
+    """
+    Store the NSS as a BIGINT, 11-digit values overflow the INT column
+    created by older versions on MySQL. SQLite integers are 64-bit already.
+    """
+    if connection.dialect.name != "mysql":
+        return
+
+    for table_name in (Employee.__tablename__, employee_nss_duplicates.name):
+        if inspect(connection).has_table(table_name):
+            connection.exec_driver_sql(f"ALTER TABLE {table_name} MODIFY nss BIGINT")
+
+
+# Ordered migration steps, new steps are appended at the end.
+MIGRATIONS: list[tuple[str, Callable[[Connection], None]]] = [
+    ("0001_employee_indexes", add_employee_indexes),
+    ("0002_employee_search", create_search_index),
+    ("0003_employee_summary", create_employee_summary),
+    ("0004_employee_search_prefixes", rebuild_search_index),
+    ("0005_employee_nss_bigint", widen_employee_nss),
+]
+
+
+def apply_migrations(engine: Engine = default_engine, durations: Optional[dict[str, float]] = None) -> list[str]:
+    """
+    Apply the migrations that were not applied yet, each one in its own
+    transaction.
+    :param engine:
+    :param durations: when given, receives the seconds taken by each
+        applied migration, keyed by its name
+    :return: names of the applied migrations
+    """
+    schema_migrations.create(engine, checkfirst=True)
+    applied = []
+
+    for name, migration in MIGRATIONS:
+        started = time.perf_counter()
+        with engine.begin() as connection:
+            done = connection.execute(
+                select(schema_migrations.c.name).where(schema_migrations.c.name == name)
+            ).first()
+            if done:
+                continue
+            migration(connection)
+            connection.execute(schema_migrations.insert().values(name=name))
+        if durations is not None:
+            durations[name] = time.perf_counter() - started
+        applied.append(name)
+
+    return applied
+
+
+if __name__ == "__main__":
+    for migration_name in apply_migrations():
+        print(f"Applied {migration_name}")
@@ -38,7 +38,7 @@ class MunicipalityRepositoryImpl(IMunicipalityRepository):
         """
         municipality = Municipality(name=name)
         self._session.add(municipality)
-        self._session.commit()
+        self._session.flush()
         self._session.refresh(municipality)
         return municipality
 
@@ -52,7 +52,7 @@ class MunicipalityRepositoryImpl(IMunicipalityRepository):
         Returns:
             Municipality: The persisted Employee instance with ID assigned.
         """
-        self._session.commit()
+        self._session.flush()
         self._session.refresh(municipality)
         return municipality
 
@@ -64,6 +64,24 @@ class MunicipalityRepositoryImpl(IMunicipalityRepository):
         """
         return self._session.query(Municipality).filter(Municipality.name == name).first()
 
+    def name_to_id(self) -> dict[str, int]:
+        """
+        Map every municipality name to its id using a single query
+        :return:
+        """
+        return dict(self._session.query(Municipality.name, Municipality.id).all())
+
+    def bulk_add(self, names: set[str]) -> dict[str, int]:
+        """
+        Add many municipalities with one flush
+        :param names:
+        :return: id of each new municipality by name
+        """
+        created = [Municipality(name=name) for name in names]
+        self._session.add_all(created)
+        self._session.flush()
+        return {municipality.name: municipality.id for municipality in created}
+
     def delete(self, municipality: Municipality) -> bool:
         """
         Delete municipality
@@ -71,5 +89,5 @@ class MunicipalityRepositoryImpl(IMunicipalityRepository):
         :return:
         """
         self._session.delete(municipality)
-        self._session.commit()
+        self._session.flush()
         return True
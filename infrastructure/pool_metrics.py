@@ -0,0 +1,76 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Connection pool that records checkout and wait-time metrics.
+"""
+
+import threading
+import time
+
+from sqlalchemy.pool import QueuePool
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that counts checkouts, measures how long callers wait for a
+    connection and tracks the peak number of connections in use.
+    Used to size the pool for concurrent imports and reports.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except Exception:
+            with self._metrics_lock:
+                self._failed_checkouts += 1
+            raise
+
+        waited = time.perf_counter() - started
+        with self._metrics_lock:
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            self._peak_in_use = max(self._peak_in_use, self.checkedout())
+        return connection
+
+    def reset_metrics(self) -> None:
+        """
+        Start a new measurement window.
+
+        Returns:
+            None
+        """
+        with self._metrics_lock:
+            self._checkouts = 0
+            self._failed_checkouts = 0
+            self._total_wait = 0.0
+            self._max_wait = 0.0
+            self._peak_in_use = self.checkedout()
+
+    def metrics(self) -> dict:
+        """
+        Snapshot of the pool usage since the last reset.
+
+        Returns:
+            dict: Checkouts, failed checkouts, average and maximum wait in
+            milliseconds, connections in use (current and peak), idle
+            connections and overflow.
+        """
+        with self._metrics_lock:
+            return {
+                "checkouts": self._checkouts,
+                "failed_checkouts": self._failed_checkouts,
+                "avg_wait_ms": round(self._total_wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "in_use": self.checkedout(),
+                "peak_in_use": self._peak_in_use,
+                "idle": self.checkedin(),
+                "overflow": self.overflow(),
+                "size": self.size(),
+            }
@@ -39,7 +39,7 @@ class PositionRepositoryImpl(IPositionRepository):
         """
         position = Position(name=name, base_salary=base_salary)
         self._session.add(position)
-        self._session.commit()
+        self._session.flush()
         self._session.refresh(position)
         return position
 
@@ -53,7 +53,7 @@ class PositionRepositoryImpl(IPositionRepository):
         Returns:
             Position: The persisted Employee instance with ID assigned.
         """
-        self._session.commit()
+        self._session.flush()
         self._session.refresh(position)
         return position
 
@@ -64,3 +64,31 @@ class PositionRepositoryImpl(IPositionRepository):
         :return:
         """
         return self._session.query(Position).filter(Position.name == name).first()
+
+    def name_to_id(self) -> dict[str, int]:
+        """
+        Map every position name to its id using a single query
+        :return:
+        """
+        return dict(self._session.query(Position.name, Position.id).all())
+
+    def bulk_add(self, positions: dict[str, float]) -> dict[str, int]:
+        """
+        Add many positions with one flush
+        :param positions: base salary by position name
+        :return: id of each new position by name
+        """
+        created = [Position(name=name, base_salary=salary) for name, salary in positions.items()]
+        self._session.add_all(created)
+        self._session.flush()
+        return {position.name: position.id for position in created}
+
+    def delete(self, position: Position) -> bool:
+        """
+        Delete position
+        :param position:
+        :return:
+        """
+        self._session.delete(position)
+        self._session.flush()
+        return True
@@ -0,0 +1,290 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Engine instrumentation that times SQL statements, groups them by
+the service method that issued them and logs slow queries.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import Engine, event
+
+slow_query_logger = logging.getLogger("employees_management.sql.slow")
+
+# Caller of the statements issued outside of the application services.
+UNKNOWN_CALLER = "<other>"
+
+# Attribute of the execution context holding the start time of the statement.
+_STARTED = "_query_metrics_started"
+
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s)\s*,)+\s*(?:\?|%s|%\(\w+\)s)\s*\)")
+_REPEATED_LIST = re.compile(r"\(\?, \.\.\.\)(?:\s*,\s*\(\?, \.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """
+    Group key of a statement: whitespace collapsed and placeholder lists of
+    any length (IN lists, multi-row VALUES) folded, so the same query with a
+    different number of parameters is counted once.
+
+    Args:
+        statement (str): SQL sent to the driver.
+
+    Returns:
+        str: Normalized statement.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER_LIST.sub("(?, ...)", statement)
+    return _REPEATED_LIST.sub("(?, ...), ...", statement)
+
+
+def _is_service_module(module_name: str) -> bool:
+    # Modules are imported as employees_management.application.* or application.*
+    return "application" in module_name.split(".")[:-1]
+
+
+def find_caller() -> str:
+    """
+    Innermost application service method of the current call stack.
+
+    Returns:
+        str: Qualified name such as "EmployeeService.list_employee_rows",
+            or UNKNOWN_CALLER when no service is on the stack.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        if _is_service_module(frame.f_globals.get("__name__", "")):
+            code = frame.f_code
+            return getattr(code, "co_qualname", code.co_name)
+        frame = frame.f_back
+    return UNKNOWN_CALLER
+
+
+class QueryRecorder:
+    """
+    Records the count, total and maximum time and row count of every
+    statement executed by the engines it is installed on, grouped by
+    (service method, normalized statement). Statements slower than the
+    threshold are written to the slow-query logger.
+    Queries are measured until their rows are fetched (SQLite does most of
+    a scan while fetching), other statements use the driver row count.
+    """
+
+    def __init__(self, slow_query_ms: float = 200.0):
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self.reset_metrics()
+
+    def install(self, db_engine: Engine) -> None:
+        """
+        Start recording the statements of an engine.
+
+        Args:
+            db_engine (Engine): Engine to instrument.
+        """
+        event.listen(db_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(db_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        setattr(context, _STARTED, time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - getattr(context, _STARTED)
+        caller = find_caller()
+        if cursor.description is not None and not executemany and context.cursor is cursor:
+            # The result reads through the wrapper, which records the statement once consumed
+            context.cursor = _MeteredCursor(cursor, self, caller, statement, elapsed)
+            return
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        self._record(caller, statement, elapsed * 1000, rows, executemany)
+
+    def _record(self, caller: str, statement: str, elapsed_ms: float, rows: Optional[int], executemany: bool) -> None:
+        key = (caller, normalize_statement(statement))
+        slow = elapsed_ms >= self.slow_query_ms
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "slow": 0}
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            if rows is not None:
+                stats["rows"] += rows
+            if slow:
+                stats["slow"] += 1
+
+        if slow:
+            # Parameters are left out, they hold employee data
+            slow_query_logger.warning(
+                "%.1f ms rows=%s caller=%s executemany=%s %s",
+                elapsed_ms, "?" if rows is None else rows, caller, executemany, key[1],
+            )
+
+    def reset_metrics(self) -> None:
+        """
+        Start a new measurement window.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._stats: dict[tuple[str, str], dict] = {}
+
+    def metrics(self) -> list[dict]:
+        """
+        Snapshot of the statements recorded since the last reset.
+
+        Returns:
+            list[dict]: One entry per (caller, statement) with count,
+                total_ms, avg_ms, max_ms, rows and slow (number of
+                executions over the threshold).
+        """
+        with self._lock:
+            entries = [(key, dict(stats)) for key, stats in self._stats.items()]
+        return [
+            {
+                "caller": caller,
+                "statement": statement,
+                "count": stats["count"],
+                "total_ms": round(stats["total_ms"], 3),
+                "avg_ms": round(stats["total_ms"] / stats["count"], 3),
+                "max_ms": round(stats["max_ms"], 3),
+                "rows": stats["rows"],
+                "slow": stats["slow"],
+            }
+            for (caller, statement), stats in entries
+        ]
+
+    def by_caller(self) -> list[dict]:
+        """
+        Statements and time of each service method, to spot methods issuing
+        many statements (N+1 patterns).
+
+        Returns:
+            list[dict]: caller, statements (executions), distinct statements
+                and total_ms, the most expensive callers first.
+        """
+        callers: dict[str, dict] = {}
+        for entry in self.metrics():
+            totals = callers.setdefault(
+                entry["caller"],
+                {"caller": entry["caller"], "statements": 0, "distinct": 0, "total_ms": 0.0},
+            )
+            totals["statements"] += entry["count"]
+            totals["distinct"] += 1
+            totals["total_ms"] = round(totals["total_ms"] + entry["total_ms"], 3)
+        return sorted(callers.values(), key=lambda totals: totals["total_ms"], reverse=True)
+
+    def top_statements(self, limit: Optional[int] = 10, order_by: str = "total_ms") -> list[dict]:
+        """
+        Most expensive statements since the last reset.
+
+        Args:
+            limit (Optional[int]): Number of statements, None for all.
+            order_by (str): total_ms, avg_ms, max_ms, count or rows.
+
+        Returns:
+            list[dict]: Entries of metrics() in descending order.
+        """
+        if order_by not in ("total_ms", "avg_ms", "max_ms", "count", "rows"):
+            raise ValueError("order_by must be total_ms, avg_ms, max_ms, count or rows")
+        entries = sorted(self.metrics(), key=lambda entry: entry[order_by], reverse=True)
+        return entries if limit is None else entries[:limit]
+
+    def summary(self, limit: int = 10, order_by: str = "total_ms", width: int = 100) -> str:
+        """
+        Plain-text report of the top statements and of the time per caller.
+
+        Args:
+            limit (int): Number of statements listed.
+            order_by (str): Sort key, see top_statements.
+            width (int): Maximum length of the statement text.
+
+        Returns:
+            str: The report.
+        """
+        lines = [f"Top {limit} statements by {order_by}:"]
+        lines.append(f"{'count':>7} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'rows':>8}  caller / statement")
+        for entry in self.top_statements(limit, order_by):
+            statement = entry["statement"]
+            if len(statement) > width:
+                statement = statement[:width - 3] + "..."
+            lines.append(
+                f"{entry['count']:>7} {entry['total_ms']:>10.1f} {entry['avg_ms']:>8.2f} "
+                f"{entry['max_ms']:>8.2f} {entry['rows']:>8}  {entry['caller']}"
+            )
+            lines.append(f"{'':>45}{statement}")
+
+        lines.append("")
+        lines.append("Statements per caller:")
+        for totals in self.by_caller():
+            lines.append(
+                f"{totals['statements']:>7} {totals['total_ms']:>10.1f} ms  "
+                f"{totals['distinct']:>3} distinct  {totals['caller']}"
+            )
+        return "\n".join(lines)
+
+
+class _MeteredCursor:
+    """
+    DBAPI cursor wrapper that adds the time spent fetching rows to the
+    execution time of a query and counts the fetched rows. The query is
+    recorded when the rows are exhausted or the cursor is closed.
+    """
+
+    def __init__(self, cursor, recorder: QueryRecorder, caller: str, statement: str, elapsed: float):
+        self._cursor = cursor
+        self._recorder = recorder
+        self._caller = caller
+        self._statement = statement
+        self._elapsed = elapsed
+        self._rows = 0
+        self._recorded = False
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _finish(self) -> None:
+        if not self._recorded:
+            self._recorded = True
+            self._recorder._record(self._caller, self._statement, self._elapsed * 1000, self._rows, False)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._elapsed += time.perf_counter() - started
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args)
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._elapsed += time.perf_counter() - started
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def close(self) -> None:
+        self._cursor.close()
+        self._finish()
@@ -0,0 +1,171 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Repository for employee reports, read from the employee summary table
+"""
+
+import logging
+
+from sqlalchemy import FromClause, Integer, Select, case, cast, func, select
+from sqlalchemy.orm import Session
+from employees_management.domain.models import Employee, EmployeeSummary, Municipality, Position
+from employees_management.domain.report_repository import IReportRepository
+from employees_management.infrastructure.employee_summary import BASE_WEEKLY_HOURS
+
+logger = logging.getLogger(__name__)
+
+
+class ReportRepositoryImpl(IReportRepository):
+    """
+    Reports add up the rows of the employee summary, which hold one
+    pre-aggregated headcount and payroll per position, municipality and
+    type, so their cost does not depend on the number of employees.
+    A database whose summary was never filled (created without the
+    migrations) is aggregated from the employee table instead.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    def count_by_position(self) -> dict[str, int]:
+        """
+        Number of employees by position name
+        :return:
+        """
+        return dict(self._session.execute(count_by_position_select(self._source())).all())
+
+    def count_by_municipality(self) -> dict[str, int]:
+        """
+        Number of employees by municipality name
+        :return:
+        """
+        return dict(self._session.execute(count_by_municipality_select(self._source())).all())
+
+    def count_by_employee_type(self) -> dict[str, int]:
+        """
+        Number of employees by employee type
+        :return:
+        """
+        return dict(self._session.execute(count_by_employee_type_select(self._source())).all())
+
+    def payroll_by_position(self) -> dict[str, float]:
+        """
+        Weekly payroll by position name
+        :return:
+        """
+        return dict(self._session.execute(payroll_by_position_select(self._source())).all())
+
+    def payroll_by_municipality(self) -> dict[str, float]:
+        """
+        Weekly payroll by municipality name
+        :return:
+        """
+        return dict(self._session.execute(payroll_by_municipality_select(self._source())).all())
+
+    def _source(self) -> FromClause:
+        """
+        Summary rows the reports add up.
+        :return:
+        """
+        return report_source(bool(self._session.execute(summary_missing_select()).scalar()))
+
+
+def summary_missing_select() -> Select:
+    """
+    Whether the summary table is empty while employees exist, which means
+    it was never filled rather than that there is nothing to report
+    """
+    return select(~select(EmployeeSummary.position_id).exists() & select(Employee.id).exists())
+
+
+def report_source(summary_missing: bool) -> FromClause:
+    """
+    The employee summary table, or the same rows aggregated from the
+    employee table when the summary was never filled
+    """
+    if not summary_missing:
+        return EmployeeSummary.__table__
+
+    logger.warning(
+        "The %s table is empty, reports are aggregated from the employee table. "
+        "Apply the migrations or rebuild it with python -m employees_management.infrastructure.employee_summary",
+        EmployeeSummary.__tablename__,
+    )
+    payroll = case(
+        (Employee.employee_type == "BASE", func.coalesce(Employee.hourly_rate, 0) * BASE_WEEKLY_HOURS),
+        else_=func.coalesce(Employee.hourly_rate, 0) * func.coalesce(Employee.hours_worked, 0),
+    )
+    return (
+        select(
+            Employee.position_id,
+            Employee.municipality_id,
+            Employee.employee_type,
+            func.count(Employee.id).label("headcount"),
+            func.sum(payroll).label("payroll"),
+        )
+        .group_by(Employee.position_id, Employee.municipality_id, Employee.employee_type)
+        .subquery(EmployeeSummary.__tablename__)
+    )
+
+
+def _headcount(source: FromClause):
+    # SUM is a DECIMAL on MySQL and an integer on SQLite
+    return cast(func.sum(source.c.headcount), Integer)
+
+
+def count_by_position_select(source: FromClause = EmployeeSummary.__table__) -> Select:
+    """
+    Position names with their number of employees
+    """
+    return (
+        select(Position.name, _headcount(source))
+        .join(source, source.c.position_id == Position.id)
+        .group_by(Position.id, Position.name)
+        .order_by(Position.name)
+    )
+
+
+def count_by_municipality_select(source: FromClause = EmployeeSummary.__table__) -> Select:
+    """
+    Municipality names with their number of employees
+    """
+    return (
+        select(Municipality.name, _headcount(source))
+        .join(source, source.c.municipality_id == Municipality.id)
+        .group_by(Municipality.id, Municipality.name)
+        .order_by(Municipality.name)
+    )
+
+
+def count_by_employee_type_select(source: FromClause = EmployeeSummary.__table__) -> Select:
+    """
+    Employee types with their number of employees
+    """
+    return (
+        select(source.c.employee_type, _headcount(source))
+        .group_by(source.c.employee_type)
+    )
+
+
+def payroll_by_position_select(source: FromClause = EmployeeSummary.__table__) -> Select:
+    """
+    Position names with the weekly payroll of their employees
+    """
+    return (
+        select(Position.name, func.sum(source.c.payroll))
+        .join(source, source.c.position_id == Position.id)
+        .group_by(Position.id, Position.name)
+        .order_by(Position.name)
+    )
+
+
+def payroll_by_municipality_select(source: FromClause = EmployeeSummary.__table__) -> Select:
+    """
+    Municipality names with the weekly payroll of their employees
+    """
+    return (
+        select(Municipality.name, func.sum(source.c.payroll))
+        .join(source, source.c.municipality_id == Municipality.id)
+        .group_by(Municipality.id, Municipality.name)
+        .order_by(Municipality.name)
+    )
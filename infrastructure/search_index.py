@@ -0,0 +1,303 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Full-text index of employees over NSS, names, position and
+municipality. SQLite uses an FTS5 table and MySQL a FULLTEXT index, both
+kept in sync by triggers so every write path (ORM, bulk inserts, set-based
+updates and the fast-path loader) updates the index in the same transaction.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import Connection, Select, column, select, table, text
+from sqlalchemy.dialects.mysql import match
+
+# Name of the full-text table.
+SEARCH_TABLE = "employee_search"
+
+# Columns matched by the words typed by the user.
+TEXT_COLUMNS = ("nss", "first_name", "last_name_f", "last_name_m", "position", "municipality")
+
+# Shortest word of an InnoDB FULLTEXT index (innodb_ft_min_token_size),
+# shorter words are matched as a prefix of the paternal last name instead.
+MYSQL_MIN_TOKEN_SIZE = 3
+
+# Text of one employee in the index, the NEW row is available in triggers.
+# The filters column holds the position, municipality and type as tokens
+# (p<id> m<id> t<type>), so filtered searches are answered by the index too.
+_SQLITE_DOCUMENT = """
+    NEW.id, NEW.nss, NEW.first_name, NEW.last_name_f, NEW.last_name_m,
+    (SELECT name FROM position WHERE id = NEW.position_id),
+    (SELECT name FROM municipality WHERE id = NEW.municipality_id),
+    'p' || NEW.position_id || ' m' || NEW.municipality_id || ' t' || NEW.employee_type
+"""
+
+# Prefix lengths indexed by the FTS5 table.
+SQLITE_PREFIXES = "2 3"
+
+_SQLITE_COLUMNS = "rowid, nss, first_name, last_name_f, last_name_m, position, municipality, filters"
+
+SQLITE_DDL = [
+    # Prefix indexes of 2 and 3 characters answer the first keystrokes of a
+    # word without merging the doclists of every matching word. Each prefix
+    # length adds index entries on every write, longer words are selective
+    # enough to be merged from the term list
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        nss, first_name, last_name_f, last_name_m, position, municipality, filters,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '{SQLITE_PREFIXES}'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_search_insert AFTER INSERT ON employee BEGIN
+        INSERT INTO {SEARCH_TABLE} ({_SQLITE_COLUMNS})
+        SELECT {_SQLITE_DOCUMENT};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_search_update AFTER UPDATE ON employee BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.id;
+        INSERT INTO {SEARCH_TABLE} ({_SQLITE_COLUMNS})
+        SELECT {_SQLITE_DOCUMENT};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_search_delete AFTER DELETE ON employee BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_search_position AFTER UPDATE OF name ON position BEGIN
+        UPDATE {SEARCH_TABLE} SET position = NEW.name
+        WHERE rowid IN (SELECT id FROM employee WHERE position_id = NEW.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employee_search_municipality AFTER UPDATE OF name ON municipality BEGIN
+        UPDATE {SEARCH_TABLE} SET municipality = NEW.name
+        WHERE rowid IN (SELECT id FROM employee WHERE municipality_id = NEW.id);
+    END
+    """,
+]
+
+SQLITE_BACKFILL = f"""
+    INSERT INTO {SEARCH_TABLE} ({_SQLITE_COLUMNS})
+    SELECT e.id, e.nss, e.first_name, e.last_name_f, e.last_name_m, p.name, m.name,
+        'p' || e.position_id || ' m' || e.municipality_id || ' t' || e.employee_type
+    FROM employee e
+    JOIN position p ON p.id = e.position_id
+    JOIN municipality m ON m.id = e.municipality_id
+"""
+
+_MYSQL_DOCUMENT = """
+    CONCAT_WS(' ', NEW.nss, NEW.first_name, NEW.last_name_f, NEW.last_name_m,
+        (SELECT name FROM position WHERE id = NEW.position_id),
+        (SELECT name FROM municipality WHERE id = NEW.municipality_id))
+"""
+
+MYSQL_DDL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        employee_id INT NOT NULL PRIMARY KEY,
+        document TEXT NOT NULL,
+        FULLTEXT INDEX ft_employee_search_document (document)
+    ) ENGINE = InnoDB
+    """,
+    f"""
+    CREATE TRIGGER employee_search_insert AFTER INSERT ON employee FOR EACH ROW
+        INSERT INTO {SEARCH_TABLE} (employee_id, document) VALUES (NEW.id, {_MYSQL_DOCUMENT})
+    """,
+    f"""
+    CREATE TRIGGER employee_search_update AFTER UPDATE ON employee FOR EACH ROW
+        REPLACE INTO {SEARCH_TABLE} (employee_id, document) VALUES (NEW.id, {_MYSQL_DOCUMENT})
+    """,
+    f"""
+    CREATE TRIGGER employee_search_delete AFTER DELETE ON employee FOR EACH ROW
+        DELETE FROM {SEARCH_TABLE} WHERE employee_id = OLD.id
+    """,
+    f"""
+    CREATE TRIGGER employee_search_position AFTER UPDATE ON position FOR EACH ROW
+        UPDATE {SEARCH_TABLE} s JOIN employee e ON e.id = s.employee_id
+        JOIN municipality m ON m.id = e.municipality_id
+        SET s.document = CONCAT_WS(' ', e.nss, e.first_name, e.last_name_f, e.last_name_m, NEW.name, m.name)
+        WHERE e.position_id = NEW.id AND NOT (OLD.name <=> NEW.name)
+    """,
+    f"""
+    CREATE TRIGGER employee_search_municipality AFTER UPDATE ON municipality FOR EACH ROW
+        UPDATE {SEARCH_TABLE} s JOIN employee e ON e.id = s.employee_id
+        JOIN position p ON p.id = e.position_id
+        SET s.document = CONCAT_WS(' ', e.nss, e.first_name, e.last_name_f, e.last_name_m, p.name, NEW.name)
+        WHERE e.municipality_id = NEW.id AND NOT (OLD.name <=> NEW.name)
+    """,
+]
+
+MYSQL_BACKFILL = f"""
+    INSERT INTO {SEARCH_TABLE} (employee_id, document)
+    SELECT e.id, CONCAT_WS(' ', e.nss, e.first_name, e.last_name_f, e.last_name_m, p.name, m.name)
+    FROM employee e
+    JOIN position p ON p.id = e.position_id
+    JOIN municipality m ON m.id = e.municipality_id
+"""
+
+
+def create_search_index(connection: Connection) -> None:
+    """
+    Create the full-text table and its triggers, then index the existing
+    employees.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction.
+
+    Raises:
+        RuntimeError: If the database has no full-text support.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements, backfill = SQLITE_DDL, SQLITE_BACKFILL
+    elif dialect == "mysql":
+        statements, backfill = MYSQL_DDL, MYSQL_BACKFILL
+    else:
+        raise RuntimeError(f"Full-text search is not supported on {dialect}")
+
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(f"DELETE FROM {SEARCH_TABLE}")
+    connection.exec_driver_sql(backfill)
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """
+    Recreate the SQLite full-text table, so a table created with other
+    prefix indexes gets the ones of SQLITE_DDL. MySQL has no prefix
+    indexes and is left unchanged.
+
+    Args:
+        connection (Connection): Connection inside the migration transaction.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+
+    current = connection.exec_driver_sql(
+        f"SELECT sql FROM sqlite_master WHERE type = 'table' AND name = '{SEARCH_TABLE}'"
+    ).scalar()
+    if current is not None and f"prefix = '{SQLITE_PREFIXES}'" in " ".join(current.split()):
+        return
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+    create_search_index(connection)
+
+
+def search_terms(query: str) -> list[str]:
+    """
+    Split a search box text into lowercase words, dropping the characters
+    that have a meaning in the full-text query syntax.
+
+    Args:
+        query (str): Text typed by the user.
+
+    Returns:
+        list[str]: Words of the query.
+    """
+    return re.findall(r"\w+", query.lower())
+
+
+def matching_ids(
+        dialect: str,
+        terms: list[str],
+        position_id: Optional[int] = None,
+        municipality_id: Optional[int] = None,
+        employee_type: Optional[str] = None,
+        limit: Optional[int] = None,
+) -> Select:
+    """
+    Query of the ids of the employees matching every term as a prefix and
+    the filters. With a limit only the best ranked matches are returned,
+    by FTS5 rank on SQLite and by relevance on MySQL, so the matches are
+    never sorted by name before the limit applies.
+    The FULLTEXT index of MySQL skips words shorter than
+    MYSQL_MIN_TOKEN_SIZE, those terms match the start of the paternal last
+    name through its index instead.
+
+    Args:
+        dialect (str): Name of the database dialect.
+        terms (list[str]): Words returned by search_terms.
+        position_id (Optional[int]): Only employees of this position.
+        municipality_id (Optional[int]): Only employees of this municipality.
+        employee_type (Optional[str]): Only employees of this type.
+        limit (Optional[int]): Maximum number of ids, None for all.
+
+    Returns:
+        Select: Subquery of matching employee ids.
+    """
+    if dialect == "mysql":
+        return _mysql_matching_ids(terms, position_id, municipality_id, employee_type, limit)
+
+    search_table = table(SEARCH_TABLE)
+    columns = " ".join(TEXT_COLUMNS)
+    expression = " ".join(f'{{{columns}}} : "{term}"*' for term in terms)
+
+    tags = []
+    if position_id is not None:
+        tags.append(f"p{int(position_id)}")
+    if municipality_id is not None:
+        tags.append(f"m{int(municipality_id)}")
+    if employee_type is not None:
+        tags.extend(f"t{word}" for word in search_terms(employee_type))
+    expression += "".join(f' filters : "{tag}"' for tag in tags)
+
+    statement = (
+        select(column("rowid"))
+        .select_from(search_table)
+        .where(text(f"{SEARCH_TABLE} MATCH :search").bindparams(search=expression))
+    )
+    if limit is not None:
+        statement = statement.order_by(text("rank")).limit(limit)
+    return statement
+
+
+def _mysql_matching_ids(
+        terms: list[str],
+        position_id: Optional[int],
+        municipality_id: Optional[int],
+        employee_type: Optional[str],
+        limit: Optional[int],
+) -> Select:
+    """
+    MySQL version of matching_ids. The filters are applied on the employee
+    table inside the query, so the limit counts only filtered matches.
+    """
+    employee = table(
+        "employee",
+        column("id"),
+        column("last_name_f"),
+        column("position_id"),
+        column("municipality_id"),
+        column("employee_type"),
+    )
+    long_terms = [term for term in terms if len(term) >= MYSQL_MIN_TOKEN_SIZE]
+    short_terms = [term for term in terms if len(term) < MYSQL_MIN_TOKEN_SIZE]
+
+    conditions = [employee.c.last_name_f.startswith(term, autoescape=True) for term in short_terms]
+    if position_id is not None:
+        conditions.append(employee.c.position_id == position_id)
+    if municipality_id is not None:
+        conditions.append(employee.c.municipality_id == municipality_id)
+    if employee_type is not None:
+        conditions.append(employee.c.employee_type == employee_type)
+
+    if not long_terms:
+        statement = select(employee.c.id).where(*conditions)
+        order = employee.c.last_name_f
+    else:
+        search_table = table(SEARCH_TABLE, column("employee_id"), column("document"))
+        relevance = match(
+            search_table.c.document,
+            against=" ".join(f"+{term}*" for term in long_terms),
+        ).in_boolean_mode()
+        statement = select(search_table.c.employee_id).where(relevance)
+        if conditions:
+            statement = statement.join(employee, employee.c.id == search_table.c.employee_id).where(*conditions)
+        order = relevance.desc()
+
+    if limit is not None:
+        statement = statement.order_by(order).limit(limit)
+    return statement
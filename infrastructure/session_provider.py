@@ -0,0 +1,93 @@
+"""
+Author: Raul Granados
+Company: Swipall
+Description: Unit-of-work session scoping used by the application services.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+
+class SessionProvider:
+    """
+    Opens a new session for every unit of work and closes it at the end,
+    so no identity map outlives the operation that loaded it.
+    Sessions are not shared, so providers can be used from any thread.
+    Loaded objects stay readable after the scope ends when the session
+    factory uses expire_on_commit=False.
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        self._session_factory = session_factory
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        Session of one unit of work. It is committed when the block ends,
+        rolled back when the block raises, and closed in both cases.
+
+        Yields:
+            Session: The session of the unit of work.
+        """
+        session = self._session_factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+class ThreadScopedSessionProvider(SessionProvider):
+    """
+    Gives each thread its own session. Nested scopes of the same thread
+    share the session of the outermost one, which commits and closes it,
+    so a worker can group several service calls in one unit of work while
+    other threads query in parallel with their own sessions.
+    A nested scope that raises does not roll back the shared session, it
+    marks the unit of work rollback-only: the outermost scope then rolls
+    it back and raises instead of committing, so the work done before the
+    failure is never committed half way.
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        super().__init__(session_factory)
+        self._registry = scoped_session(session_factory)
+        self._local = threading.local()
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        Session of the current thread, reused by nested scopes.
+
+        Yields:
+            Session: The session of the current thread.
+
+        Raises:
+            RuntimeError: When the outermost scope ends after a nested scope raised.
+        """
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if depth == 0:
+            self._local.rollback_only = False
+        session = self._registry()
+        try:
+            yield session
+            if depth == 0:
+                if self._local.rollback_only:
+                    raise RuntimeError("A nested unit of work failed, the transaction was rolled back")
+                session.commit()
+        except Exception:
+            if depth == 0:
+                session.rollback()
+            else:
+                self._local.rollback_only = True
+            raise
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self._registry.remove()
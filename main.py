@@ -6,8 +6,13 @@ from employees_management.application.employee_import_service import EmployeeImp
 from employees_management.application.municipality_service import MunicipalityService
 from employees_management.application.position_service import PositionService
 from employees_management.application.pandas_service import PandasService
+from employees_management.application.report_service import ReportService
+from employees_management.application.search_service import SearchService
 
-from employees_management.infrastructure.db import Base, engine, SessionLocal
+from employees_management.config.settings import get_reference_cache_ttl
+from employees_management.infrastructure.db import Base, engine, SessionLocal, query_recorder
+from employees_management.infrastructure.migrations import apply_migrations
+from employees_management.infrastructure.session_provider import SessionProvider
 from employees_management.domain.models import Employee
 
 from application.employee_service import EmployeeService
@@ -16,10 +21,12 @@ from gui.main_window import MainWindow
 
 def init_db() -> None:
     """
-    Create tables if they do not exist.
+    Create tables if they do not exist and upgrade older databases.
     """
     print(">>> Creating tables if not exist...")
     Base.metadata.create_all(bind=engine)
+    for migration in apply_migrations(engine):
+        print(f">>> Applied migration {migration}")
 
 
 def main() -> None:
@@ -31,22 +38,30 @@ def main() -> None:
 
     app = QApplication(sys.argv)
 
-    # Create one session for the application
-    session = SessionLocal()
+    # Every service operation runs in its own session
+    session_provider = SessionProvider(SessionLocal)
     # services
-    employee_service = EmployeeService(session=session)
-    position_service = PositionService(session=session)
-    municipality_service = MunicipalityService(session=session)
+    # positions and municipalities are cached, employee validation reads them from the cache
+    position_service = PositionService(session_provider=session_provider, cache_ttl=get_reference_cache_ttl())
+    municipality_service = MunicipalityService(session_provider=session_provider, cache_ttl=get_reference_cache_ttl())
+    employee_service = EmployeeService(
+        session_provider=session_provider,
+        position_service=position_service,
+        municipality_service=municipality_service,
+    )
+
+    pandas_service = PandasService()
 
     import_service = EmployeeImportService(
         employee_service,
         position_service,
-        municipality_service
+        municipality_service,
+        pandas_service,
     )
 
-    pandas_service = PandasService()
-
     export_service = EmployeeExportService(pandas_service)
+    report_service = ReportService(session_provider=session_provider)
+    search_service = SearchService(session_provider=session_provider)
 
     window = MainWindow(
         employee_service=employee_service,
@@ -55,13 +70,20 @@ def main() -> None:
         import_service=import_service,
         pandas_service=pandas_service,
         export_service=export_service,
+        report_service=report_service,
+        search_service=search_service,
+        query_recorder=query_recorder,
     )
 
     window.resize(800, 600)
     window.show()
 
     exit_code = app.exec()
-    session.close()
+
+    # DB_QUERY_STATS=1: print the top statements of the session on exit
+    if query_recorder is not None:
+        print(query_recorder.summary())
+
     sys.exit(exit_code)
 
 